@@ -0,0 +1,87 @@
+"""
+Encode and decode time of JSON codecs for typical large responses.
+
+    python -m benchmarks.bench_json_codec --count 10000
+"""
+import argparse
+import timeit
+import unittest.mock
+from typing import Any, Dict, List
+
+import requests
+
+from memsource.lib import json_codec
+
+
+def _payloads(count: int) -> Dict[str, Any]:
+    jobs = [{
+        'uid': 'job-{}'.format(index),
+        'innerId': str(index),
+        'status': 'NEW',
+        'targetLang': 'ja',
+        'filename': 'ファイル-{}.txt'.format(index),
+        'dateCreated': '2020-06-22T01:44:04Z',
+        'dateDue': '2020-07-22T01:44:04Z',
+        'workflowStep': {'id': '1', 'name': 'Translation', 'workflowLevel': 1},
+        'providers': [{'type': 'USER', 'id': str(index), 'uid': 'user-{}'.format(index)}],
+    } for index in range(count)]
+
+    search_results = [{
+        'segmentId': 'segment-{}'.format(index),
+        'source': {'text': 'This library wraps Memsource API for Python.', 'lang': 'en'},
+        'translations': [{'text': 'このライブラリはMemsourceのAPIをラップします。', 'lang': 'ja'}],
+        'transMemory': {'id': '1', 'name': 'tm'},
+        'grossScore': 0.95,
+        'score': 0.95,
+        'subSegment': False,
+    } for index in range(count)]
+
+    return {
+        'job list': {'content': jobs},
+        'tm search': {'searchResults': search_results},
+    }
+
+
+def _prepare_body(arguments: Dict[str, Any]) -> None:
+    # RequestsJsonCodec leaves encoding to requests, so encoding is measured as requests does.
+    request = requests.models.PreparedRequest()
+    request.prepare_headers(arguments.get('headers'))
+    request.prepare_body(arguments.get('data'), None, arguments.get('json'))
+
+
+def _codecs() -> List[json_codec.JsonCodec]:
+    codecs = [json_codec.JsonCodec()]
+    for codec_class in (json_codec.UjsonCodec, json_codec.OrjsonCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+
+    return codecs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark JSON codecs.')
+    parser.add_argument('--count', type=int, default=10000, help='Items in a response.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>12} {:>14} {:>12} {:>12}'.format('payload', 'codec', 'decode ms', 'encode ms'))
+    for (name, payload) in _payloads(args.count).items():
+        content = json_codec.JsonCodec().dumps(payload)
+        response = unittest.mock.Mock(content=content)
+        # requests decodes from text, which is decoded from content every time.
+        response.json.side_effect = lambda: json_codec.JsonCodec().loads(content)
+
+        for codec in [json_codec.RequestsJsonCodec()] + _codecs():
+            decode = min(timeit.repeat(
+                lambda: codec.decode(response), number=1, repeat=args.repeat))
+            encode = min(timeit.repeat(
+                lambda: _prepare_body(codec.encode(payload, None)),
+                number=1, repeat=args.repeat))
+            print('{:>12} {:>14} {:>12.2f} {:>12.2f}'.format(
+                name, codec.__class__.__name__, decode * 1000, encode * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Size and time of serializing a model list with model_codec compared with pickle.
+
+    python -m benchmarks.bench_model_codec --count 100000
+"""
+import argparse
+import pickle
+import time
+
+from benchmarks.bench_models import DictJobPart, _job_parts
+from memsource import models
+from memsource.lib import model_codec
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark model_codec.')
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    source = _job_parts(args.count)
+    cases = [
+        ('pickle', 'DictJobPart', pickle.dumps, pickle.loads, [DictJobPart(s) for s in source]),
+        ('pickle', 'JobPart', pickle.dumps, pickle.loads, [models.JobPart(s) for s in source]),
+    ]
+    if model_codec.msgpack is not None:
+        cases.append((
+            'model_codec', 'JobPart', model_codec.pack, model_codec.unpack,
+            [models.JobPart(s) for s in source],
+        ))
+
+    print('{:>12} {:>12} {:>10} {:>12} {:>12}'.format(
+        'codec', 'model', 'MiB', 'encode s', 'decode s'))
+    for (codec_name, model_name, dumps, loads, model_list) in cases:
+        started = time.perf_counter()
+        packed = dumps(model_list)
+        encoded = time.perf_counter()
+        loads(packed)
+        decoded = time.perf_counter()
+
+        print('{:>12} {:>12} {:>10.1f} {:>12.3f} {:>12.3f}'.format(
+            codec_name, model_name, len(packed) / 1024 / 1024,
+            encoded - started, decoded - encoded))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+CPU and memory of materializing models from a decoded job list.
+
+    python -m benchmarks.bench_models --count 100000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import iso8601
+
+from memsource import models
+
+
+class DictJobPart(models.BaseModel):
+    """JobPart as it was, a dict subclass. It is the baseline."""
+    pass
+
+
+def _job_parts(count: int) -> List[dict]:
+    return [{
+        'uid': 'job-{}'.format(index),
+        'innerId': str(index),
+        'status': 'NEW',
+        'targetLang': 'ja',
+        'filename': 'file-{}.txt'.format(index),
+        'dateCreated': '2020-06-22T01:44:04Z',
+        'dateDue': '2020-07-{:02d}T01:44:{:02d}Z'.format(index % 28 + 1, index % 60),
+        'workflowStep': {'id': '1', 'name': 'Translation', 'workflowLevel': 1},
+        'providers': [{'type': 'USER', 'id': str(index), 'uid': 'user-{}'.format(index)}],
+    } for index in range(count)]
+
+
+def _measure(function: Callable[[], object]) -> Tuple[float, int, object]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    (_, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (seconds, peak, result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark materializing models.')
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    source = _job_parts(args.count)
+
+    print('{:>12} {:>10} {:>12} {:>14}'.format('model', 'step', 'seconds', 'peak MiB'))
+    for model in (DictJobPart, models.JobPart):
+        (seconds, peak, job_parts) = _measure(lambda: [model(job_part) for job_part in source])
+        print('{:>12} {:>10} {:>12.4f} {:>14.1f}'.format(
+            model.__name__, 'wrap', seconds, peak / 1024 / 1024))
+
+        (seconds, peak, _) = _measure(lambda: [job_part.uid for job_part in job_parts])
+        print('{:>12} {:>10} {:>12.4f} {:>14.1f}'.format(
+            model.__name__, 'attribute', seconds, peak / 1024 / 1024))
+
+        (seconds, peak, _) = _measure(lambda: [job_part['status'] for job_part in job_parts])
+        print('{:>12} {:>10} {:>12.4f} {:>14.1f}'.format(
+            model.__name__, 'item', seconds, peak / 1024 / 1024))
+
+        if model is DictJobPart:
+            # Every caller parsed dateDue by itself.
+            def sort_by_due():
+                return sorted(job_parts, key=lambda job_part: iso8601.parse_date(job_part.dateDue))
+        else:
+            def sort_by_due():
+                return sorted(job_parts, key=lambda job_part: job_part.date_due)
+
+        (seconds, peak, _) = _measure(sort_by_due)
+        print('{:>12} {:>10} {:>12.4f} {:>14.1f}'.format(
+            model.__name__, 'sort due', seconds, peak / 1024 / 1024))
+
+
+if __name__ == '__main__':
+    main()
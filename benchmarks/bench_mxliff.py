@@ -0,0 +1,86 @@
+"""
+Throughput and peak memory of MxliffParser.
+
+    python -m benchmarks.bench_mxliff --units 1000 100000 1000000
+
+Every measurement runs in a new process, so peak memory of one doesn't hide another.
+"""
+import argparse
+import concurrent.futures
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+from benchmarks import mxliff_corpus
+from memsource.lib import mxliff
+
+MODES = ('parse', 'parse_fields', 'iterparse', 'iterparse_fields')
+PROJECTION = ('id', 'target')
+
+
+def _max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _run(mode: str, file_path: str) -> Tuple[int, float, int]:
+    """Parse file_path in mode, return number of units, seconds and peak memory growth."""
+    fields = PROJECTION if mode.endswith('_fields') else None
+    parser = mxliff.MxliffParser(fields)
+    rss_before = _max_rss_bytes()
+    started = time.perf_counter()
+
+    if mode.startswith('iterparse'):
+        with open(file_path, 'rb') as f:
+            units = sum(1 for _ in parser.iterparse(iter(lambda: f.read(1024 * 64), b'')))
+    else:
+        with open(file_path, 'rb') as f:
+            units = len(parser.parse(f.read()))
+
+    return (units, time.perf_counter() - started, _max_rss_bytes() - rss_before)
+
+
+def _corpus(directory: str, units: int, args: argparse.Namespace) -> str:
+    file_path = os.path.join(directory, 'corpus-{}-{}-{}.mxliff'.format(
+        units, args.alt_trans_density, args.metadata_marks))
+
+    if not os.path.exists(file_path):
+        with open(file_path, 'wb') as f:
+            mxliff_corpus.generate(f, units, args.alt_trans_density, args.metadata_marks)
+
+    return file_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark MxliffParser.')
+    parser.add_argument('--units', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--alt-trans-density', type=float, default=0.5)
+    parser.add_argument('--metadata-marks', type=int, default=2)
+    parser.add_argument(
+        '--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'memsource-bench'),
+        help='Generated files are kept here and reused.')
+    args = parser.parse_args()
+
+    os.makedirs(args.corpus_dir, exist_ok=True)
+
+    print('{:>9} {:>17} {:>12} {:>10} {:>12}'.format(
+        'units', 'mode', 'units/s', 'seconds', 'peak MiB'))
+
+    for units in args.units:
+        file_path = _corpus(args.corpus_dir, units, args)
+
+        for mode in args.modes:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+                (parsed_units, seconds, peak) = executor.submit(_run, mode, file_path).result()
+
+            print('{:>9} {:>17} {:>12.0f} {:>10.3f} {:>12.1f}'.format(
+                parsed_units, mode, parsed_units / seconds, seconds, peak / 1024 / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Latency of deciding a search by NgramIndex of a translation memory.
+
+    python -m benchmarks.bench_tm_prefilter --segments 100000 --queries 1000
+
+Segments are sentences of words drawn from a Zipf distribution, so a few n-grams are in most
+segments like in real text. Half of the queries are indexed segments with a word changed,
+which should match, and the others are new sentences.
+"""
+import argparse
+import itertools
+import random
+import string
+import time
+from typing import Callable, List
+
+from memsource.lib import tm_prefilter
+
+
+def _vocabulary(rand: random.Random, size: int) -> List[str]:
+    return [
+        ''.join(rand.choice(string.ascii_lowercase) for _ in range(rand.randint(2, 10)))
+        for _ in range(size)
+    ]
+
+
+def _sentences(rand: random.Random, words: List[str], count: int) -> List[List[str]]:
+    # Weight of the k-th word is 1 / k.
+    weights = list(itertools.accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+    return [
+        rand.choices(words, cum_weights=weights, k=rand.randint(5, 25)) for _ in range(count)
+    ]
+
+
+def _measure(queries: List[str], search: Callable[[str], object]) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        search(query)
+
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark NgramIndex.')
+    parser.add_argument('--segments', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--threshold', type=float, default=0.7)
+    args = parser.parse_args()
+
+    rand = random.Random(0)
+    words = _vocabulary(rand, 20000)
+    segments = _sentences(rand, words, args.segments)
+
+    started = time.perf_counter()
+    index = tm_prefilter.NgramIndex()
+    for segment in segments:
+        index.add(' '.join(segment), 'ja')
+    print('indexed {} segments in {:.1f} s'.format(len(index), time.perf_counter() - started))
+
+    queries = []
+    for segment in rand.sample(segments, args.queries // 2):
+        changed = list(segment)
+        changed[rand.randrange(len(changed))] = rand.choice(words)
+        queries.append(' '.join(changed))
+    queries.extend(' '.join(segment) for segment in _sentences(
+        rand, words, args.queries - len(queries)))
+
+    matched = sum(index.may_match(query, args.threshold, 'ja') for query in queries)
+    print('{} of {} queries may match'.format(matched, len(queries)))
+
+    print('{:>12} {:>12}'.format('method', 'ms/query'))
+    for (name, search) in [
+            ('best_score', lambda query: index.best_score(query, 'ja')),
+            ('may_match', lambda query: index.may_match(query, args.threshold, 'ja')),
+    ]:
+        print('{:>12} {:>12.3f}'.format(name, _measure(queries, search)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Generate synthetic MXLIFF files for benchmarks.
+
+    python -m benchmarks.mxliff_corpus /tmp/100k.mxliff --units 100000
+"""
+import argparse
+import random
+from typing import BinaryIO
+from xml.sax import saxutils
+
+HEADER = (
+    "<?xml version='1.0' encoding='UTF-8'?>\n"
+    '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" '
+    'xmlns:m="http://www.memsource.com/mxlf/2.0" version="1.2" m:version="2.0" m:level="1">\n'
+    '  <file original="corpus.txt" source-language="en" target-language="ja" '
+    'datatype="x-undefined" m:task-id="{task_id}">\n'
+    '    <body>\n'
+)
+FOOTER = '    </body>\n  </file>\n</xliff>\n'
+UNIT = (
+    '      <group id="{index}">\n'
+    '        <trans-unit id="{task_id}:{index}" xml:space="preserve" m:score="{score}" '
+    'm:gross-score="{score}" m:trans-origin="tm" m:confirmed="0" m:locked="false" '
+    'm:para-id="{index}" m:created-at="0" m:created-by="" m:modified-at="0" m:modified-by="" '
+    'm:level-edited="false">\n'
+    '          <source>{source}</source>\n'
+    '          {target}\n'
+    '{alt_trans}'
+    '{metadata}'
+    '        </trans-unit>\n'
+    '      </group>\n'
+)
+ALT_TRANS = (
+    '          <alt-trans origin="machine-trans"><target>{machine_trans}</target></alt-trans>\n'
+    '          <alt-trans origin="memsource-tm"><target>{memsource_tm}</target></alt-trans>\n'
+)
+# Parser expects alt-trans, so units without translations still have empty ones.
+EMPTY_ALT_TRANS = (
+    '          <alt-trans origin="machine-trans"><target/></alt-trans>\n'
+    '          <alt-trans origin="memsource-tm"><target/></alt-trans>\n'
+)
+MARK = (
+    '            <m:mark id="{id}">\n'
+    '              <m:type>{type}</m:type>\n'
+    '              <m:content>{content}</m:content>\n'
+    '            </m:mark>\n'
+)
+WORDS = (
+    'memsource', 'translation', 'memory', 'segment', 'project', 'job', 'the', 'a', 'of',
+    'analysis', 'bilingual', 'file', 'library', 'wraps', 'python', 'quality', 'term', 'base',
+)
+
+
+def _sentence(rand: random.Random) -> str:
+    return '{}.'.format(' '.join(rand.choice(WORDS) for _ in range(rand.randint(4, 20))))
+
+
+def generate(
+        f: BinaryIO,
+        units: int,
+        alt_trans_density: float=0.5,
+        metadata_marks: int=0,
+        seed: int=0,
+) -> None:
+    """Write a MXLIFF file which has units trans-units.
+
+    :param f: Write into this file opened as binary.
+    :param units: Number of trans-units.
+    :param alt_trans_density: Ratio of units which have machine-trans and memsource-tm text.
+    :param metadata_marks: Number of m:mark in tunit-metadata of each unit.
+    :param seed: Seed of random, same parameters make same file.
+    """
+    rand = random.Random(seed)
+    task_id = 'corpus{}'.format(seed)
+
+    f.write(HEADER.format(task_id=task_id).encode('utf-8'))
+
+    for index in range(units):
+        translated = rand.random() < 0.5
+
+        if rand.random() < alt_trans_density:
+            alt_trans = ALT_TRANS.format(
+                machine_trans=_sentence(rand), memsource_tm=_sentence(rand))
+        else:
+            alt_trans = EMPTY_ALT_TRANS
+
+        if metadata_marks:
+            metadata = '          <m:tunit-metadata>\n{}          </m:tunit-metadata>\n'.format(
+                ''.join(MARK.format(
+                    id=mark_id,
+                    type='term',
+                    content=saxutils.escape('<term>{}</term>'.format(rand.choice(WORDS))),
+                ) for mark_id in range(1, metadata_marks + 1)))
+        else:
+            metadata = ''
+
+        f.write(UNIT.format(
+            index=index,
+            task_id=task_id,
+            score='{:.2f}'.format(rand.random() * 1.01) if translated else '0.0',
+            source=_sentence(rand),
+            target='<target>{}</target>'.format(_sentence(rand)) if translated else '<target/>',
+            alt_trans=alt_trans,
+            metadata=metadata,
+        ).encode('utf-8'))
+
+    f.write(FOOTER.encode('utf-8'))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate a synthetic MXLIFF file.')
+    parser.add_argument('file_path')
+    parser.add_argument('--units', type=int, default=1000)
+    parser.add_argument('--alt-trans-density', type=float, default=0.5)
+    parser.add_argument('--metadata-marks', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.file_path, 'wb') as f:
+        generate(f, args.units, args.alt_trans_density, args.metadata_marks, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ import uuid
 from typing import (
     Any,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
@@ -19,7 +20,7 @@ from typing import (
 import requests
 
 from memsource import constants, exceptions, models
-from memsource.lib import mxliff
+from memsource.lib import bulk, mxliff
 
 
 class BaseApi:
@@ -809,6 +810,29 @@ class TranslationMemory(BaseApi):
             'segmentId': segment_ids
         })
 
+    def deleteSourceAndTranslationsInBulk(
+            self, translation_memory_id: int, segment_ids: Iterable[str], chunk_size: int=1000,
+            max_workers: int=4, retries: int=2) -> models.TmDeleteResult:
+        """Delete any number of segments from a translation memory.
+
+        Segment ids are split into chunks of up to 1000 ids, and chunks are deleted in parallel.
+        Chunks failed by timeout, too many requests or server error are retried.
+
+        :param translation_memory_id: Delete the segments from this translation memory.
+        :param segment_ids: Delete these segments from the translation memory.
+        :param chunk_size: Number of ids in a request, up to 1000.
+        :param max_workers: Number of requests at once.
+        :param retries: Times of retrying a failed chunk.
+        :return: models.TmDeleteResult
+        """
+        assert 1000 >= chunk_size, "You cannot pass more than 1000 ids one time."
+        (deleted, failed) = bulk.run_in_chunks(
+            lambda chunk: self.deleteSourceAndTranslations(translation_memory_id, chunk),
+            segment_ids, chunk_size=chunk_size, max_workers=max_workers, retries=retries,
+        )
+
+        return models.TmDeleteResult({'deleted': deleted, 'failed': failed})
+
 
 class Asynchronous(BaseApi):
     """You can see the documents:
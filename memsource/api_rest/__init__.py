@@ -1,6 +1,8 @@
 from typing import (
     Any,
+    Callable,
     Dict,
+    List,
     Optional,
     Tuple,
     Union,
@@ -10,18 +12,28 @@ from http import HTTPStatus
 import requests
 
 from memsource import constants, exceptions
+from memsource.lib import json_codec, rate_limit
 
 
 class BaseApi:
     _session = requests.Session()
+    _json_codec = json_codec.RequestsJsonCodec()  # type: json_codec.JsonCodec
+    _rate_limiter = None  # type: Optional[rate_limit.RateLimiter]
 
     def __init__(
         self,
         token: Optional[str] = None,
-        headers: Optional[Dict[str, Any]] = None
+        headers: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
     ) -> None:
+        """
+        :param token: Authentication token for using APIs
+        :param headers: Send these headers with every request
+        :param raw: Return decoded JSON as it is instead of models, see _to_models
+        """
         self.token = token
         self.headers = headers
+        self.raw = raw
 
     @classmethod
     def use_session(cls, session: requests.Session) -> None:
@@ -34,24 +46,57 @@ class BaseApi:
         """
         cls._session = session
 
+    @classmethod
+    def use_json_codec(cls, codec: json_codec.JsonCodec) -> None:
+        """
+        Configures the codec which encodes request bodies and decodes response bodies.
+        This method is not thread-safe. It is recommended to configure only once.
+
+        e.g. BaseApi.use_json_codec(json_codec.best_available())
+
+        Arguments:
+        codec -- The codec to be used by BaseApi
+        """
+        cls._json_codec = codec
+
+    @classmethod
+    def use_rate_limiter(cls, rate_limiter: Optional[rate_limit.RateLimiter]) -> None:
+        """
+        Configures the rate limiter which every API invocation waits for.
+        This method is not thread-safe. It is recommended to configure only once.
+
+        e.g. BaseApi.use_rate_limiter(rate_limit.RateLimiter(rate=10, burst=20))
+
+        Arguments:
+        rate_limiter -- The rate limiter to be used by BaseApi, or None for no limit
+        """
+        cls._rate_limiter = rate_limiter
+
+    def _clone(self) -> "BaseApi":
+        # Requests set last_url and last_params, and some add headers, e.g. file uploads, so
+        # calls in other threads use a copy.
+        return type(self)(self.token, None if self.headers is None else dict(self.headers),
+                          self.raw)
+
     def _get(
             self,
             path: str,
             params: Dict[str, Any]={},
             timeout: int=constants.BaseRest.timeout.value
     ) -> Dict[str, Any]:
-        return self._request(
+        resp = self._request(
             http_method=constants.HttpMethod.get,
             path=path,
             files=None,
             params=params,
             data=None,
             timeout=timeout
-        ).json()
+        )
+        return self._json_codec.decode(resp)
 
     def _get_stream(
             self, path: str, params: Dict[str, Any]={}, files: Optional[Dict[str, Any]]=None,
-            timeout: Union[int, float]=constants.BaseRest.timeout.value * 5
+            timeout: Union[int, float]=constants.BaseRest.timeout.value * 5, stream: bool=False
     ) -> requests.models.Response:
         """
         This method returns response object of requests library,
@@ -64,6 +109,7 @@ class BaseApi:
         :param params: Send request with this parameters
         :param files: Upload this files. Key is filename, value is file object
         :param timeout: When takes over this time in one request, raise timeout
+        :param stream: Don't download the body until it is read, e.g. by iter_content
         :return: Response object of Requests library
         """
         return self._request(
@@ -72,7 +118,8 @@ class BaseApi:
             files=files,
             params=params,
             data=None,
-            timeout=timeout
+            timeout=timeout,
+            stream=stream,
         )
 
     def _post(
@@ -106,7 +153,7 @@ class BaseApi:
         # https://cloud.memsource.com/web/docs/api#operation/setProjectStatus
         if resp.status_code == HTTPStatus.NO_CONTENT:
             return {}
-        return resp.json()
+        return self._json_codec.decode(resp)
 
     def _post_stream(
             self,
@@ -144,14 +191,15 @@ class BaseApi:
         :param timeout: When takes over this time in one request, raise timeout
         :return: parsed response body as JSON
         """
-        return self._request(
+        resp = self._request(
             http_method=constants.HttpMethod.put,
             path=path,
             files=files,
             params={},
             data=data,
             timeout=timeout
-        ).json()
+        )
+        return self._json_codec.decode(resp)
 
     def _delete(
             self,
@@ -182,7 +230,7 @@ class BaseApi:
         # https://cloud.memsource.com/web/docs/api#operation/deleteParts
         if resp.status_code == HTTPStatus.NO_CONTENT:
             return {}
-        return resp.json()
+        return self._json_codec.decode(resp)
 
     def _pre_request(self, path: str, params: Dict[str, Any]) -> Tuple[str,  Dict[str, Any]]:
         """Create request url and extend param with token for authentication.
@@ -210,6 +258,9 @@ class BaseApi:
         :param kwargs: optional parameters
         :return: response of request module
         """
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+
         try:
             response = self._session.request(http_method.value, url, **kwargs)
         except requests.exceptions.Timeout:
@@ -246,7 +297,8 @@ class BaseApi:
             files: Dict[str, Any],
             params: Dict[str, Any],
             data: Dict[str, Any],
-            timeout: Tuple[int, float]
+            timeout: Tuple[int, float],
+            stream: bool=False,
     ) -> requests.models.Response:
         """Send a http request.
 
@@ -255,18 +307,58 @@ class BaseApi:
         :param data: Send request with this parameters
         :param files: Upload this files. Key is filename, value is file object
         :param timeout: When takes over this time in one request, raise timeout
+        :param stream: Don't download the body until it is read
         :return: response of request module
         """
         (url, params) = self._pre_request(path, params)
         arguments = {
             key: value for key, value in [
-                ('files', files), ('params', params), ('json', data), ('headers', self.headers)
+                ('files', files), ('params', params), ('headers', self.headers)
             ] if value is not None
         }
 
+        # Only when it is streamed, so other requests are sent with the same arguments as before.
+        if stream:
+            arguments['stream'] = True
+
+        if data is not None:
+            if files is None:
+                arguments.update(self._json_codec.encode(data, self.headers))
+            else:
+                # requests ignores json when files are given, it is kept as it was.
+                arguments['json'] = data
+
         # If it is successful, returns response json
         return self._get_response(http_method, url, timeout=timeout, **arguments)
 
+    def _to_model(self, model: Callable[[Any], Any], item: Any, raw: Optional[bool]) -> Any:
+        """Wrap item with model, unless raw mode.
+
+        :param model: Model class.
+        :param item: Decoded JSON.
+        :param raw: Raw mode of the call. If None, raw mode of this instance is used.
+        """
+        if self.raw if raw is None else raw:
+            return item
+
+        return model(item)
+
+    def _to_models(
+            self, model: Callable[[Any], Any], items: List[Any], raw: Optional[bool]
+    ) -> List[Any]:
+        """Wrap each item with model, unless raw mode.
+
+        Raw mode is for pipelines which serialize results again, wrapping is wasted work there.
+
+        :param model: Model class.
+        :param items: Decoded JSON list.
+        :param raw: Raw mode of the call. If None, raw mode of this instance is used.
+        """
+        if self.raw if raw is None else raw:
+            return items
+
+        return [model(item) for item in items]
+
     def add_headers(self, headers: Dict[str, Any]) -> None:
         if self.headers is None:
             self.headers = headers
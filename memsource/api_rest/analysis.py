@@ -1,17 +1,22 @@
-from typing import Iterator, List
+import concurrent.futures
+import contextlib
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 from memsource import api_rest, constants, models
+from memsource.lib import analysis_reader, bulk
 
 
 class Analysis(api_rest.BaseApi):
     # Document: https://cloud.memsource.com/web/docs/api#tag/Analysis
 
-    def get(self, analysis_id: int) -> models.Analysis:
+    def get(self, analysis_id: int, raw: Optional[bool]=None) -> models.Analysis:
         """Call get API.
 
         :param analysis_id: Get analysis of this id.
+        :param raw: Return dict instead of the model, see BaseApi._to_models
         :return: Result of analysis.
         """
-        return models.Analysis(self._get("v3/analyses/{}".format(analysis_id)))
+        return self._to_model(
+            models.Analysis, self._get("v3/analyses/{}".format(analysis_id)), raw)
 
     def create(self, jobs: List[int]) -> models.AsynchronousRequest:
         """Create new analysis.
@@ -31,14 +36,15 @@ class Analysis(api_rest.BaseApi):
         """
         self._delete("v1/analyses/{}".format(analysis_id), {"purge": purge})
 
-    def get_by_project(self, project_id: str) -> List[models.Analysis]:
+    def get_by_project(self, project_id: str, raw: Optional[bool]=None) -> List[models.Analysis]:
         """List Analyses By Project.
 
         :param project_id: Project ID for which you want to get the analyses.
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
         :return: List of Analyses.
         """
         project_analyses = self._get("v2/projects/{}/analyses".format(project_id))
-        return [models.Analysis(analysis) for analysis in project_analyses["content"]]
+        return self._to_models(models.Analysis, project_analyses["content"], raw)
 
     def download(
             self,
@@ -57,6 +63,136 @@ class Analysis(api_rest.BaseApi):
             for chunk in self._get_analysis_stream(analysis_id, file_format):
                 f.write(chunk)
 
+    def iter_download(
+            self,
+            analysis_id: int,
+            file_format: constants.AnalysisFormat=constants.AnalysisFormat.CSV,
+            chunk_size: int=constants.CHUNK_SIZE * 64,
+    ) -> Iterator[bytes]:
+        """Download analysis chunk by chunk without keeping it in memory.
+
+        :param analysis_id: Anaylsis ID for which you download.
+        :param file_format: File format of file.
+        :param chunk_size: Size of a chunk in bytes.
+        :return: Iterator of chunks of the analysis.
+        """
+        response = self._get_stream("v1/analyses/{}/download".format(analysis_id), {
+            "format": file_format.value,
+        }, stream=True)
+
+        with contextlib.closing(response):
+            yield from response.iter_content(chunk_size)
+
+    def read_rows(
+            self,
+            analysis_id: int,
+            file_format: constants.AnalysisFormat=constants.AnalysisFormat.CSV,
+            totals: Optional[analysis_reader.BandTotals]=None,
+    ) -> Iterator[models.AnalysisRow]:
+        """Read files of analysis while downloading it. Nothing is written to disk.
+
+        :param analysis_id: Anaylsis ID for which you download.
+        :param file_format: CSV, CSV_EXTENDED or LOG.
+        :param totals: Sum words and characters of each match band into this while reading.
+        :return: Iterator of models.AnalysisRow, see lib.analysis_reader.read.
+        """
+        return analysis_reader.read(self.iter_download(analysis_id, file_format), file_format,
+                                    totals)
+
+    def collect(
+            self,
+            project_ids: Iterable[str],
+            file_format: Optional[constants.AnalysisFormat]=None,
+            totals: Optional[analysis_reader.BandTotals]=None,
+            max_workers: int=8,
+            retries: int=2,
+            raw: Optional[bool]=None,
+    ) -> Iterator[models.ProjectAnalysis]:
+        """Collect analyses of many projects in parallel.
+
+        Analyses of each project are listed by get_by_project, then each analysis is got by get
+        and read by read_rows, up to max_workers requests at once. Results are yielded as soon
+        as they are ready, so they are not in order of projects. Requests failed by transient
+        errors are retried, and a failed project or analysis doesn't stop others.
+
+        :param project_ids: Collect analyses of these projects.
+        :param file_format: Also read rows of analyses in this format. None for no download.
+        :param totals: Sum words and characters of each match band of all analyses into this.
+        :param max_workers: Number of requests at once.
+        :param retries: Times of retrying a failed request.
+        :param raw: Return dict of analysis instead of the model, see BaseApi._to_models
+        :return: Iterator of models.ProjectAnalysis
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # (project ID, analysis ID) by future. Analysis ID is None for listing a project.
+            futures = {
+                executor.submit(
+                    bulk.call_with_retries, self._clone().get_by_project, project_id,
+                    retries=retries,
+                ): (project_id, None)
+                for project_id in project_ids
+            }
+
+            try:
+                while futures:
+                    (done, _) = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                    for future in done:
+                        (project_id, analysis_id) = futures.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            # Also broken responses, e.g. ValueError of JSON or of reading rows.
+                            yield models.ProjectAnalysis({
+                                "project_id": project_id,
+                                "analysis_id": analysis_id,
+                                "analysis": None,
+                                "rows": None,
+                                "error": e,
+                            })
+                            continue
+
+                        if analysis_id is None:
+                            futures.update((executor.submit(
+                                self._collect_analysis, analysis["id"], file_format, retries, raw
+                            ), (project_id, analysis["id"])) for analysis in result)
+                            continue
+
+                        (analysis, rows) = result
+                        if totals is not None and rows is not None:
+                            for row in rows:
+                                totals.add(row)
+
+                        yield models.ProjectAnalysis({
+                            "project_id": project_id,
+                            "analysis_id": analysis_id,
+                            "analysis": analysis,
+                            "rows": rows,
+                            "error": None,
+                        })
+            finally:
+                # Don't start the rest when the caller stopped reading.
+                for future in futures:
+                    future.cancel()
+
+    def _collect_analysis(
+            self,
+            analysis_id: str,
+            file_format: Optional[constants.AnalysisFormat],
+            retries: int,
+            raw: Optional[bool],
+    ) -> Tuple[Any, Optional[List[models.AnalysisRow]]]:
+        api = self._clone()
+        analysis = bulk.call_with_retries(api.get, analysis_id, raw, retries=retries)
+        if file_format is None:
+            return (analysis, None)
+
+        rows = bulk.call_with_retries(
+            lambda: list(api.read_rows(analysis_id, file_format)), retries=retries)
+
+        return (analysis, rows)
+
     def _get_analysis_stream(
             self,
             analysis_id: int,
@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from memsource import api_rest, models
+
+
+class Asynchronous(api_rest.BaseApi):
+    # Document: https://cloud.memsource.com/web/docs/api#tag/Asynchronous-Request
+    def get(self, async_request_id: str, raw: Optional[bool]=None) -> models.AsynchronousRequest:
+        """Get an asynchronous request.
+
+        asyncResponse of it is null until the request is finished.
+
+        :param async_request_id: ID of the async request.
+        :param raw: Return dict instead of the model, see BaseApi._to_models
+        :return: models.AsynchronousRequest
+        """
+        return self._to_model(
+            models.AsynchronousRequest, self._get("v1/async/{}".format(async_request_id)), raw)
+
+    def list_pending(
+            self, page: int=0, page_size: int=50, raw: Optional[bool]=None
+    ) -> List[models.AsynchronousRequest]:
+        """List asynchronous requests of the user which are not finished yet.
+
+        :param page: index of pager.
+        :param page_size: Number of requests in a page.
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
+        :return: List of models.AsynchronousRequest
+        """
+        pending = self._get("v1/async", {"pageNumber": page, "pageSize": page_size})
+        return self._to_models(models.AsynchronousRequest, pending["content"], raw)
@@ -2,7 +2,7 @@ import io
 import json
 import os
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from memsource import api_rest, constants, exceptions, models
 
@@ -104,9 +104,10 @@ class Job(api_rest.BaseApi):
             self,
             project_id: int,
             page: int = 0,
+            raw: Optional[bool]=None,
     ) -> List[models.JobPart]:
         jobs = self._get("v2/projects/{}/jobs".format(project_id), {"page": page})
-        return [models.JobPart(job_part) for job_part in jobs["content"]]
+        return self._to_models(models.JobPart, jobs["content"], raw)
 
     def pre_translate(
             self,
@@ -150,6 +151,7 @@ class Job(api_rest.BaseApi):
             job_uid: str,
             begin_index: int=0,
             end_index: int=0,
+            raw: Optional[bool]=None,
     ) -> List[models.Segment]:
         """Call get segments API.
 
@@ -160,6 +162,7 @@ class Job(api_rest.BaseApi):
         :param job_uid: UID of the job
         :param begin_index
         :param end_index
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
         :return: List of models.Segment
         """
         segments = self._get("v1/projects/{}/jobs/{}/segments".format(project_id, job_uid), {
@@ -167,29 +170,29 @@ class Job(api_rest.BaseApi):
             "endIndex": end_index,
         })
 
-        return [
-            models.Segment(segment) for segment in segments["segments"]
-        ]
+        return self._to_models(models.Segment, segments["segments"], raw)
 
-    def get(self, project_id: int, job_uid: str) -> models.Job:
+    def get(self, project_id: int, job_uid: str, raw: Optional[bool]=None) -> models.Job:
         """Get the job data.
 
         :param job_uid: ID of the job.
+        :param raw: Return dict instead of the model, see BaseApi._to_models
         :return: The retrieved job.
         """
         response = self._get("v1/projects/{}/jobs/{}".format(project_id, job_uid))
 
-        return models.Job(response)
+        return self._to_model(models.Job, response, raw)
 
-    def list(self, project_id: int) -> List[models.Job]:
+    def list(self, project_id: int, raw: Optional[bool]=None) -> List[models.Job]:
         """Get the jobs data.
 
         :param project_id: ID of the project
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
         :return: The retrieved jobs.
         """
         response = self._get("v2/projects/{}/jobs".format(project_id))
 
-        return [models.Job(i) for i in response["content"]]
+        return self._to_models(models.Job, response["content"], raw)
 
     def delete(
             self,
@@ -21,16 +21,18 @@ class Project(api_rest.BaseApi):
             "domain": domain,
         })["id"]
 
-    def list(self, **query) -> List[models.Project]:
+    def list(self, raw: Optional[bool]=None, **query) -> List[models.Project]:
         projects = self._get("v1/projects", query)
-        return [models.Project(project) for project in projects.get("content", [])]
+        return self._to_models(models.Project, projects.get("content", []), raw)
 
-    def get_trans_memories(self, project_id: int) -> List[models.TranslationMemory]:
+    def get_trans_memories(
+        self,
+        project_id: int,
+        raw: Optional[bool]=None,
+    ) -> List[models.TranslationMemory]:
         translation_memories = self._get("v1/projects/{}/transMemories".format(project_id))
-        return [
-            models.TranslationMemory(tm)
-            for tm in translation_memories.get("transMemories", [])
-        ]
+        return self._to_models(
+            models.TranslationMemory, translation_memories.get("transMemories", []), raw)
 
     def set_trans_memories(
         self,
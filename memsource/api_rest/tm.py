@@ -1,12 +1,78 @@
+import collections
+import concurrent.futures
+import contextlib
+import copy
 import io
+import itertools
+import json
 import tempfile
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
-from memsource import api_rest, constants, models
+from memsource import api_rest, constants, exceptions, models
+from memsource.lib import bulk, search_cache, tm_dedup, tmx
 
 
 class TranslationMemory(api_rest.BaseApi):
     # Document: https://cloud.memsource.com/web/docs/api#tag/Translation-Memory
+    _search_cache = None  # type: Optional[search_cache.SearchCache]
+    _dedup = None  # type: Optional[tm_dedup.TmDedup]
+
+    @classmethod
+    def use_search_cache(cls, cache: Optional[search_cache.SearchCache]) -> None:
+        """
+        Configures the cache of search and search_segment_by_job. Searches are not cached by
+        default. Changes of translation memories by this class drop cached searches of them.
+        This method is not thread-safe. It is recommended to configure only once.
+
+        Arguments:
+        cache -- The cache to be used by TranslationMemory, or None for no cache
+        """
+        cls._search_cache = cache
+
+    @classmethod
+    def use_dedup(cls, dedup: Optional[tm_dedup.TmDedup]) -> None:
+        """
+        Configures skipping segments which are known to be in translation memories, by insert,
+        insert_many and upload_units. Segments are not skipped by default. Deleting segments by
+        this class forgets segments of the translation memory.
+        This method is not thread-safe. It is recommended to configure only once.
+
+        Arguments:
+        dedup -- The filters to be used by TranslationMemory, or None for no skipping
+        """
+        cls._dedup = dedup
+
+    def _cached_search(
+            self,
+            key: Optional[tuple],
+            tag: Optional[str],
+            path: str,
+            parameters: Dict[str, Any],
+            raw: Optional[bool],
+    ) -> List[models.SegmentSearchResult]:
+        """Search with the search cache.
+
+        :param key: Normalized search parameters.
+        :param tag: ID of the searched translation memory, None if it is unknown.
+        """
+        cache = self._search_cache
+        cached = None if cache is None else cache.get(key)
+
+        # Results are nested dicts. Deep copies are cached and returned, so callers changing
+        # results, e.g. result["translations"][0]["text"], don't change cached results.
+        if cached is not None:
+            results = copy.deepcopy(cached)
+        else:
+            results = self._post(path, parameters)["searchResults"]
+            if cache is not None:
+                cache.put(key, copy.deepcopy(results), tag)
+
+        return self._to_models(models.SegmentSearchResult, results, raw)
+
+    def _invalidate_search_cache(self, translation_memory_id: int) -> None:
+        if self._search_cache is not None:
+            self._search_cache.invalidate(str(translation_memory_id))
+
     def create(self, name: str, source_lang: str, target_langs: Union[List[str], str]) -> int:
         """Create a translation memory.
 
@@ -21,21 +87,22 @@ class TranslationMemory(api_rest.BaseApi):
             "targetLangs": target_langs,
         })["id"]
 
-    def list(self, page: int=0) -> List[models.TranslationMemory]:
+    def list(self, page: int=0, raw: Optional[bool]=None) -> List[models.TranslationMemory]:
         """List translation memories.
 
         :page: index of pager.
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
         :return: List of translation memory.
         """
         tms = self._get("v1/transMemories", {"pageNumber": page})
-        return [
-            models.TranslationMemory(translation_memory)
-            for translation_memory in tms["content"]
-        ]
+        return self._to_models(models.TranslationMemory, tms["content"], raw)
 
-    def _upload(self, translation_memory_id: int, files: Dict[str, Any]) -> int:
+    def _upload(
+            self, translation_memory_id: int, files: Dict[str, Any], file_name: Optional[str]=None
+    ) -> int:
+        """Import files["file"] which is a file object, or chunks of bytes with file_name."""
         # Casting because acceptedSegmentsCount seems always number, but it string type.
-        file_name = files["file"].name
+        file_name = files["file"].name if file_name is None else file_name
 
         tm_create_extra_headers = {
             "Content-Type": "application/octet-stream",
@@ -65,8 +132,9 @@ class TranslationMemory(api_rest.BaseApi):
             **arguments
         )
         response.raise_for_status()
+        self._invalidate_search_cache(translation_memory_id)
 
-        return int(response.json()["acceptedSegmentsCount"])
+        return int(self._json_codec.decode(response)["acceptedSegmentsCount"])
 
     def upload(self, translation_memory_id: int, file_path: str) -> int:
         """Call **import** API.
@@ -96,6 +164,103 @@ class TranslationMemory(api_rest.BaseApi):
                 "file": temp_file,
             })
 
+    def upload_units(
+            self,
+            translation_memory_id: int,
+            source_lang: str,
+            units: Iterable[Dict[str, Any]],
+            file_name: str="units.tmx",
+    ) -> int:
+        """Import translation units without making the whole TMX in memory.
+
+        TMX is written by lib.tmx.write and sent chunk by chunk while units are read.
+
+        :param translation_memory_id: Uploaded translation units are into here.
+        :param source_lang: Source language of the translation memory.
+        :param units: Translation units, see lib.tmx.write.
+        :param file_name: Name of the imported file.
+        :return: accepted segments count.
+        """
+        dedup = self._dedup
+        if dedup is None:
+            # _upload adds headers of file upload to the API, so a copy uploads.
+            return self._clone()._upload(
+                translation_memory_id, {"file": tmx.write(units, source_lang)}, file_name)
+
+        keys = []
+
+        def unknown_units() -> Iterator[Dict[str, Any]]:
+            for unit in units:
+                key = tm_dedup.pair_key(unit)
+                if not dedup.contains(translation_memory_id, key):
+                    keys.append(key)
+                    yield unit
+
+        unknown = unknown_units()
+        first = next(unknown, None)
+        if first is None:
+            # All units are known, nothing to import.
+            return 0
+
+        accepted = self._clone()._upload(
+            translation_memory_id,
+            {"file": tmx.write(itertools.chain([first], unknown), source_lang)},
+            file_name,
+        )
+        dedup.add(translation_memory_id, keys)
+
+        return accepted
+
+    def upload_in_parts(
+            self,
+            translation_memory_id: int,
+            source: Union[bytes, str, Any, Iterable[bytes]],
+            part_size: int=8 * 1024 * 1024,
+            max_workers: int=4,
+            retries: int=2,
+    ) -> models.TmImportResult:
+        """Import a large TMX as smaller parts in parallel.
+
+        TMX is split at tu boundaries by lib.tmx.split while it is read, and up to max_workers
+        parts are in memory at once. A part failed by a transient error is imported again, a
+        failed part doesn't stop other parts.
+
+        :param translation_memory_id: Uploaded translation units are into here.
+        :param source: TMX, see lib.tmx.read, e.g. path of a file or iter_export of another
+            translation memory.
+        :param part_size: Approximate size of a part in bytes.
+        :param max_workers: Number of parts imported at once.
+        :param retries: Times of retrying a part.
+        :return: models.TmImportResult
+        """
+        result = models.TmImportResult({"parts": 0, "accepted": 0, "failed": {}})
+        futures = {}
+
+        def collect(done: Iterable[concurrent.futures.Future]) -> None:
+            for future in done:
+                index = futures.pop(future)
+                try:
+                    result["accepted"] += future.result()
+                except exceptions.MemsourceException as e:
+                    result["failed"][index] = e
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for (index, part) in enumerate(tmx.split(source, part_size)):
+                result["parts"] += 1
+                futures[executor.submit(
+                    bulk.call_with_retries, self._import_part, translation_memory_id, index, part,
+                    retries=retries)] = index
+
+                # Don't read TMX far ahead of requests.
+                if len(futures) >= max_workers:
+                    (done, _) = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(done)
+
+            collect(concurrent.futures.as_completed(list(futures)))
+
+        return result
+
     def search_segment_by_job(
             self,
             project_id: int,
@@ -104,6 +269,7 @@ class TranslationMemory(api_rest.BaseApi):
             next_segment: Optional[str]=None,
             previous_segment: Optional[str]=None,
             score_threshold: float=constants.TM_THRESHOLD,
+            raw: Optional[bool]=None,
             **kwargs
     ) -> List[models.SegmentSearchResult]:
         """Get translation matches.
@@ -114,6 +280,7 @@ class TranslationMemory(api_rest.BaseApi):
         :param next_segment: Effect for 101% match
         :param previous_segment: Effect for 101% match
         :param score_threshold: return only high score than this value
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
         :param kwargs: See the Memsource official document
             https://cloud.memsource.com/web/docs/api#operation/searchSegmentByJob
 
@@ -132,11 +299,73 @@ class TranslationMemory(api_rest.BaseApi):
             parameters["previousSegment"] = previous_segment
 
         url = "v1/projects/{}/jobs/{}/transMemories/searchSegment".format(project_id, job_uid)
-        response = self._post(url, parameters)
-        return [
-            models.SegmentSearchResult(item)
-            for item in response["searchResults"]
-        ]
+        # Translation memories of the job are unknown, so changes of any translation memory drop
+        # this.
+        key = (
+            "search_segment_by_job", str(project_id), job_uid,
+            search_cache.normalize_text(segment),
+            search_cache.normalize_text(next_segment),
+            search_cache.normalize_text(previous_segment),
+            round(float(score_threshold), 4),
+            json.dumps(kwargs, sort_keys=True),
+        )
+        return self._cached_search(key, None, url, parameters, raw)
+
+    def search_segments_by_job(
+            self,
+            project_id: int,
+            job_uid: str,
+            segments: List[Union[str, Dict[str, Optional[str]]]],
+            score_threshold: float=constants.TM_THRESHOLD,
+            max_workers: int=4,
+            raw: Optional[bool]=None,
+            **kwargs
+    ) -> List[List[models.SegmentSearchResult]]:
+        """Get translation matches of many segments.
+
+        Duplicated segments are searched once, and unique segments are searched in parallel.
+        Rate of requests is limited by BaseApi.use_rate_limiter.
+
+        :param project_id: project ID
+        :param job_uid: job UID
+        :param segments: Segment texts, or dicts with keys segment, and optional next_segment and
+            previous_segment.
+        :param score_threshold: return only high score than this value
+        :param max_workers: Number of requests at once.
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
+        :param kwargs: See search_segment_by_job
+        :return: List of results of search_segment_by_job in order of segments. Repeated
+            segments get their own copies of results.
+        """
+        keys = []
+        unique = collections.OrderedDict()
+        for segment in segments:
+            if isinstance(segment, str):
+                segment = {"segment": segment}
+
+            key = tuple(search_cache.normalize_text(segment.get(name)) for name in (
+                "segment", "next_segment", "previous_segment"))
+            keys.append(key)
+            unique.setdefault(key, segment)
+
+        def search(segment: Dict[str, Optional[str]]) -> List[models.SegmentSearchResult]:
+            return self._clone().search_segment_by_job(
+                project_id, job_uid, segment["segment"],
+                next_segment=segment.get("next_segment"),
+                previous_segment=segment.get("previous_segment"),
+                score_threshold=score_threshold, raw=raw, **kwargs)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(unique, executor.map(search, unique.values())))
+
+        # Copy results of repeated segments, so changing one of them doesn't change the others.
+        found = []
+        seen = set()
+        for key in keys:
+            found.append(copy.deepcopy(results[key]) if key in seen else results[key])
+            seen.add(key)
+
+        return found
 
     def search(
             self,
@@ -146,6 +375,7 @@ class TranslationMemory(api_rest.BaseApi):
             target_langs: Union[List[str], str],
             next_segment: Optional[str]=None,
             previous_segment: Optional[str]=None,
+            raw: Optional[bool]=None,
             **kwargs
     ) -> List[models.SegmentSearchResult]:
         """Get translation matches.
@@ -156,6 +386,7 @@ class TranslationMemory(api_rest.BaseApi):
         :param target_langs: Target languages of translation memory.
         :param next_segment: Effect for 101% match
         :param previous_segment: Effect for 101% match
+        :param raw: Return list of dict instead of models, see BaseApi._to_models
         :param kwargs: See the Memsource official document
             https://cloud.memsource.com/web/docs/api#operation/search
 
@@ -176,11 +407,18 @@ class TranslationMemory(api_rest.BaseApi):
         if previous_segment is not None:
             parameters["previousSegment"] = previous_segment
 
-        result = self._post("v1/transMemories/{}/search".format(translation_memory_id), parameters)
-        return [
-            models.SegmentSearchResult(item)
-            for item in result["searchResults"]
-        ]
+        key = (
+            "search", str(translation_memory_id),
+            search_cache.normalize_text(query),
+            source_lang,
+            tuple(sorted([target_langs] if isinstance(target_langs, str) else target_langs or ())),
+            search_cache.normalize_text(next_segment),
+            search_cache.normalize_text(previous_segment),
+            json.dumps(kwargs, sort_keys=True),
+        )
+        return self._cached_search(
+            key, str(translation_memory_id),
+            "v1/transMemories/{}/search".format(translation_memory_id), parameters, raw)
 
     def export(
             self,
@@ -216,6 +454,29 @@ class TranslationMemory(api_rest.BaseApi):
 
         return buffer.getvalue()
 
+    def iter_export(
+            self, async_request_id: str, chunk_size: int=constants.CHUNK_SIZE * 64
+    ) -> Iterator[bytes]:
+        """Download export file chunk by chunk without keeping it in memory.
+
+        :param async_request_id: ID of the async request of export.
+        :param chunk_size: Size of a chunk in bytes.
+        :return: Iterator of chunks of TMX.
+        """
+        response = self._get_stream(
+            "v1/transMemories/downloadExport/{}".format(async_request_id), stream=True)
+
+        with contextlib.closing(response):
+            yield from response.iter_content(chunk_size)
+
+    def read_export(self, async_request_id: str) -> Iterator[models.TmxUnit]:
+        """Read translation units of export file while downloading it.
+
+        :param async_request_id: ID of the async request of export.
+        :return: Iterator of models.TmxUnit, see lib.tmx.read.
+        """
+        return tmx.read(self.iter_export(async_request_id))
+
     def insert(
             self,
             translation_memory_id: int,
@@ -233,6 +494,16 @@ class TranslationMemory(api_rest.BaseApi):
         :previous_source_segment :optional This is for 101% match :str
         :next_source_segment :optional This is for 101% match :str
         """
+        dedup = self._dedup
+        if dedup is not None:
+            key = tm_dedup.pair_key({
+                "target_lang": target_lang,
+                "source_segment": source_segment,
+                "target_segment": target_segment,
+            })
+            if dedup.contains(translation_memory_id, key):
+                return
+
         params = {
             "sourceSegment": source_segment,
             "targetLang": target_lang,
@@ -247,6 +518,9 @@ class TranslationMemory(api_rest.BaseApi):
             params["nextSourceSegment"] = next_source_segment
 
         self._post("v1/transMemories/{}/segments".format(translation_memory_id), params)
+        self._invalidate_search_cache(translation_memory_id)
+        if dedup is not None:
+            dedup.add(translation_memory_id, [key])
 
     def delete_source_and_translations(self, translation_memory_id: int, segment_id: str) -> None:
         """Delete segments from a translation memory.
@@ -255,3 +529,115 @@ class TranslationMemory(api_rest.BaseApi):
         :param segment_id: ID of the segment.
         """
         self._delete("v1/transMemories/{}/segments/{}".format(translation_memory_id, segment_id))
+        self._invalidate_search_cache(translation_memory_id)
+        if self._dedup is not None:
+            self._dedup.forget(translation_memory_id)
+
+    def delete_many(
+            self,
+            translation_memory_id: int,
+            segment_ids: Iterable[str],
+            max_workers: int=4,
+            retries: int=2,
+    ) -> models.TmDeleteResult:
+        """Delete many segments from a translation memory in parallel.
+
+        A segment is deleted by a request. Requests failed by timeout, too many requests or
+        server error are retried.
+
+        :param translation_memory_id: ID of the translation memory.
+        :param segment_ids: Delete these segments.
+        :param max_workers: Number of requests at once.
+        :param retries: Times of retrying a failed request.
+        :return: models.TmDeleteResult
+        """
+        (deleted, failed) = bulk.run_in_chunks(
+            lambda chunk: self._clone().delete_source_and_translations(
+                translation_memory_id, chunk[0]),
+            segment_ids, chunk_size=1, max_workers=max_workers, retries=retries,
+        )
+
+        return models.TmDeleteResult({"deleted": deleted, "failed": failed})
+
+    def insert_many(
+            self,
+            translation_memory_id: int,
+            source_lang: str,
+            segments: Iterable[Dict[str, str]],
+            chunk_size: int=1000,
+            import_threshold: int=50,
+            max_workers: int=4,
+    ) -> models.TmInsertResult:
+        """Insert many segments into a translation memory.
+
+        Segments are read chunk by chunk. A chunk of import_threshold or more segments is
+        imported as TMX with one request, smaller chunks are inserted one by one in parallel.
+        Up to max_workers chunks are in memory at once. Known segments are skipped if dedup is
+        configured, see use_dedup.
+
+        :param translation_memory_id: Insert segments into this translation memory.
+        :param source_lang: Source language of the translation memory.
+        :param segments: Dicts with keys of parameters of insert, i.e. target_lang,
+            source_segment, target_segment, and optional previous_source_segment and
+            next_source_segment.
+        :param chunk_size: Number of segments in a TMX import.
+        :param import_threshold: Import a chunk if it has this number of segments or more.
+        :param max_workers: Number of requests at once.
+        :return: models.TmInsertResult
+        """
+        segments = iter(segments)
+        result = models.TmInsertResult(
+            {"submitted": 0, "skipped": 0, "accepted": 0, "requests": 0})
+        dedup = self._dedup
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = set()
+            while True:
+                chunk = list(itertools.islice(segments, chunk_size))
+                if not chunk:
+                    break
+
+                result["submitted"] += len(chunk)
+                if dedup is not None:
+                    unknown = [segment for segment in chunk if not dedup.contains(
+                        translation_memory_id, tm_dedup.pair_key(segment))]
+                    result["skipped"] += len(chunk) - len(unknown)
+                    chunk = unknown
+
+                if not chunk:
+                    continue
+
+                if len(chunk) >= import_threshold:
+                    result["requests"] += 1
+                    futures.add(executor.submit(
+                        self._import_segments, translation_memory_id, source_lang, chunk))
+                else:
+                    result["requests"] += len(chunk)
+                    futures.update(executor.submit(
+                        self._insert_segment, translation_memory_id, segment)
+                        for segment in chunk)
+
+                # Don't read segments far ahead of requests.
+                while len(futures) >= max_workers:
+                    (done, futures) = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                    result["accepted"] += sum(future.result() for future in done)
+
+            result["accepted"] += sum(
+                future.result() for future in concurrent.futures.as_completed(futures))
+
+        return result
+
+    def _import_segments(
+            self, translation_memory_id: int, source_lang: str, segments: List[Dict[str, str]]
+    ) -> int:
+        return self._clone().upload_units(
+            translation_memory_id, source_lang, segments, "segments.tmx")
+
+    def _import_part(self, translation_memory_id: int, index: int, part: bytes) -> int:
+        return self._clone()._upload(
+            translation_memory_id, {"file": part}, "part-{}.tmx".format(index))
+
+    def _insert_segment(self, translation_memory_id: int, segment: Dict[str, str]) -> int:
+        self._clone().insert(translation_memory_id, **segment)
+        return 1
@@ -0,0 +1,245 @@
+"""
+Streaming reader of downloaded analyses, see api_rest.analysis.Analysis.read_rows.
+
+CSV and CSV_EXTENDED have a header of two rows. The first row names match bands, e.g. "100%" or
+"95%-99%", and each band spans columns of the second row, e.g. "Segments", "Words",
+"Characters" and "Percent". Columns before the first band, e.g. "File" and "Chars/Word", are
+info of the file. Each following row is a file.
+
+LOG has a block for each file, starting by a "File:" line, and a table of a header line and a
+line for each band. Cells are separated by tabs or two or more spaces.
+"""
+import codecs
+import collections
+import csv
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from memsource import constants, models
+
+_TOTAL_NAMES = ('total', 'all')
+_TOTAL_METRICS = ('segments', 'words', 'characters')
+_LOG_CELL_SEPARATOR = re.compile(r'\t|\s{2,}')
+_LOG_FILE = re.compile(r'^\s*(?:File|Filename)\s*:\s*(.*?)\s*$', re.IGNORECASE)
+_LOG_TOTAL = re.compile(r'^\s*(?:Analy[sz]e|Analysis)\s+Total\b', re.IGNORECASE)
+# Integer with thousands separators, by comma or by point. A single point is a decimal point.
+_GROUPED = re.compile(r'^[-+]?\d{1,3}(?:(?:,\d{3})+|(?:\.\d{3}){2,})$')
+
+
+class BandTotals(object):
+    """
+    Words, characters and segments of each match band summed over files.
+
+    Rows of totals in the analysis, e.g. "Total", are not summed.
+    """
+
+    def __init__(self) -> None:
+        # Dict of metrics by band, in order of bands in the analysis.
+        self.bands = collections.OrderedDict()
+        self.files = 0
+
+    def add(self, row: models.AnalysisRow) -> None:
+        if row.is_total:
+            return
+
+        self.files += 1
+        for (band, metrics) in row.bands.items():
+            totals = self.bands.get(band)
+            if totals is None:
+                totals = self.bands[band] = dict.fromkeys(_TOTAL_METRICS, 0)
+
+            for key in _TOTAL_METRICS:
+                value = metrics.get(key)
+                if isinstance(value, (int, float)):
+                    totals[key] += value
+
+
+def to_value(text: str) -> Union[int, float, str, None]:
+    """Convert a cell to int or float if it is a number, e.g. "1 234", "1,234", "5,2" or "12.5%".
+
+    A comma followed by exactly three digits is a thousands separator if there is no decimal
+    point, so "1,234" is 1234 and "1,23" is 1.23.
+
+    :return: Number, None for an empty cell, or the stripped text.
+    """
+    text = text.strip()
+    if not text:
+        return None
+
+    number = text.rstrip('%').replace(' ', '').replace('\xa0', '')
+    if _GROUPED.match(number):
+        # Thousands separators, e.g. "1,234" or "1.234.567".
+        number = number.replace(',', '').replace('.', '')
+    elif ',' in number:
+        # The last of comma and point is the decimal separator, e.g. "1,234.5" or "1.234,5".
+        if number.rfind(',') < number.rfind('.'):
+            number = number.replace(',', '')
+        else:
+            number = number.replace('.', '').replace(',', '.')
+
+    for convert in (int, float):
+        try:
+            return convert(number)
+        except ValueError:
+            pass
+
+    return text
+
+
+def _metric_name(text: str) -> str:
+    return '_'.join(text.strip().lower().split())
+
+
+def _iter_lines(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """Decode chunks into lines with line endings."""
+    rest = ''
+    for text in codecs.iterdecode(chunks, encoding):
+        lines = (rest + text).splitlines(True)
+        # The last line may continue in the next chunk.
+        rest = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        yield from lines
+
+    if rest:
+        yield rest
+
+
+def _row(
+        file_name: str, info: Dict[str, Any], bands: Dict[str, Dict[str, Any]]
+) -> models.AnalysisRow:
+    return models.AnalysisRow({
+        'file': file_name.strip(),
+        'info': info,
+        'bands': bands,
+        'is_total': file_name.strip().lower() in _TOTAL_NAMES,
+    })
+
+
+def _read_csv(lines: Iterator[str]) -> Iterator[models.AnalysisRow]:
+    lines = iter(lines)
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+
+    # Semicolons by default, Memsource writes semicolons or commas.
+    delimiter = max(';,\t', key=first_line.count)
+    previous = []
+    columns = None  # List of (band, metric) by column. Band is None for info columns.
+    # A row is yielded after the next row, because the first row of a header looks like a file.
+    pending = None
+
+    for cells in csv.reader(_prepend(first_line, lines), delimiter=delimiter):
+        metrics = [_metric_name(cell) for cell in cells]
+        if 'words' in metrics:
+            # The second row of the header. Later sections have headers again.
+            columns = _csv_columns(previous, metrics)
+            pending = None
+        else:
+            if pending is not None:
+                yield pending
+
+            pending = None if columns is None else _csv_row(columns, cells)
+
+        previous = cells
+
+    if pending is not None:
+        yield pending
+
+
+def _csv_row(
+        columns: List[Tuple[Optional[str], str]], cells: List[str]
+) -> Optional[models.AnalysisRow]:
+    info = {}
+    bands = collections.OrderedDict()
+    for ((band, metric), cell) in zip(columns, cells):
+        if band is None:
+            info[metric] = to_value(cell)
+        elif metric:
+            bands.setdefault(band, {})[metric] = to_value(cell)
+
+    # Empty rows and other rows than files, e.g. the title of the next section.
+    if not cells or not cells[0].strip() or not any(
+            isinstance(value, (int, float)) for metrics in bands.values()
+            for value in metrics.values()):
+        return None
+
+    return _row(cells[0], info, bands)
+
+
+def _csv_columns(bands: List[str], metrics: List[str]) -> List[Tuple[Optional[str], str]]:
+    first_band = next(i for (i, metric) in enumerate(metrics) if metric in _TOTAL_METRICS)
+    columns = []
+    band = None
+
+    for (i, metric) in enumerate(metrics):
+        label = bands[i].strip() if i < len(bands) else ''
+        if i < first_band:
+            columns.append((None, _metric_name(label) or metric or str(i)))
+            continue
+
+        # A band spans the following columns without labels.
+        band = label or band
+        columns.append((band, metric))
+
+    return columns
+
+
+def _prepend(line: str, lines: Iterator[str]) -> Iterator[str]:
+    yield line
+    yield from lines
+
+
+def _read_log(lines: Iterator[str]) -> Iterator[models.AnalysisRow]:
+    file_name = None
+    metrics = None
+    bands = collections.OrderedDict()
+
+    for line in lines:
+        match = _LOG_FILE.match(line)
+        if match or _LOG_TOTAL.match(line):
+            if file_name is not None and bands:
+                yield _row(file_name, {}, bands)
+
+            file_name = match.group(1) if match else 'Total'
+            (metrics, bands) = (None, collections.OrderedDict())
+            continue
+
+        cells = [cell for cell in _LOG_CELL_SEPARATOR.split(line.strip()) if cell]
+        if len(cells) < 2 or file_name is None:
+            continue
+
+        names = [_metric_name(cell) for cell in cells]
+        if 'words' in names:
+            # The first cell names labels of bands, e.g. "Match Types", if there is a cell more.
+            metrics = names[1:] if names[0] not in _TOTAL_METRICS else names
+        elif metrics is not None:
+            values = [to_value(cell) for cell in cells[-len(metrics):]]
+            label = ' '.join(cells[:-len(metrics)])
+            if label and all(isinstance(value, (int, float)) for value in values):
+                bands[label] = dict(zip(metrics, values))
+
+    if file_name is not None and bands:
+        yield _row(file_name, {}, bands)
+
+
+def read(
+        chunks: Iterable[bytes],
+        file_format: constants.AnalysisFormat=constants.AnalysisFormat.CSV,
+        totals: Optional[BandTotals]=None,
+        encoding: str='utf-8-sig',
+) -> Iterator[models.AnalysisRow]:
+    """Read rows of an analysis while it is downloaded. Nothing is written to disk.
+
+    :param chunks: Bytes of the analysis, e.g. Analysis.iter_download.
+    :param file_format: Format of the analysis.
+    :param totals: Add each row into this while reading.
+    :param encoding: Encoding of the analysis.
+    :return: Iterator of models.AnalysisRow
+    """
+    lines = _iter_lines(chunks, encoding)
+    rows = _read_log(lines) if file_format is constants.AnalysisFormat.LOG else _read_csv(lines)
+
+    for row in rows:
+        if totals is not None:
+            totals.add(row)
+
+        yield row
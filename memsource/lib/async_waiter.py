@@ -0,0 +1,283 @@
+import concurrent.futures
+import threading
+import time
+from typing import Iterator, List, Optional, Set, Union
+
+from memsource import exceptions, models
+from memsource.api_rest import asynchronous
+from memsource.lib import bulk
+
+
+class _Pending(object):
+    __slots__ = ('future', 'interval', 'due')
+
+    def __init__(self, future: concurrent.futures.Future, interval: float, due: float) -> None:
+        self.future = future
+        self.interval = interval
+        self.due = due
+
+
+class AsyncWaiter(object):
+    """
+    Wait for many asynchronous requests together, e.g. of Job.pre_translate and Analysis.create.
+
+    Each request is polled with its own interval. It starts at min_interval and grows by backoff
+    up to max_interval, so long running requests cost few API calls. When batch_threshold or more
+    requests are due at once, one listing of pending requests tells which of them are finished,
+    and only the finished ones are fetched.
+
+    This class is thread-safe. Futures can be resolved from another thread with resolve. Polls
+    from several threads, e.g. wait and CallbackReceiver, run one by one, so a request is not
+    fetched twice.
+    """
+
+    def __init__(
+            self,
+            api: asynchronous.Asynchronous,
+            min_interval: float=1.0,
+            max_interval: float=60.0,
+            backoff: float=1.5,
+            batch_threshold: int=5,
+            page_size: int=50,
+    ) -> None:
+        """
+        :param api: Poll with this API.
+        :param min_interval: Seconds between added and the first poll of a request.
+        :param max_interval: Polling interval of a request doesn't grow over this.
+        :param backoff: Interval of a request is multiplied by this when it is not finished.
+        :param batch_threshold: List pending requests when this number of requests are due.
+        :param page_size: Page size of listing pending requests.
+        """
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_threshold = batch_threshold
+        self.page_size = page_size
+
+        # Number of API calls made by this waiter.
+        self.api_calls = 0
+        # _Pending by ID of request.
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Held while polling. Due requests are decided under it, so they are fetched once.
+        self._poll_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of requests which are not finished yet."""
+        return len(self._pending)
+
+    def add(
+            self, async_request: Union[models.AsynchronousRequest, str]
+    ) -> concurrent.futures.Future:
+        """Start waiting for an asynchronous request.
+
+        The future is resolved with finished models.AsynchronousRequest. Check has_error of it,
+        because failed requests are finished too.
+
+        :param async_request: models.AsynchronousRequest or its ID.
+        :return: Future of the request. Same future is returned if the request is added again.
+        """
+        async_request_id = self._id(async_request)
+
+        with self._lock:
+            pending = self._pending.get(async_request_id)
+            if pending is None:
+                pending = _Pending(
+                    concurrent.futures.Future(),
+                    self.min_interval,
+                    time.monotonic() + self.min_interval,
+                )
+                self._pending[async_request_id] = pending
+
+        return pending.future
+
+    def resolve(self, async_request: models.AsynchronousRequest) -> bool:
+        """Resolve the future of a finished request.
+
+        :param async_request: Finished request.
+        :return: False if the request is not waited for.
+        """
+        with self._lock:
+            pending = self._pending.pop(self._id(async_request), None)
+
+        if pending is None:
+            return False
+
+        if pending.future.set_running_or_notify_cancel():
+            pending.future.set_result(async_request)
+
+        return True
+
+    def poll_soon(self, async_request: Union[models.AsynchronousRequest, str]) -> bool:
+        """Make a request due now, e.g. when a callback says it is finished without details.
+
+        :param async_request: models.AsynchronousRequest or its ID.
+        :return: False if the request is not waited for.
+        """
+        with self._lock:
+            pending = self._pending.get(self._id(async_request))
+            if pending is None:
+                return False
+
+            pending.due = time.monotonic()
+
+        return True
+
+    def seconds_until_next_poll(self) -> Optional[float]:
+        """Seconds until any request is due. None if no request is waited for."""
+        with self._lock:
+            if not self._pending:
+                return None
+
+            due = min(pending.due for pending in self._pending.values())
+
+        return max(0.0, due - time.monotonic())
+
+    def poll(self) -> List[models.AsynchronousRequest]:
+        """Check requests which are due once. Requests which are not finished are backed off.
+
+        :return: Requests finished in this poll.
+        """
+        with self._poll_lock:
+            return self._poll()
+
+    def _poll(self) -> List[models.AsynchronousRequest]:
+        now = time.monotonic()
+        with self._lock:
+            for async_request_id in [async_request_id for async_request_id, pending
+                                     in self._pending.items() if pending.future.cancelled()]:
+                del self._pending[async_request_id]
+
+            due = [
+                async_request_id for async_request_id, pending in self._pending.items()
+                if pending.due <= now
+            ]
+
+        if not due:
+            return []
+
+        not_finished = []
+        maybe_finished = due
+        if len(due) >= self.batch_threshold:
+            try:
+                pending_ids = self._list_pending_ids()
+            except exceptions.MemsourceApiException as e:
+                if bulk.is_transient(e):
+                    # Listing again later is cheaper than fetching each request now.
+                    self._back_off(due)
+                    return []
+
+                # Fetch each request if listing is not possible, e.g. not permitted.
+                pending_ids = set()
+
+            not_finished = [async_request_id for async_request_id in due
+                            if async_request_id in pending_ids]
+            maybe_finished = [async_request_id for async_request_id in due
+                              if async_request_id not in pending_ids]
+
+        finished = []
+        for async_request_id in maybe_finished:
+            try:
+                self.api_calls += 1
+                async_request = self.api.get(async_request_id, raw=False)
+            except exceptions.MemsourceApiException as e:
+                # Timeout, connection error, too many requests and server errors are retried.
+                if bulk.is_transient(e):
+                    not_finished.append(async_request_id)
+                else:
+                    self._fail(async_request_id, e)
+                continue
+
+            if async_request.is_complete():
+                if self.resolve(async_request):
+                    finished.append(async_request)
+            else:
+                not_finished.append(async_request_id)
+
+        self._back_off(not_finished)
+
+        return finished
+
+    def as_completed(
+            self, timeout: Optional[float]=None
+    ) -> Iterator[concurrent.futures.Future]:
+        """Poll until all requests added so far are finished, and yield each future when finished.
+
+        Futures resolved by other threads are yielded too, without waiting for the next poll.
+
+        :param timeout: Raise concurrent.futures.TimeoutError after this seconds.
+        :return: Iterator of futures in order of completion.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            futures = set(pending.future for pending in self._pending.values())  # type: Set
+
+        while futures:
+            self.poll()
+
+            done = set(future for future in futures if future.done())
+            for future in done:
+                yield future
+
+            futures -= done
+            if not futures:
+                return
+
+            delay = self.seconds_until_next_poll() or 0.0
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise concurrent.futures.TimeoutError(
+                        '{} requests are not finished'.format(len(futures)))
+
+                delay = min(delay, remaining)
+
+            concurrent.futures.wait(
+                futures, timeout=delay, return_when=concurrent.futures.FIRST_COMPLETED)
+
+    def wait(self, timeout: Optional[float]=None) -> List[models.AsynchronousRequest]:
+        """Poll until all requests added so far are finished.
+
+        :param timeout: Raise concurrent.futures.TimeoutError after this seconds.
+        :return: Finished requests in order of completion.
+        """
+        return [future.result() for future in self.as_completed(timeout)]
+
+    def _list_pending_ids(self) -> Set[str]:
+        pending_ids = set()
+        page = 0
+        while True:
+            self.api_calls += 1
+            async_requests = self.api.list_pending(page, self.page_size, raw=True)
+            pending_ids.update(str(async_request['id']) for async_request in async_requests)
+
+            if len(async_requests) < self.page_size:
+                return pending_ids
+
+            page += 1
+
+    def _back_off(self, async_request_ids: List[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for async_request_id in async_request_ids:
+                pending = self._pending.get(async_request_id)
+                if pending is None:
+                    continue
+
+                pending.interval = min(pending.interval * self.backoff, self.max_interval)
+                pending.due = now + pending.interval
+
+    def _fail(self, async_request_id: str, exception: Exception) -> None:
+        with self._lock:
+            pending = self._pending.pop(async_request_id, None)
+
+        if pending is not None and pending.future.set_running_or_notify_cancel():
+            pending.future.set_exception(exception)
+
+    @staticmethod
+    def _id(async_request: Union[models.AsynchronousRequest, str]) -> str:
+        if isinstance(async_request, dict):
+            return str(async_request['id'])
+
+        return str(async_request)
@@ -0,0 +1,106 @@
+import concurrent.futures
+import itertools
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from memsource import exceptions
+
+
+def is_transient(error: BaseException) -> bool:
+    """The request may succeed if it is sent again.
+
+    Timeout and connection error don't have status code. 429 is too many requests.
+    """
+    if not isinstance(error, exceptions.MemsourceApiException):
+        return False
+
+    return error.status_code is None or error.status_code == 429 or error.status_code >= 500
+
+
+def call_with_retries(
+        func: Callable[..., Any],
+        *args: Any,
+        retries: int=2,
+        retry_wait: float=1.0
+) -> Any:
+    """Call func, and call it again when it failed by a transient error.
+
+    :param func: Function which calls the API.
+    :param args: Arguments of func.
+    :param retries: Times of retrying.
+    :param retry_wait: Seconds before the first retry. It is doubled for each retry.
+    :return: Return value of func. The last error is raised if all attempts failed.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args)
+        except exceptions.MemsourceException as e:
+            if attempt == retries or not is_transient(e):
+                raise
+
+        time.sleep(retry_wait * 2 ** attempt)
+
+
+def run_in_chunks(
+        func: Callable[[List[Any]], Any],
+        items: Iterable[Any],
+        chunk_size: int,
+        max_workers: int=4,
+        retries: int=2,
+        retry_wait: float=1.0,
+) -> Tuple[List[Any], Dict[Any, BaseException]]:
+    """Call func with chunks of items in parallel. Chunks failed by transient errors are retried.
+
+    :param func: Called with a list of up to chunk_size items. It raises if the chunk failed.
+    :param items: Hashable items, e.g. IDs.
+    :param chunk_size: Max number of items in a chunk.
+    :param max_workers: Number of chunks processed at once.
+    :param retries: Times of retrying a chunk.
+    :param retry_wait: Seconds before the first retry. It is doubled for each retry.
+    :return: Succeeded items in order of items, and errors of failed items.
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items, chunk_size)), [])
+    succeeded = []
+    failed = {}
+    # (index, chunk) by future, and (chunk, error) of finished chunks by index until all chunks
+    # before them are finished, so succeeded items are in order.
+    futures = {}
+    finished = {}
+    next_index = 0
+
+    def run(chunk: List[Any]) -> Optional[BaseException]:
+        try:
+            call_with_retries(func, chunk, retries=retries, retry_wait=retry_wait)
+        except exceptions.MemsourceException as e:
+            return e
+
+        return None
+
+    def collect(done: Iterable[concurrent.futures.Future]) -> None:
+        nonlocal next_index
+        for future in done:
+            (index, chunk) = futures.pop(future)
+            finished[index] = (chunk, future.result())
+
+        while next_index in finished:
+            (chunk, error) = finished.pop(next_index)
+            if error is None:
+                succeeded.extend(chunk)
+            else:
+                failed.update((item, error) for item in chunk)
+
+            next_index += 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Chunks are made and submitted when a worker is free, so items are not read at once.
+        for (index, chunk) in enumerate(chunks):
+            futures[executor.submit(run, chunk)] = (index, chunk)
+            if len(futures) >= max_workers:
+                (done, _) = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+
+        collect(concurrent.futures.as_completed(list(futures)))
+
+    return (succeeded, failed)
@@ -0,0 +1,177 @@
+import http.server
+import json
+import logging
+import socketserver
+import threading
+import urllib.parse
+import uuid
+from http import HTTPStatus
+from typing import Any, Optional
+
+from memsource import models
+from memsource.lib import async_waiter
+
+logger = logging.getLogger(__name__)
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    # CallbackReceiver sets it.
+    receiver = None  # type: CallbackReceiver
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        status = self.server.receiver.handle(
+            self.path, self.rfile.read(int(self.headers.get('Content-Length', 0))))
+
+        self.send_response(status.value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Don't write every callback into stderr.
+        pass
+
+
+class CallbackReceiver(object):
+    """
+    Small HTTP server which receives callbacks of asynchronous requests and resolves futures of
+    AsyncWaiter. Pass callback_url as callbackUrl of e.g. Job.pre_translate.
+
+    The waiter is polled in a background thread too, so requests are finished even if callbacks
+    are lost. Give the waiter long intervals, because most requests are finished by callbacks.
+
+    e.g.
+        waiter = async_waiter.AsyncWaiter(m.asynchronous, min_interval=30, max_interval=300)
+        with CallbackReceiver(waiter, public_url='https://example.com:8080') as receiver:
+            waiter.add(m.job.pre_translate(
+                project_id, job_uids, callback_url=receiver.callback_url))
+            waiter.wait()
+    """
+
+    def __init__(
+            self,
+            waiter: async_waiter.AsyncWaiter,
+            host: str='127.0.0.1',
+            port: int=0,
+            public_url: Optional[str]=None,
+            idle_interval: float=1.0,
+    ) -> None:
+        """
+        :param waiter: Resolve futures of this waiter.
+        :param host: Listen on this host.
+        :param port: Listen on this port. If 0, a free port is used.
+        :param public_url: Base URL at which Memsource can reach this server, e.g. behind NAT.
+            If None, the local address is used.
+        :param idle_interval: The fallback poller checks for new requests at this interval.
+        """
+        self.waiter = waiter
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.idle_interval = idle_interval
+
+        # Callbacks without this token are rejected.
+        self.token = uuid.uuid4().hex
+        self._server = None  # type: Optional[_Server]
+        self._threads = []
+        self._stopped = threading.Event()
+
+    @property
+    def callback_url(self) -> str:
+        """URL for callbackUrl parameter. It is available after start."""
+        if self._server is None:
+            raise RuntimeError('CallbackReceiver is not started')
+
+        base_url = self.public_url
+        if base_url is None:
+            (host, port) = self._server.server_address[:2]
+            base_url = 'http://{}:{}'.format(host, port)
+
+        return '{}/callback?{}'.format(
+            base_url.rstrip('/'), urllib.parse.urlencode({'token': self.token}))
+
+    def start(self) -> None:
+        """Start the server and the fallback poller in background threads."""
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.receiver = self
+        self._stopped.clear()
+
+        self._threads = [
+            # Short poll interval, so stop doesn't wait long.
+            threading.Thread(
+                target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True),
+            threading.Thread(target=self._poll_forever, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop the server and the poller. Requests are still waited for by the waiter."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+        for thread in self._threads:
+            thread.join()
+
+        self._threads = []
+
+    def __enter__(self) -> 'CallbackReceiver':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def handle(self, path: str, body: bytes) -> HTTPStatus:
+        """Handle a callback.
+
+        The body is the asynchronous request, or it is wrapped by asyncRequest. If the body
+        doesn't have asyncResponse, the request is polled soon instead.
+
+        :param path: Path and query string of the callback.
+        :param body: Body of the callback.
+        :return: HTTP status of the response.
+        """
+        url = urllib.parse.urlsplit(path)
+        if url.path.rstrip('/') != '/callback':
+            return HTTPStatus.NOT_FOUND
+
+        if urllib.parse.parse_qs(url.query).get('token') != [self.token]:
+            return HTTPStatus.FORBIDDEN
+
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST
+
+        if isinstance(payload, dict) and isinstance(payload.get('asyncRequest'), dict):
+            payload = payload['asyncRequest']
+
+        if not isinstance(payload, dict) or 'id' not in payload:
+            return HTTPStatus.BAD_REQUEST
+
+        async_request = models.AsynchronousRequest(payload)
+        if async_request.is_complete():
+            self.waiter.resolve(async_request)
+        else:
+            self.waiter.poll_soon(async_request)
+
+        # Unknown requests are accepted too, otherwise Memsource would send it again.
+        return HTTPStatus.NO_CONTENT
+
+    def _poll_forever(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.waiter.poll()
+            except Exception:
+                # Keep polling, e.g. after a connection error. Requests are polled again later.
+                logger.exception('Failed to poll asynchronous requests')
+
+            delay = self.waiter.seconds_until_next_poll()
+            self._stopped.wait(
+                self.idle_interval if delay is None else min(delay, self.idle_interval))
@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, Optional
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonCodec(object):
+    """
+    Encode request bodies and decode response bodies as JSON with the json module.
+
+    Subclasses replace loads and dumps with faster libraries.
+    """
+    content_type = 'application/json'
+
+    def loads(self, content: bytes) -> Any:
+        return json.loads(content.decode('utf-8'))
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def decode(self, response: requests.models.Response) -> Any:
+        """Decode body of response."""
+        return self.loads(response.content)
+
+    def encode(self, data: Any, headers: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Make keyword arguments of requests for sending data as a JSON body.
+
+        :param data: Send this as JSON.
+        :param headers: Headers of the request, Content-Type is added to a copy of it.
+        :return: Keyword arguments for requests.Session.request
+        """
+        return {
+            'data': self.dumps(data),
+            'headers': dict(headers or {}, **{'Content-Type': self.content_type}),
+        }
+
+
+class RequestsJsonCodec(JsonCodec):
+    """
+    Let requests encode and decode JSON. It is the default codec.
+    """
+    def decode(self, response: requests.models.Response) -> Any:
+        return response.json()
+
+    def encode(self, data: Any, headers: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        arguments = {'json': data}
+        if headers is not None:
+            arguments['headers'] = headers
+
+        return arguments
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec with orjson. You need to install orjson.
+    """
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson')
+
+    def loads(self, content: bytes) -> Any:
+        return orjson.loads(content)
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    JSON codec with ujson. You need to install ujson.
+    """
+    def __init__(self) -> None:
+        if ujson is None:
+            raise ImportError('UjsonCodec requires ujson')
+
+    def loads(self, content: bytes) -> Any:
+        return ujson.loads(content)
+
+    def dumps(self, data: Any) -> bytes:
+        return ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def best_available() -> JsonCodec:
+    """Returns the fastest codec which can be used in this environment.
+
+    Order is orjson, ujson and then the json module.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+
+    if ujson is not None:
+        return UjsonCodec()
+
+    return JsonCodec()
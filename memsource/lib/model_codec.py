@@ -0,0 +1,262 @@
+"""
+Compact serialization of model lists, e.g. for passing them to other processes or caches.
+
+A list of models of one class is turned into columns: name of the class, field names, and
+a row of values per model in order of the field names. Field names are written only once,
+and declared Fields of slotted models come first, so rows of the same class line up. Nested
+dicts, e.g. workflowStep and providers of jobs, are turned into rows in the same way.
+"""
+import collections.abc
+import contextlib
+import gc
+from typing import Any, Iterator, List, Sequence, Tuple, Union
+
+from memsource import models
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMAT_VERSION = 2
+# msgpack extension type of MISSING.
+_MISSING_EXT_TYPE = 1
+
+
+class _Missing(object):
+    """
+    Value of a field which the model doesn't have. It is different from None.
+    """
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+# Kinds of nested columns.
+_DICT = 'dict'
+_LIST = 'list'
+
+Columns = Tuple[str, List[Union[str, list]], List[list]]
+
+
+def to_columns(model_list: Sequence[Any]) -> Columns:
+    """Make columns of models. All models must be same class.
+
+    A field whose values are dicts, e.g. workflowStep, or lists of dicts, e.g. providers, is
+    [name, "dict" or "list", fields] instead of a name, and its values are rows or lists of rows
+    of the fields.
+
+    :param model_list: List of models.
+    :return: Tuple of class name, fields and rows.
+    """
+    if not model_list:
+        return ('', [], [])
+
+    model_class = type(model_list[0])
+    for model in model_list:
+        if type(model) is not model_class:
+            raise TypeError('All models must be {}, but got {}'.format(
+                model_class.__name__, type(model).__name__))
+
+    keys = _keys(model_list)
+    # Declared Fields first, then other keys in order of appearance.
+    declared = [key for key in getattr(model_class, '_field_keys', ()) if key in keys]
+    declared_keys = set(declared)
+    (fields, rows) = _to_table(
+        model_list, declared + [key for key in keys if key not in declared_keys])
+
+    return (model_class.__name__, fields, rows)
+
+
+def _keys(sources: Sequence[dict]) -> List[str]:
+    """Keys of dicts in order of appearance."""
+    keys = {}
+    for source in sources:
+        for key in source:
+            if key not in keys:
+                keys[key] = len(keys)
+
+    return sorted(keys, key=keys.__getitem__)
+
+
+def _to_table(
+        sources: Sequence[dict], keys: List[str]
+) -> Tuple[List[Union[str, list]], List[list]]:
+    fields = []
+    columns = []
+    for key in keys:
+        # dict.get, because models keep decoded JSON, it is smaller than nested models.
+        (field, column) = _to_column(key, [dict.get(source, key, MISSING) for source in sources])
+        fields.append(field)
+        columns.append(column)
+
+    if not columns:
+        # Models or nested dicts without keys, zip would drop their rows.
+        return (fields, [[] for _ in sources])
+
+    return (fields, [list(row) for row in zip(*columns)])
+
+
+def _to_column(key: str, values: List[Any]) -> Tuple[Union[str, list], List[Any]]:
+    """Make values of dicts or lists of dicts into rows, so their keys are written only once."""
+    kind = None
+    for value in values:
+        if value is None or value is MISSING:
+            continue
+
+        # Decoded JSON has dicts, models are dicts too.
+        if isinstance(value, dict):
+            value_kind = _DICT
+        elif isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            value_kind = _LIST
+        else:
+            return (key, values)
+
+        if kind not in (None, value_kind):
+            return (key, values)
+
+        kind = value_kind
+
+    if kind is None:
+        return (key, values)
+
+    present = [value for value in values if value is not None and value is not MISSING]
+    items = present if kind == _DICT else [item for value in present for item in value]
+    (fields, rows) = _to_table(items, _keys(items))
+
+    rows = iter(rows)
+    if kind == _DICT:
+        column = [value if value is None or value is MISSING else next(rows) for value in values]
+    else:
+        column = [
+            value if value is None or value is MISSING else [next(rows) for _ in value]
+            for value in values
+        ]
+
+    return ([key, kind, fields], column)
+
+
+def from_columns(columns: Columns) -> List[Any]:
+    """Make models from columns made by to_columns.
+
+    :param columns: Tuple of class name, fields and rows.
+    :return: List of models.
+    """
+    (class_name, fields, rows) = columns
+    if not rows:
+        return []
+
+    model_class = getattr(models, class_name, None)
+    if not (isinstance(model_class, type) and
+            issubclass(model_class, (models.BaseModel, models.SlottedModel))):
+        raise ValueError('{} is not a model'.format(class_name))
+
+    return [model_class(source) for source in _from_table(fields, rows)]
+
+
+def _from_table(fields: List[Union[str, list]], rows: List[list]) -> List[dict]:
+    if not all(isinstance(field, str) for field in fields):
+        # Nested rows are replaced by dicts, but rows of the caller are not changed.
+        rows = [list(row) for row in rows]
+
+    names = []
+    for (i, field) in enumerate(fields):
+        if isinstance(field, str):
+            names.append(field)
+            continue
+
+        (name, kind, nested_fields) = field
+        names.append(name)
+        _from_column(kind, nested_fields, rows, i)
+
+    return [
+        {name: value for (name, value) in zip(names, row) if value is not MISSING}
+        if MISSING in row else dict(zip(names, row))
+        for row in rows
+    ]
+
+
+def _from_column(kind: str, fields: List[Union[str, list]], rows: List[list], i: int) -> None:
+    """Replace rows of dicts in the i-th column of rows by dicts."""
+    present = [row for row in rows if row[i] is not None and row[i] is not MISSING]
+    if kind == _DICT:
+        for (row, item) in zip(present, _from_table(fields, [row[i] for row in present])):
+            row[i] = item
+    elif kind == _LIST:
+        items = iter(_from_table(fields, [item for row in present for item in row[i]]))
+        for row in present:
+            row[i] = [next(items) for _ in row[i]]
+    else:
+        raise ValueError('Unknown kind of column {}'.format(kind))
+
+
+def _default(obj: Any) -> Any:
+    if obj is MISSING:
+        return msgpack.ExtType(_MISSING_EXT_TYPE, b'')
+
+    if isinstance(obj, collections.abc.Mapping):
+        return dict(obj)
+
+    raise TypeError('Cannot serialize {!r}'.format(obj))
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _MISSING_EXT_TYPE:
+        return MISSING
+
+    return msgpack.ExtType(code, data)
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector.
+
+    Making many containers triggers collections which don't find anything here,
+    and they take longer than decoding itself for large lists.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise ImportError('model_codec.pack and unpack require msgpack')
+
+
+def pack(model_list: Sequence[Any]) -> bytes:
+    """Serialize models of one class with msgpack. You need to install msgpack.
+
+    :param model_list: List of models.
+    :return: Serialized models.
+    """
+    _require_msgpack()
+
+    with _gc_paused():
+        (class_name, fields, rows) = to_columns(model_list)
+
+        return msgpack.packb(
+            [FORMAT_VERSION, class_name, fields, rows], default=_default, use_bin_type=True)
+
+
+def unpack(packed: bytes) -> List[Any]:
+    """Deserialize models serialized by pack. You need to install msgpack.
+
+    :param packed: Serialized models.
+    :return: List of models.
+    """
+    _require_msgpack()
+
+    with _gc_paused():
+        (version, class_name, fields, rows) = msgpack.unpackb(
+            packed, ext_hook=_ext_hook, raw=False)
+
+        if version != FORMAT_VERSION:
+            raise ValueError('Unsupported format version {}'.format(version))
+
+        return from_columns((class_name, fields, rows))
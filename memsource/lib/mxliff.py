@@ -1,5 +1,10 @@
-from memsource import models
-from lxml import objectify
+import concurrent.futures
+import itertools
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from memsource import constants, models
+from lxml import etree, objectify
 
 
 class MxliffParser(object):
@@ -7,10 +12,89 @@ class MxliffParser(object):
     Parse xliff file of Memsource.
     """
 
+    # Fields which are read from trans-unit itself. Any other field name is an origin of alt-trans.
+    unit_fields = ('id', 'score', 'gross_score', 'source', 'target', 'tunit_metadata')
+
+    def __init__(self, fields: Optional[Iterable[str]]=None) -> None:
+        """
+        :param fields: Extract only these fields from each trans-unit, e.g. ('id', 'target').
+            Alt-trans is named by its origin in snake case, e.g. 'machine_trans', 'memsource_tm'.
+            Skipped fields are not put into MxliffUnit. If None, all fields are extracted.
+        """
+        self.fields = None if fields is None else frozenset(fields)
+
+        if self.fields is None:
+            self.wanted_unit_fields = frozenset(self.unit_fields)
+            self.wants_alt_trans = True
+        else:
+            self.wanted_unit_fields = self.fields.intersection(self.unit_fields)
+            self.wants_alt_trans = not self.fields.issubset(self.unit_fields)
+
     def parse(self, resource: {'XML file content as bytes': bytes}):
         root = objectify.fromstring(resource)
-        memsource_namespace = root.nsmap['m']
+        self.set_namespace(root.nsmap['m'])
+
+        return [
+            self.parse_group(group) for group in root.file.body.getchildren()
+        ]
+
+    def iterparse(self, stream: Iterable[bytes]) -> Iterator[models.MxliffUnit]:
+        """Parse xliff chunk by chunk and yield each unit as soon as its group is closed.
+
+        Parsed groups are released, so memory usage doesn't depend on size of the file.
+
+        :param stream: Chunks of XML, e.g. iter_content of a response or a file opened as binary.
+        :return: Iterator of models.MxliffUnit
+        """
+        parser = etree.XMLPullParser(events=('start', 'end'), remove_blank_text=True)
+        parser.set_element_class_lookup(objectify.ObjectifyElementClassLookup())
+        group_tag = None
+
+        for chunk in stream:
+            parser.feed(chunk)
+
+            for event, element in parser.read_events():
+                if group_tag is None:
+                    # The first event is always start of the root element.
+                    self.set_namespace(element.nsmap['m'])
+                    group_tag = '{{{}}}group'.format(element.nsmap[None])
+                elif event == 'end' and element.tag == group_tag:
+                    yield self.parse_group(element)
+
+                    # Drop the group and already parsed siblings.
+                    element.clear()
+                    parent = element.getparent()
+                    while element.getprevious() is not None:
+                        parent.remove(element.getprevious())
+
+        parser.close()
+
+    def parse_files(
+            self,
+            file_paths: Iterable[str],
+            max_workers: Optional[int]=None,
+    ) -> Iterator[models.MxliffFile]:
+        """Parse many MXLIFF files in parallel with a process pool.
+
+        Units are sent back from worker processes as rows of values, see models.MxliffFile.
+
+        :param file_paths: Parse these files.
+        :param max_workers: Number of processes. If None, number of CPUs is used.
+        :return: Iterator of models.MxliffFile in order of file_paths.
+        """
+        fields = None if self.fields is None else tuple(self.fields)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_parse_file, file_paths, itertools.repeat(fields))
+            for (file_path, field_names, rows, seconds) in results:
+                yield models.MxliffFile({
+                    'file_path': file_path,
+                    'fields': field_names,
+                    'rows': rows,
+                    'seconds': seconds,
+                })
 
+    def set_namespace(self, memsource_namespace: str) -> None:
         def to_memsouce_key(s: str) -> str:
             return '{{{}}}{}'.format(memsource_namespace, s)
 
@@ -21,25 +105,36 @@ class MxliffParser(object):
         self.type_key = to_memsouce_key('type')
         self.content_key = to_memsouce_key('content')
 
-        return [
-            self.parse_group(group) for group in root.file.body.getchildren()
-        ]
-
     def parse_group(self, group: objectify.ObjectifiedElement) -> models.MxliffUnit:
         # Because we cannot write 'group.trans-unit'.
         trans_unit = getattr(group, 'trans-unit')
-        source = {
-            'id': trans_unit.attrib['id'],
-            'score': float(trans_unit.attrib[self.score_key]),
-            'gross_score': float(trans_unit.attrib[self.gloss_score_key]),
-            'source': trans_unit.source.text,
-            'target': trans_unit.target.text,
-            'tunit_metadata': self.parse_tunit_metadata(trans_unit),
-        }
-
-        for alt_trans in getattr(trans_unit, 'alt-trans'):
-            # machine-trans, memsource-tm -> machine_trans, memsource_tm
-            source[alt_trans.attrib['origin'].replace('-', '_')] = alt_trans.target.text
+        wanted = self.wanted_unit_fields
+        source = {}
+
+        if 'id' in wanted:
+            source['id'] = trans_unit.attrib['id']
+
+        if 'score' in wanted:
+            source['score'] = float(trans_unit.attrib[self.score_key])
+
+        if 'gross_score' in wanted:
+            source['gross_score'] = float(trans_unit.attrib[self.gloss_score_key])
+
+        if 'source' in wanted:
+            source['source'] = trans_unit.source.text
+
+        if 'target' in wanted:
+            source['target'] = trans_unit.target.text
+
+        if 'tunit_metadata' in wanted:
+            source['tunit_metadata'] = self.parse_tunit_metadata(trans_unit)
+
+        if self.wants_alt_trans:
+            for alt_trans in getattr(trans_unit, 'alt-trans'):
+                # machine-trans, memsource-tm -> machine_trans, memsource_tm
+                origin = alt_trans.attrib['origin'].replace('-', '_')
+                if self.fields is None or origin in self.fields:
+                    source[origin] = alt_trans.target.text
 
         return models.MxliffUnit(source)
 
@@ -55,3 +150,33 @@ class MxliffParser(object):
             'type': getattr(mark, self.type_key).text,
             'content': getattr(mark, self.content_key).text,
         } for mark in getattr(tunit_metadata, self.mark_key)]
+
+
+def _parse_file(
+        file_path: str,
+        fields: Optional[Tuple[str, ...]],
+) -> Tuple[str, List[str], List[tuple], float]:
+    """Worker of MxliffParser.parse_files.
+
+    Returns plain tuples instead of MxliffUnit, because field names are sent only once then.
+    """
+    started = time.perf_counter()
+    field_names = []
+    field_indexes = {}
+    rows = []
+
+    with open(file_path, 'rb') as f:
+        chunks = iter(lambda: f.read(constants.CHUNK_SIZE * 64), b'')
+        for unit in MxliffParser(fields).iterparse(chunks):
+            row = [None] * len(field_names)
+            for key, value in unit.items():
+                if key not in field_indexes:
+                    field_indexes[key] = len(field_names)
+                    field_names.append(key)
+                    row.append(None)
+
+                row[field_indexes[key]] = value
+
+            rows.append(tuple(row))
+
+    return (file_path, field_names, rows, time.perf_counter() - started)
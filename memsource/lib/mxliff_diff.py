@@ -0,0 +1,43 @@
+import hashlib
+from typing import Iterable
+
+from memsource import models
+from memsource.lib import mxliff
+
+
+def _digest(unit: models.MxliffUnit) -> bytes:
+    # None and empty text must be different, because an empty target is a deleted translation.
+    hash_source = '\x00'.join(
+        '\x01' if text is None else text for text in (unit.source, unit.target))
+
+    return hashlib.md5(hash_source.encode('utf-8')).digest()
+
+
+def diff(old_stream: Iterable[bytes], new_stream: Iterable[bytes]) -> models.MxliffDiff:
+    """Compare two versions of a MXLIFF file unit by unit.
+
+    Both versions are parsed as streams. Only a digest of source and target per unit id of
+    the old version is kept in memory, and only changed units of the new version are returned.
+
+    :param old_stream: Chunks of the old MXLIFF, e.g. a file opened as binary.
+    :param new_stream: Chunks of the new MXLIFF, e.g. iter_content of a bilingual file download.
+    :return: models.MxliffDiff
+    """
+    parser = mxliff.MxliffParser(fields=('id', 'source', 'target'))
+    old_digests = {unit.id: _digest(unit) for unit in parser.iterparse(old_stream)}
+
+    added = []
+    modified = []
+    for unit in parser.iterparse(new_stream):
+        old_digest = old_digests.pop(unit.id, None)
+
+        if old_digest is None:
+            added.append(unit)
+        elif old_digest != _digest(unit):
+            modified.append(unit)
+
+    return models.MxliffDiff({
+        'added': added,
+        'removed': list(old_digests),
+        'modified': modified,
+    })
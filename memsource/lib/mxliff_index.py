@@ -0,0 +1,142 @@
+import json
+import mmap
+import os
+import re
+from typing import Dict, Iterable, List, Tuple
+from xml.sax import saxutils
+
+from lxml import objectify
+
+from memsource import models
+from memsource.lib import mxliff
+
+_ROOT_START_TAG = re.compile(rb'<xliff\b[^>]*>')
+_GROUP = re.compile(rb'<group\b.*?</group>', re.DOTALL)
+# A space is required before id, otherwise m:para-id matches.
+_TRANS_UNIT_ID = re.compile(rb'<trans-unit\b[^>]*?\sid="([^"]*)"')
+_XML_ENTITIES = {'&quot;': '"', '&apos;': "'"}
+
+
+class MxliffIndex(object):
+    """
+    Byte offset and length of every group of a MXLIFF file by trans-unit id.
+
+    With this, a few units can be read from a huge file without parsing whole of the file.
+    The index is saved next to the MXLIFF file as a sidecar file, see index_path.
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            root_start_tag: bytes,
+            offsets: Dict[str, Tuple[int, int]],
+    ) -> None:
+        """
+        :param file_path: Path of the indexed MXLIFF file.
+        :param root_start_tag: Start tag of the xliff element. Namespaces are declared in it.
+        :param offsets: Offset and length of group by trans-unit id.
+        """
+        self.file_path = file_path
+        self.root_start_tag = root_start_tag
+        self.offsets = offsets
+
+    @staticmethod
+    def index_path(file_path: str) -> str:
+        return '{}.idx'.format(file_path)
+
+    @classmethod
+    def build(cls, file_path: str) -> 'MxliffIndex':
+        """Scan the file once and make the index.
+
+        :param file_path: Make index of this MXLIFF file.
+        :return: MxliffIndex
+        """
+        offsets = {}
+
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            root_start_tag = _ROOT_START_TAG.search(m).group(0)
+
+            for group in _GROUP.finditer(m):
+                unit_id = _TRANS_UNIT_ID.search(group.group(0)).group(1).decode('utf-8')
+                offsets[saxutils.unescape(unit_id, _XML_ENTITIES)] = (
+                    group.start(), group.end() - group.start())
+
+        return cls(file_path, root_start_tag, offsets)
+
+    @classmethod
+    def open(cls, file_path: str) -> 'MxliffIndex':
+        """Load the sidecar index. If it doesn't exist or is outdated, build and save it.
+
+        :param file_path: Path of the MXLIFF file, not the index.
+        :return: MxliffIndex
+        """
+        index_path = cls.index_path(file_path)
+        if (os.path.exists(index_path) and
+                os.path.getmtime(index_path) >= os.path.getmtime(file_path)):
+            return cls.load(file_path)
+
+        index = cls.build(file_path)
+        index.save()
+
+        return index
+
+    @classmethod
+    def load(cls, file_path: str) -> 'MxliffIndex':
+        """Load the sidecar index of file_path.
+
+        The first line is JSON of the root start tag, following lines are id, offset and length
+        separated by tab.
+        """
+        offsets = {}
+        with open(cls.index_path(file_path), 'r', encoding='utf-8') as f:
+            root_start_tag = json.loads(f.readline()).encode('utf-8')
+
+            for line in f:
+                (unit_id, offset, length) = line.rstrip('\n').rsplit('\t', 2)
+                offsets[unit_id] = (int(offset), int(length))
+
+        return cls(file_path, root_start_tag, offsets)
+
+    def save(self) -> None:
+        with open(self.index_path(self.file_path), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.root_start_tag.decode('utf-8')))
+            f.write('\n')
+
+            for (unit_id, (offset, length)) in self.offsets.items():
+                f.write('{}\t{}\t{}\n'.format(unit_id, offset, length))
+
+    def __contains__(self, unit_id: str) -> bool:
+        return unit_id in self.offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get(
+            self,
+            unit_ids: Iterable[str],
+            parser: mxliff.MxliffParser=None,
+    ) -> List[models.MxliffUnit]:
+        """Read units of unit_ids from the file.
+
+        Only groups of unit_ids are parsed. Unknown ids are ignored.
+
+        :param unit_ids: Read units of these trans-unit ids.
+        :param parser: Use this parser, e.g. for extracting only some fields.
+        :return: List of models.MxliffUnit in order of the file.
+        """
+        parser = mxliff.MxliffParser() if parser is None else parser
+        # Read the file forward.
+        offsets = sorted(self.offsets[unit_id] for unit_id in unit_ids if unit_id in self.offsets)
+        root_end_tag = b'</xliff>'
+
+        units = []
+        with open(self.file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for (offset, length) in offsets:
+                root = objectify.fromstring(
+                    self.root_start_tag + m[offset:offset + length] + root_end_tag)
+                parser.set_namespace(root.nsmap['m'])
+                units.append(parser.parse_group(root.getchildren()[0]))
+
+        return units
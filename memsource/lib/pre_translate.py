@@ -0,0 +1,155 @@
+import collections
+import concurrent.futures
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from memsource import constants, exceptions, models
+from memsource.api_rest import job
+from memsource.lib import async_waiter
+
+
+class _Batch(object):
+    __slots__ = ('job_uids', 'started', 'submit_seconds', 'async_request')
+
+    def __init__(self, job_uids: List[str]) -> None:
+        self.job_uids = job_uids
+        self.started = time.monotonic()
+        self.submit_seconds = None
+        self.async_request = None
+
+    def to_model(
+            self,
+            async_request: Optional[models.AsynchronousRequest]=None,
+            error: Optional[Exception]=None,
+    ) -> models.PreTranslateBatch:
+        return models.PreTranslateBatch({
+            'job_uids': self.job_uids,
+            'async_request': async_request,
+            'error': error,
+            'submit_seconds': self.submit_seconds,
+            'seconds': time.monotonic() - self.started,
+        })
+
+
+class PreTranslateScheduler(object):
+    """
+    Pre-translate many jobs of a project in batches.
+
+    Up to max_in_flight batches are submitted and waited for at once. Rate of API calls is
+    limited by BaseApi.use_rate_limiter.
+
+    Batch size is tuned by time taken to submit a batch. It is halved when submitting takes over
+    target_submit_seconds or times out. It grows by half when submitting takes under half of
+    target_submit_seconds.
+
+    A timed out batch is yielded with the error by default. Memsource may have accepted the
+    request anyway, so submitting it again can pre-translate the jobs twice. If it is acceptable,
+    e.g. pre-translation doesn't overwrite confirmed segments, set retry_timed_out and timed out
+    batches are submitted again in smaller batches.
+    """
+
+    def __init__(
+            self,
+            job_api: job.Job,
+            waiter: async_waiter.AsyncWaiter,
+            batch_size: int=50,
+            min_batch_size: int=1,
+            max_batch_size: int=500,
+            max_in_flight: int=4,
+            target_submit_seconds: float=10.0,
+            retry_timed_out: bool=False,
+    ) -> None:
+        """
+        :param job_api: Submit batches with this API.
+        :param waiter: Wait for async requests of batches with this waiter.
+        :param batch_size: Initial number of jobs in a batch.
+        :param min_batch_size: Batch size is not tuned under this.
+        :param max_batch_size: Batch size is not tuned over this.
+        :param max_in_flight: Number of batches which are submitted or waited for at once.
+        :param target_submit_seconds: Tune batch size so that submitting takes this time.
+        :param retry_timed_out: Submit jobs of timed out batches again. They may be pre-translated
+            twice.
+        """
+        self.job_api = job_api
+        self.waiter = waiter
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.batch_size = max(min_batch_size, min(batch_size, max_batch_size))
+        self.max_in_flight = max_in_flight
+        self.target_submit_seconds = target_submit_seconds
+        self.retry_timed_out = retry_timed_out
+
+    def run(
+            self,
+            project_id: str,
+            job_uids: Iterable[str],
+            translation_memory_threshold: float=constants.TM_THRESHOLD,
+            callback_url: Optional[str]=None,
+    ) -> Iterator[models.PreTranslateBatch]:
+        """Pre-translate jobs, and yield each batch when it is finished.
+
+        The waiter is polled while waiting, so a callback receiver is not required.
+
+        :param project_id: Jobs are in this project.
+        :param job_uids: Pre-translate these jobs.
+        :param translation_memory_threshold: If matching score is higher than this, it is filled.
+        :param callback_url: Callback URL of batches, e.g. of lib.callback_receiver.
+        :return: Iterator of models.PreTranslateBatch in order of completion.
+        """
+        remaining = collections.deque(job_uids)
+        # Future of submitting or of the async request, to its batch.
+        in_flight = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            while remaining or in_flight:
+                while remaining and len(in_flight) < self.max_in_flight:
+                    batch = _Batch([
+                        remaining.popleft()
+                        for _ in range(min(self.batch_size, len(remaining)))
+                    ])
+                    # Requests set attributes of the API, e.g. last_url, so threads use copies.
+                    future = executor.submit(
+                        self.job_api._clone().pre_translate,
+                        project_id, batch.job_uids, translation_memory_threshold, callback_url)
+                    in_flight[future] = batch
+
+                self.waiter.poll()
+                (done, _) = concurrent.futures.wait(
+                    in_flight,
+                    timeout=self.waiter.seconds_until_next_poll(),
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+
+                for future in done:
+                    batch = in_flight.pop(future)
+                    error = future.exception()
+
+                    if batch.async_request is None:
+                        batch.submit_seconds = time.monotonic() - batch.started
+                        timed_out = self._is_timeout(error)
+                        self._tune(batch.submit_seconds, timed_out)
+
+                        if self.retry_timed_out and timed_out and len(batch.job_uids) > 1:
+                            remaining.extendleft(reversed(batch.job_uids))
+                        elif error is not None:
+                            yield batch.to_model(error=error)
+                        else:
+                            batch.async_request = future.result()
+                            in_flight[self.waiter.add(batch.async_request)] = batch
+                    elif error is not None:
+                        yield batch.to_model(error=error)
+                    else:
+                        yield batch.to_model(async_request=future.result())
+
+    def _tune(self, submit_seconds: float, timed_out: bool) -> None:
+        if timed_out or submit_seconds > self.target_submit_seconds:
+            self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+        elif submit_seconds < self.target_submit_seconds / 2:
+            self.batch_size = min(
+                self.max_batch_size, self.batch_size + max(1, self.batch_size // 2))
+
+    @staticmethod
+    def _is_timeout(error: Optional[BaseException]) -> bool:
+        # BaseApi raises MemsourceApiException without status code when it is timed out.
+        return isinstance(error, exceptions.MemsourceApiException) and \
+            error.status_code is None and 'timed out' in (error.get_error_description() or '')
@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Token bucket. Tokens are refilled at rate per second up to burst, and a request takes one.
+
+    This class is thread-safe. Waiting threads are served in order of acquire, because tokens are
+    reserved before sleeping.
+
+    e.g. Share one limiter by all APIs.
+        api_rest.BaseApi.use_rate_limiter(rate_limit.RateLimiter(rate=10, burst=20))
+    """
+
+    def __init__(self, rate: float, burst: int=1) -> None:
+        """
+        :param rate: Number of requests per second.
+        :param burst: Number of requests which can be sent at once after idle.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst must be 1 or more')
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int=1) -> float:
+        """Take tokens, sleep until they are available.
+
+        :param tokens: Number of tokens.
+        :return: Seconds slept.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens can be negative, it is reserved by waiting threads.
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
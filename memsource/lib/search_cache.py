@@ -0,0 +1,133 @@
+import collections
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Hashable, Optional
+
+
+def normalize_text(text: Optional[str]) -> Optional[str]:
+    """Normalize segment text for cache keys.
+
+    Unicode normalization form and surrounding whitespace don't change matches.
+    """
+    if text is None:
+        return None
+
+    return unicodedata.normalize('NFC', text).strip()
+
+
+class SearchCache(object):
+    """
+    LRU cache of translation memory searches with TTL.
+
+    Each entry is tagged by ID of the translation memory, so entries of a translation memory are
+    dropped when it is changed, see invalidate. Entries tagged by None, e.g. searches by job which
+    don't tell the translation memory, are dropped by changes of any translation memory.
+
+    This class is thread-safe.
+
+    e.g. tm.TranslationMemory.use_search_cache(SearchCache(max_size=100000, ttl=600))
+    """
+
+    def __init__(self, max_size: int=10000, ttl: float=3600.0) -> None:
+        """
+        :param max_size: Least recently used entries are evicted over this number of entries.
+        :param ttl: Entries expire after this seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # Key to tuple of expiry, tag and value.
+        self._entries = collections.OrderedDict()
+        self._keys_by_tag = collections.defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of hits to lookups. 0 if nothing is looked up."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def get(self, key: Hashable) -> Any:
+        """Get cached value of key.
+
+        :param key: Key made by the caller, e.g. normalized search parameters.
+        :return: Cached value, or None if it is not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[2]
+
+    def put(self, key: Hashable, value: Any, tag: Optional[Hashable]=None) -> None:
+        """Cache value of key.
+
+        :param key: Key made by the caller.
+        :param value: Don't cache None, it means not cached.
+        :param tag: ID of the searched translation memory, or None if it is unknown.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, tag, value)
+            self._keys_by_tag[tag].add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tag: Hashable) -> int:
+        """Drop entries of a translation memory, and entries of unknown translation memories.
+
+        :param tag: ID of the changed translation memory.
+        :return: Number of dropped entries.
+        """
+        with self._lock:
+            keys = self._keys_by_tag.get(tag, set()) | self._keys_by_tag.get(None, set())
+            for key in keys:
+                self._remove(key)
+
+            self.invalidations += len(keys)
+
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        (_, tag, _) = self._entries.pop(key)
+        keys = self._keys_by_tag[tag]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_tag[tag]
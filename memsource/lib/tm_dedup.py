@@ -0,0 +1,213 @@
+"""
+Client-side suppression of duplicate inserts into translation memories.
+
+TmDedup remembers (source, target, target language) of segments in translation memories by
+Bloom filters, so inserting known segments again can be skipped without a request, see
+api_rest.tm.TranslationMemory.use_dedup.
+"""
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Optional, Union
+
+from memsource.lib import search_cache, tmx
+
+_MAGIC = b'TMBF'
+# Magic, number of bits, number of hashes and number of added keys.
+_HEADER = struct.Struct('>4sQIQ')
+
+
+def pair_key(unit: Dict[str, Any]) -> bytes:
+    """Key of a segment for TmDedup.
+
+    :param unit: Dict with keys target_lang, source_segment and target_segment, e.g. parameters
+        of TranslationMemory.insert. Context segments are ignored.
+    :return: 16 bytes digest.
+    """
+    return hashlib.md5('\0'.join((
+        tmx.normalize_lang(unit['target_lang']),
+        search_cache.normalize_text(unit['source_segment']),
+        search_cache.normalize_text(unit['target_segment']),
+    )).encode('utf-8')).digest()
+
+
+class BloomFilter(object):
+    """
+    Set of keys which tells "maybe contained" or "not contained" in fixed memory.
+
+    Keys must be uniformly distributed bytes of 16 bytes or more, e.g. pair_key.
+    """
+
+    def __init__(self, capacity: int=1000000, error_rate: float=1e-6) -> None:
+        """
+        :param capacity: Expected number of keys. Error rate goes up over this.
+        :param error_rate: Probability that a key not added is told contained.
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError('capacity must be positive and error_rate must be in (0, 1)')
+
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __len__(self) -> int:
+        """Number of added keys, including keys added twice."""
+        return self.count
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        # Double hashing, hashes of the key are made from halves of the digest.
+        h1 = int.from_bytes(key[:8], 'big')
+        h2 = int.from_bytes(key[8:16], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_MAGIC, self.size, self.hashes, self.count) + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        (magic, size, hashes, count) = _HEADER.unpack_from(data)
+        bits = data[_HEADER.size:]
+        if magic != _MAGIC or len(bits) != (size + 7) // 8:
+            raise ValueError('not a Bloom filter')
+
+        bloom_filter = cls.__new__(cls)
+        (bloom_filter.size, bloom_filter.hashes, bloom_filter.count) = (size, hashes, count)
+        bloom_filter._bits = bytearray(bits)
+
+        return bloom_filter
+
+
+class TmDedup(object):
+    """
+    Bloom filters of segments in translation memories, one for each translation memory.
+
+    A segment is added after it is inserted or seeded from an export. A false positive skips a
+    new segment, so keep error_rate small and number of segments under capacity. Bloom filters
+    cannot remove keys, so the filter of a translation memory is forgotten when segments are
+    deleted from it, and it should be seeded again.
+
+    Filters are kept in directory if it is given, see save. This class is thread-safe.
+    """
+
+    def __init__(
+            self,
+            directory: Optional[str]=None,
+            capacity: int=1000000,
+            error_rate: float=1e-6,
+    ) -> None:
+        """
+        :param directory: Filters are loaded from and saved into this directory.
+        :param capacity: Expected number of segments of a translation memory.
+        :param error_rate: Probability of skipping a new segment.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self._filters = {}  # Filter by translation memory ID.
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _path(self, tm_id: str) -> Optional[str]:
+        if self.directory is None:
+            return None
+
+        return os.path.join(self.directory, '{}.bloom'.format(tm_id))
+
+    def _filter(self, tm_id: str) -> BloomFilter:
+        bloom_filter = self._filters.get(tm_id)
+        if bloom_filter is None:
+            path = self._path(tm_id)
+            if path is not None and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    bloom_filter = BloomFilter.from_bytes(f.read())
+            else:
+                bloom_filter = BloomFilter(self.capacity, self.error_rate)
+
+            self._filters[tm_id] = bloom_filter
+
+        return bloom_filter
+
+    def contains(self, translation_memory_id: Union[int, str], key: bytes) -> bool:
+        """Whether a segment is maybe in a translation memory.
+
+        :param translation_memory_id: ID of the translation memory.
+        :param key: pair_key of the segment.
+        """
+        with self._lock:
+            return key in self._filter(str(translation_memory_id))
+
+    def add(self, translation_memory_id: Union[int, str], keys: Iterable[bytes]) -> None:
+        """Remember segments inserted into a translation memory.
+
+        :param translation_memory_id: ID of the translation memory.
+        :param keys: pair_key of the segments.
+        """
+        tm_id = str(translation_memory_id)
+        with self._lock:
+            bloom_filter = self._filter(tm_id)
+            for key in keys:
+                bloom_filter.add(key)
+
+            self._dirty.add(tm_id)
+
+    def seed(
+            self,
+            translation_memory_id: Union[int, str],
+            source: Any,
+            source_lang: Optional[str]=None,
+    ) -> int:
+        """Replace the filter of a translation memory by segments of its export.
+
+        :param translation_memory_id: ID of the exported translation memory.
+        :param source: TMX, see lib.tmx.read, e.g. TranslationMemory.iter_export.
+        :param source_lang: Source language. If None, srclang of the header is used.
+        :return: Number of added segments.
+        """
+        bloom_filter = BloomFilter(self.capacity, self.error_rate)
+        for unit in tmx.read(source):
+            for pair in tmx.pairs(unit, source_lang):
+                bloom_filter.add(pair_key(pair))
+
+        tm_id = str(translation_memory_id)
+        with self._lock:
+            self._filters[tm_id] = bloom_filter
+            self._dirty.add(tm_id)
+
+        return len(bloom_filter)
+
+    def forget(self, translation_memory_id: Union[int, str]) -> None:
+        """Drop the filter of a translation memory, e.g. after deleting segments from it."""
+        tm_id = str(translation_memory_id)
+        with self._lock:
+            self._filters[tm_id] = BloomFilter(self.capacity, self.error_rate)
+            self._dirty.add(tm_id)
+
+    def save(self) -> None:
+        """Write changed filters into directory. Files are replaced atomically."""
+        if self.directory is None:
+            return
+
+        with self._lock:
+            for tm_id in sorted(self._dirty):
+                (fd, temp_path) = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(self._filters[tm_id].to_bytes())
+
+                os.replace(temp_path, self._path(tm_id))
+
+            self._dirty.clear()
@@ -0,0 +1,299 @@
+"""
+Local SQLite copy of translation memories for fast lookups without API calls.
+"""
+import itertools
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from memsource.lib import tmx
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS translation_memories (
+    tm_id TEXT PRIMARY KEY,
+    source_lang TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    tm_id TEXT NOT NULL,
+    segment_id TEXT,
+    target_lang TEXT NOT NULL,
+    source_segment TEXT NOT NULL,
+    target_segment TEXT NOT NULL,
+    -- Empty instead of NULL, because NULLs are not equal in unique constraints.
+    previous_source_segment TEXT NOT NULL DEFAULT '',
+    next_source_segment TEXT NOT NULL DEFAULT '',
+    -- Source text first, so the index of this constraint is used by lookups.
+    UNIQUE (source_segment, target_lang, tm_id, target_segment,
+            previous_source_segment, next_source_segment)
+);
+CREATE INDEX IF NOT EXISTS segments_segment_id ON segments (tm_id, segment_id);
+'''
+_COLUMNS = (
+    'tm_id', 'segment_id', 'target_lang', 'source_segment', 'target_segment',
+    'previous_source_segment', 'next_source_segment',
+)
+_INSERT = 'INSERT OR REPLACE INTO segments ({}) VALUES ({})'.format(
+    ', '.join(_COLUMNS), ', '.join('?' * len(_COLUMNS)))
+_SELECT = 'SELECT {} FROM segments'.format(', '.join(_COLUMNS))
+_DELETE_SEGMENT = 'DELETE FROM segments WHERE tm_id = ? AND segment_id = ?'
+# Units of an export are written by this number, so a large export is not read at once.
+_CHUNK_SIZE = 1000
+# The largest code point, prefix <= text < prefix + this means text starts with prefix.
+_MAX_CHAR = '\U0010ffff'
+
+
+class TmMirror(object):
+    """
+    Copy of translation memories in SQLite.
+
+    Load an export first with load_export, then keep it updated by later exports with
+    apply_export, and by record_insert and record_delete after changing translation memories.
+    Exact and prefix lookups of source text use an index, so they don't depend on size of
+    translation memories.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, path: str=':memory:') -> None:
+        """
+        :param path: Path of the SQLite database. It is created if it doesn't exist.
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            # Faster writes, the mirror can be loaded again when it is broken.
+            self._connection.execute('PRAGMA synchronous = NORMAL')
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> 'TmMirror':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def load_export(
+            self,
+            translation_memory_id: Union[int, str],
+            source: Any,
+            source_lang: Optional[str]=None,
+    ) -> int:
+        """Replace segments of a translation memory by an export.
+
+        :param translation_memory_id: ID of the exported translation memory.
+        :param source: TMX, see lib.tmx.read, e.g. TranslationMemory.iter_export.
+        :param source_lang: Source language. If None, srclang of the header is used.
+        :return: Number of loaded segments.
+        """
+        return self._apply_export(translation_memory_id, source, source_lang, replace=True)
+
+    def apply_export(
+            self,
+            translation_memory_id: Union[int, str],
+            source: Any,
+            source_lang: Optional[str]=None,
+    ) -> int:
+        """Add or update segments of a later export, e.g. an export by query of recent changes.
+
+        Segments which are not in the export are kept. Translations of a segment with ID (tuid)
+        are replaced by the translations in the export, e.g. when its target is changed.
+
+        :param translation_memory_id: ID of the exported translation memory.
+        :param source: TMX, see lib.tmx.read.
+        :param source_lang: Source language. If None, srclang of the header is used.
+        :return: Number of applied segments.
+        """
+        return self._apply_export(translation_memory_id, source, source_lang, replace=False)
+
+    def _apply_export(
+            self,
+            translation_memory_id: Union[int, str],
+            source: Any,
+            source_lang: Optional[str],
+            replace: bool,
+    ) -> int:
+        tm_id = str(translation_memory_id)
+        header_source_lang = []
+
+        def units() -> Iterable[Tuple[Optional[str], List[Tuple]]]:
+            for unit in tmx.read(source):
+                if not header_source_lang:
+                    header_source_lang.append(unit.source_lang)
+
+                segment_id = unit.attributes.get('tuid')
+                yield (segment_id, [
+                    self._row(tm_id, segment_id, pair) for pair in tmx.pairs(unit, source_lang)])
+
+        with self._lock, self._connection:
+            if replace:
+                self._connection.execute('DELETE FROM segments WHERE tm_id = ?', (tm_id, ))
+
+            count = 0
+            unit_iterator = units()
+            for chunk in iter(lambda: list(itertools.islice(unit_iterator, _CHUNK_SIZE)), []):
+                if not replace:
+                    # Old translations of the segments, e.g. before the target was changed.
+                    self._connection.executemany(_DELETE_SEGMENT, [
+                        (tm_id, segment_id) for (segment_id, _) in chunk
+                        if segment_id is not None
+                    ])
+
+                count += self._connection.executemany(
+                    _INSERT, [row for (_, rows) in chunk for row in rows]).rowcount
+
+            self._connection.execute(
+                'INSERT OR REPLACE INTO translation_memories VALUES (?, ?, ?)',
+                (tm_id, source_lang or next(iter(header_source_lang), None), time.time()))
+
+        return count
+
+    def record_insert(
+            self,
+            translation_memory_id: Union[int, str],
+            target_lang: str,
+            source_segment: str,
+            target_segment: str,
+            previous_source_segment: Optional[str]=None,
+            next_source_segment: Optional[str]=None,
+            segment_id: Optional[str]=None,
+    ) -> None:
+        """Record a segment inserted by TranslationMemory.insert. Parameters are same as it.
+
+        If segment_id is given, the translation of the segment into target_lang is replaced.
+        """
+        row = self._row(str(translation_memory_id), segment_id, {
+            'target_lang': target_lang,
+            'source_segment': source_segment,
+            'target_segment': target_segment,
+            'previous_source_segment': previous_source_segment,
+            'next_source_segment': next_source_segment,
+        })
+
+        with self._lock, self._connection:
+            if segment_id is not None:
+                self._connection.execute(
+                    _DELETE_SEGMENT + ' AND target_lang = ?', (row[0], segment_id, row[2]))
+
+            self._connection.execute(_INSERT, row)
+
+    def record_delete(
+            self,
+            translation_memory_id: Union[int, str],
+            segment_id: Optional[str]=None,
+            source_segment: Optional[str]=None,
+    ) -> int:
+        """Record deleted segments, by ID of TranslationMemory.delete_source_and_translations or
+        by source text.
+
+        :param translation_memory_id: Segments were deleted from this translation memory.
+        :param segment_id: ID of the deleted segment.
+        :param source_segment: Delete all translations of this source text.
+        :return: Number of deleted rows.
+        """
+        if segment_id is None and source_segment is None:
+            raise ValueError('segment_id or source_segment is required')
+
+        (column, value) = ('segment_id', segment_id) if segment_id is not None else \
+            ('source_segment', source_segment)
+
+        with self._lock, self._connection:
+            return self._connection.execute(
+                'DELETE FROM segments WHERE tm_id = ? AND {} = ?'.format(column),
+                (str(translation_memory_id), value)).rowcount
+
+    def lookup(
+            self,
+            source_segment: str,
+            target_lang: Optional[str]=None,
+            translation_memory_id: Optional[Union[int, str]]=None,
+    ) -> List[Dict[str, Any]]:
+        """Find translations of exactly the same source text.
+
+        :param source_segment: Source text.
+        :param target_lang: Only translations into this language.
+        :param translation_memory_id: Only translations in this translation memory.
+        :return: List of dicts with keys tm_id, segment_id and parameters of insert.
+        """
+        return self._select(
+            'source_segment = ?', (source_segment, ), target_lang, translation_memory_id, None)
+
+    def lookup_prefix(
+            self,
+            prefix: str,
+            target_lang: Optional[str]=None,
+            translation_memory_id: Optional[Union[int, str]]=None,
+            limit: int=100,
+    ) -> List[Dict[str, Any]]:
+        """Find translations of source texts which start with prefix.
+
+        :param prefix: Beginning of source text. Case sensitive.
+        :param target_lang: Only translations into this language.
+        :param translation_memory_id: Only translations in this translation memory.
+        :param limit: Max number of results.
+        :return: List of dicts, see lookup, in order of source text.
+        """
+        # A range uses the index, LIKE doesn't by default.
+        return self._select(
+            'source_segment >= ? AND source_segment < ?', (prefix, prefix + _MAX_CHAR),
+            target_lang, translation_memory_id, limit)
+
+    def count(self, translation_memory_id: Optional[Union[int, str]]=None) -> int:
+        """Number of segments of a translation memory, or of all if None."""
+        with self._lock:
+            if translation_memory_id is None:
+                return self._connection.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM segments WHERE tm_id = ?',
+                (str(translation_memory_id), )).fetchone()[0]
+
+    def _select(
+            self,
+            condition: str,
+            parameters: Tuple,
+            target_lang: Optional[str],
+            translation_memory_id: Optional[Union[int, str]],
+            limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        sql = [_SELECT, 'WHERE', condition]
+        parameters = list(parameters)
+
+        if target_lang is not None:
+            sql.append('AND target_lang = ?')
+            parameters.append(target_lang)
+
+        if translation_memory_id is not None:
+            sql.append('AND tm_id = ?')
+            parameters.append(str(translation_memory_id))
+
+        sql.append('ORDER BY source_segment')
+        if limit is not None:
+            sql.append('LIMIT ?')
+            parameters.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(' '.join(sql), parameters).fetchall()
+
+        return [self._to_dict(row) for row in rows]
+
+    @staticmethod
+    def _row(tm_id: str, segment_id: Optional[str], pair: Dict[str, Any]) -> Tuple:
+        return (
+            tm_id, segment_id, pair['target_lang'], pair['source_segment'],
+            pair['target_segment'], pair.get('previous_source_segment') or '',
+            pair.get('next_source_segment') or '',
+        )
+
+    @staticmethod
+    def _to_dict(row: Tuple) -> Dict[str, Any]:
+        result = dict(zip(_COLUMNS, row))
+        for key in ('previous_source_segment', 'next_source_segment'):
+            result[key] = result[key] or None
+
+        return result
@@ -0,0 +1,207 @@
+"""
+Local prefilter of translation memory searches.
+
+Most searches of a translation memory find nothing. NgramIndex keeps character n-grams of source
+segments of a translation memory, so segments which cannot have fuzzy matches are known without
+calling search or search_segment_by_job.
+"""
+import collections
+import itertools
+import math
+import re
+import unicodedata
+from typing import Any, Iterable, List, Optional, Set, Union
+
+from memsource import constants
+from memsource.lib import tmx
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text).casefold()).strip()
+
+
+class NgramIndex(object):
+    """
+    Inverted index of character n-grams of source segments.
+
+    Similarity of a segment and an indexed segment is estimated by Dice coefficient of their
+    n-grams. It is not the score of Memsource, so compare it with the threshold with some margin,
+    see may_match.
+
+    Postings are grouped by number of n-grams of segments. Dice coefficient of sets of sizes a and
+    b is at most 2 * min(a, b) / (a + b), so only groups of sizes which can reach the threshold are
+    read. In a group, postings of rare n-grams are counted first, and the group is skipped when no
+    segment can share enough n-grams with the rest, so postings of common n-grams are rarely read.
+    """
+
+    def __init__(self, n: int=3) -> None:
+        """
+        :param n: Length of n-grams.
+        """
+        self.n = n
+
+        # Indexed segment ID by normalized text.
+        self._ids = {}
+        # Set of target languages by segment ID.
+        self._langs = []
+        # Number of segments by number of n-grams.
+        self._size_counts = collections.Counter()
+        # Segment IDs by number of n-grams of segments, by n-gram.
+        self._postings = collections.defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _ngrams(self, text: str) -> Set[str]:
+        text = ' {} '.format(text)
+        if len(text) <= self.n:
+            return {text}
+
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, source: str, target_lang: Optional[str]=None) -> None:
+        """Index a source segment, e.g. after TranslationMemory.insert.
+
+        :param source: Source segment.
+        :param target_lang: Translated into this language.
+        """
+        text = _normalize(source)
+        segment_id = self._ids.get(text)
+
+        if segment_id is None:
+            segment_id = len(self._langs)
+            self._ids[text] = segment_id
+            ngrams = self._ngrams(text)
+            size = len(ngrams)
+            self._size_counts[size] += 1
+            self._langs.append(set())
+
+            for ngram in ngrams:
+                self._postings[ngram].setdefault(size, []).append(segment_id)
+
+        if target_lang is not None:
+            self._langs[segment_id].add(tmx.normalize_lang(target_lang))
+
+    def best_score(self, segment: str, target_lang: Optional[str]=None) -> float:
+        """Estimate similarity of the most similar indexed segment.
+
+        :param segment: Search this segment.
+        :param target_lang: Only segments translated into this language are compared.
+        :return: 1.0 for the same text, 0.0 if no n-gram is shared.
+        """
+        text = _normalize(segment)
+        lang = None if target_lang is None else tmx.normalize_lang(target_lang)
+
+        return self._best_score(text, lang)
+
+    def may_match(
+            self,
+            segment: str,
+            score_threshold: float=constants.TM_THRESHOLD,
+            target_lang: Optional[str]=None,
+            margin: float=0.1,
+    ) -> bool:
+        """Whether a search of the segment can find matches over score_threshold.
+
+        :param segment: Search this segment.
+        :param score_threshold: score_threshold of the search.
+        :param target_lang: Only segments translated into this language are compared.
+        :param margin: Allow segments less similar than score_threshold by this. Larger margin
+            makes less missed matches and more searches.
+        :return: False if it is unlikely to find matches.
+        """
+        min_score = score_threshold - margin
+        if min_score <= 0:
+            return True
+
+        text = _normalize(segment)
+        lang = None if target_lang is None else tmx.normalize_lang(target_lang)
+
+        return self._best_score(text, lang, min_score) >= min_score
+
+    def _best_score(self, text: str, lang: Optional[str], min_score: float=0.0) -> float:
+        """Best score over all segments, or any score of min_score or more."""
+        segment_id = self._ids.get(text)
+        if segment_id is not None and (lang is None or lang in self._langs[segment_id]):
+            return 1.0
+
+        ngrams = self._ngrams(text)
+        postings = [self._postings[ngram] for ngram in ngrams if ngram in self._postings]
+        size = len(ngrams)
+
+        def upper_bound(segment_size: int) -> float:
+            return 2.0 * min(size, segment_size) / (size + segment_size)
+
+        best = 0.0
+        for segment_size in sorted(self._size_counts, key=upper_bound, reverse=True):
+            bound = upper_bound(segment_size)
+            if bound < min_score or bound <= best:
+                break
+
+            # Number of shared n-grams needed for a better score.
+            required = max(1, math.ceil(max(min_score, best) * (size + segment_size) / 2 - 1e-9))
+            count = self._count_shared(
+                [group[segment_size] for group in postings if segment_size in group],
+                required,
+                lang,
+            )
+
+            best = max(best, 2.0 * count / (size + segment_size))
+            if best >= min_score > 0:
+                return best
+
+        return best
+
+    def _count_shared(self, postings: List[List[int]], required: int, lang: Optional[str]) -> int:
+        """Most n-grams shared with a segment in postings, or 0 if it is less than required."""
+        if len(postings) < required:
+            return 0
+
+        # Rare n-grams first. If no segment can share required n-grams with the rest, postings of
+        # common n-grams are not counted.
+        postings.sort(key=len)
+        shared = collections.Counter()
+        (counted, check) = (0, len(postings) - required + 1)
+        while True:
+            # Counting by Counter.update is much faster than skipping postings in Python.
+            shared.update(itertools.chain.from_iterable(postings[counted:check]))
+            counted = check
+
+            reachable = max(shared.values(), default=0) + len(postings) - counted
+            if reachable < required:
+                return 0
+
+            if counted == len(postings):
+                break
+
+            # The earliest point where the most shared can be unreachable.
+            check = min(len(postings), counted + reachable - required + 1)
+
+        if lang is None:
+            return max(shared.values())
+
+        return next((count for (segment_id, count) in shared.most_common()
+                     if count >= required and lang in self._langs[segment_id]), 0)
+
+    @classmethod
+    def from_tmx(
+            cls,
+            source: Union[bytes, str, Any, Iterable[bytes]],
+            source_lang: Optional[str]=None,
+            n: int=3,
+    ) -> 'NgramIndex':
+        """Build an index from TMX, e.g. of TranslationMemory.download_export.
+
+        :param source: TMX, see lib.tmx.read.
+        :param source_lang: Source language. If None, srclang of the header is used.
+        :param n: Length of n-grams.
+        :return: NgramIndex
+        """
+        index = cls(n)
+        for unit in tmx.read(source):
+            for pair in tmx.pairs(unit, source_lang):
+                index.add(pair['source_segment'], pair['target_lang'])
+
+        return index
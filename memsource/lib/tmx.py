@@ -0,0 +1,238 @@
+"""
+Streaming TMX for importing into and exporting from translation memories.
+"""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from xml.sax import saxutils
+
+from lxml import etree
+
+from memsource import constants, models
+
+_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<tmx version="1.4"><header creationtool="memsource-wrap" creationtoolversion="1" '
+    'segtype="sentence" o-tmf="memsource-wrap" adminlang="en" srclang={} datatype="plaintext"/>'
+    '<body>\n'
+)
+_FOOTER = '</body></tmx>\n'
+# Characters which XML 1.0 doesn't allow even if escaped, and lone surrogates.
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+_TU_START = re.compile(rb'<tu[\s>]')
+_TU_END = b'</tu>'
+_SPLIT_FOOTER = b'\n</body></tmx>\n'
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+_CONTEXT_PROPS = (
+    ('previous_source_segment', 'x-context-pre'),
+    ('next_source_segment', 'x-context-post'),
+)
+
+
+def escape(text: str) -> str:
+    """Escape text for TMX. Characters which cannot be in XML are removed."""
+    return saxutils.escape(_INVALID_XML_CHARS.sub('', text))
+
+
+def quoteattr(text: str) -> str:
+    """Escape and quote an attribute value for TMX."""
+    return saxutils.quoteattr(_INVALID_XML_CHARS.sub('', text))
+
+
+def unit_to_tmx(source_lang: str, unit: Dict[str, Any]) -> str:
+    """Make a tu element.
+
+    :param source_lang: Source language.
+    :param unit: Translation unit, see write.
+    :return: XML of the tu element.
+    """
+    tmx = ['<tu>']
+    for (key, prop_type) in _CONTEXT_PROPS:
+        if unit.get(key) is not None:
+            tmx.append('<prop type="{}">{}</prop>'.format(prop_type, escape(unit[key])))
+
+    for (lang, text) in ((source_lang, unit['source_segment']),
+                         (unit['target_lang'], unit['target_segment'])):
+        tmx.append('<tuv xml:lang={}><seg>{}</seg></tuv>'.format(quoteattr(lang), escape(text)))
+
+    tmx.append('</tu>\n')
+
+    return ''.join(tmx)
+
+
+def write(
+        units: Iterable[Dict[str, Any]],
+        source_lang: str,
+        buffer_size: int=64 * 1024,
+) -> Iterator[bytes]:
+    """Make TMX chunk by chunk. The whole document is never in memory.
+
+    The chunks can be uploaded as they are, see TranslationMemory.upload_units.
+
+    :param units: Dicts with keys of parameters of TranslationMemory.insert, i.e. target_lang,
+        source_segment, target_segment, and optional previous_source_segment and
+        next_source_segment. Context segments are written as x-context-pre and x-context-post.
+    :param source_lang: Source language.
+    :param buffer_size: Approximate size of a chunk in bytes.
+    :return: Iterator of UTF-8 chunks.
+    """
+    buffer = [_HEADER.format(quoteattr(source_lang))]
+    size = 0
+
+    for unit in units:
+        tu = unit_to_tmx(source_lang, unit)
+        buffer.append(tu)
+        # Number of characters is enough for deciding to flush.
+        size += len(tu)
+
+        if size >= buffer_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+
+    buffer.append(_FOOTER)
+    yield ''.join(buffer).encode('utf-8')
+
+
+def normalize_lang(lang: str) -> str:
+    """Normalize a language code for comparing, e.g. en_US -> en-us."""
+    return lang.replace('_', '-').lower()
+
+
+def lang_matches(lang: str, expected: str) -> bool:
+    """Whether lang is expected language. A language without region matches its regions.
+
+    e.g. en-us matches en.
+    """
+    (lang, expected) = (normalize_lang(lang), normalize_lang(expected))
+    return lang == expected or lang.startswith('{}-'.format(expected))
+
+
+def pairs(unit: models.TmxUnit, source_lang: Optional[str]=None) -> List[Dict[str, Any]]:
+    """Make parameters of TranslationMemory.insert from a unit, one for each target language.
+
+    :param unit: Read by read.
+    :param source_lang: Source language. If None, srclang of the header.
+    :return: List of dicts, see write. Empty if the unit doesn't have the source language.
+    """
+    source_lang = unit.source_lang if source_lang is None else source_lang
+    sources = [text for (lang, text) in unit.segments.items() if lang_matches(lang, source_lang)]
+    if not sources:
+        return []
+
+    return [{
+        'target_lang': lang,
+        'source_segment': sources[0],
+        'target_segment': text,
+        'previous_source_segment': unit.props.get('x-context-pre'),
+        'next_source_segment': unit.props.get('x-context-post'),
+    } for (lang, text) in unit.segments.items() if not lang_matches(lang, source_lang)]
+
+
+def read(
+        source: Union[bytes, str, Any, Iterable[bytes]],
+        chunk_size: int=constants.CHUNK_SIZE * 64,
+) -> Iterator[models.TmxUnit]:
+    """Read translation units of TMX one by one. Memory usage doesn't depend on size of TMX.
+
+    :param source: TMX as bytes, path of a TMX file e.g. of legacy TranslationMemory.export,
+        a file object opened as binary, or chunks of bytes e.g. TranslationMemory.iter_export.
+    :param chunk_size: Read a file by this size.
+    :return: Iterator of models.TmxUnit
+    """
+    parser = etree.XMLPullParser(events=('start', 'end'))
+    source_lang = None
+
+    for chunk in _iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+
+        for (event, element) in parser.read_events():
+            if event == 'start':
+                if element.tag == 'header':
+                    source_lang = element.get('srclang')
+            elif element.tag == 'tu':
+                yield _parse_tu(element, source_lang)
+
+                # Drop the unit and already read siblings.
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    parser.close()
+
+
+def split(
+        source: Union[bytes, str, Any, Iterable[bytes]],
+        part_size: int=8 * 1024 * 1024,
+        chunk_size: int=constants.CHUNK_SIZE * 64,
+) -> Iterator[bytes]:
+    """Split TMX into smaller TMX documents at tu boundaries, e.g. for importing them in parallel.
+
+    TMX is not parsed, so units are copied byte by byte with their attributes and inline markup.
+    Each part has the header of the source. The encoding must be compatible with ASCII, e.g.
+    UTF-8, and "</tu>" must not be in comments or CDATA.
+
+    :param source: TMX, see read.
+    :param part_size: Approximate size of a part in bytes. A part can be larger by a unit.
+    :param chunk_size: Read a file by this size.
+    :return: Iterator of TMX documents. Nothing if the source has no units.
+    """
+    head = None
+    buffer = bytearray()
+    part = bytearray()
+
+    for chunk in _iter_chunks(source, chunk_size):
+        buffer += chunk
+        if head is None:
+            match = _TU_START.search(buffer)
+            if match is None:
+                continue
+
+            head = bytes(buffer[:match.start()])
+            del buffer[:match.start()]
+
+        while True:
+            end = buffer.find(_TU_END)
+            if end < 0:
+                break
+
+            end += len(_TU_END)
+            part += buffer[:end]
+            del buffer[:end]
+
+            if len(part) >= part_size:
+                yield b''.join([head, part, _SPLIT_FOOTER])
+                part = bytearray()
+
+    if part:
+        # The rest is the end of the source, i.e. </body></tmx>.
+        yield b''.join([head, part, buffer])
+
+
+def _iter_chunks(
+        source: Union[bytes, str, Any, Iterable[bytes]], chunk_size: int
+) -> Iterator[bytes]:
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from _iter_chunks(f, chunk_size)
+    elif isinstance(source, bytes):
+        yield source
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), b'')
+    else:
+        yield from source
+
+
+def _parse_tu(tu: etree._Element, source_lang: str) -> models.TmxUnit:
+    segments = {}
+    for tuv in tu.iterfind('tuv'):
+        seg = tuv.find('seg')
+        if seg is not None:
+            # xml:lang is of TMX 1.4, lang is of older versions.
+            segments[tuv.get(_XML_LANG) or tuv.get('lang')] = ''.join(seg.itertext())
+
+    return models.TmxUnit({
+        'attributes': dict(tu.attrib),
+        'props': {prop.get('type'): prop.text or '' for prop in tu.iterfind('prop')},
+        'segments': segments,
+        'source_lang': source_lang,
+    })
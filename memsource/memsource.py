@@ -10,17 +10,21 @@ from memsource.api_rest import (
     bilingual,
     tm,
     analysis,
+    asynchronous,
 )
 
 
 class Memsource(object):
-    def __init__(self, user_name=None, password=None, token=None, headers=None, use_rest=False):
+    def __init__(
+            self, user_name=None, password=None, token=None, headers=None, use_rest=False,
+            raw=False):
         if use_rest:
             self._init_rest(
                 user_name=user_name,
                 password=password,
                 token=token,
                 headers=headers,
+                raw=raw,
             )
             return
 
@@ -43,22 +47,24 @@ class Memsource(object):
         self.analysis = api.Analysis(token, headers)
         self.term_base = api.TermBase(token, headers)
 
-    def _init_rest(self, user_name, password, token, headers):
+    def _init_rest(self, user_name, password, token, headers, raw):
         """
         If token is given, use the token.
         Otherwise authenticate with user_name and password, and get token.
+        If raw is True, APIs return decoded JSON instead of models.
         """
         if user_name and password and not token and not headers:
             token = auth.Auth().login(user_name, password).token
 
         # make api class instances
-        self.auth = auth.Auth(token, headers)
-        self.client = client.Client(token, headers)
-        self.domain = domain.Domain(token, headers)
-        self.project = project.Project(token, headers)
-        self.job = job.Job(token, headers)
-        self.translation_memory = tm.TranslationMemory(token, headers)
-        self.language = language.Language(token, headers)
-        self.analysis = analysis.Analysis(token, headers)
-        self.term_base = term_base.TermBase(token, headers)
-        self.bilingual = bilingual.Bilingual(token, headers)
+        self.auth = auth.Auth(token, headers, raw)
+        self.client = client.Client(token, headers, raw)
+        self.domain = domain.Domain(token, headers, raw)
+        self.project = project.Project(token, headers, raw)
+        self.job = job.Job(token, headers, raw)
+        self.translation_memory = tm.TranslationMemory(token, headers, raw)
+        self.asynchronous = asynchronous.Asynchronous(token, headers, raw)
+        self.language = language.Language(token, headers, raw)
+        self.analysis = analysis.Analysis(token, headers, raw)
+        self.term_base = term_base.TermBase(token, headers, raw)
+        self.bilingual = bilingual.Bilingual(token, headers, raw)
@@ -1,60 +1,292 @@
+import datetime
+import itertools
+
 import iso8601
 
+# Memsource returns datetime with these suffixes, e.g. 2014-11-03T16:03:11Z
+_UTC_SUFFIXES = ('Z', '+0000', '+00:00')
+# Class body is not ordered before Python 3.6, so Fields remember order of creation.
+_field_counter = itertools.count()
+
+
+def parse_datetime(source):
+    """Parse datetime of Memsource API.
+
+    Memsource returns UTC without fraction of second mostly. It is parsed by slicing, because it
+    is several times faster than iso8601. Other formats are parsed by iso8601.
+    Integer is milliseconds since epoch, e.g. createdAt of a translation memory segment.
+
+    :param source: ISO 8601 string or milliseconds since epoch.
+    :return: datetime with tzinfo.
+    """
+    if isinstance(source, int):
+        return datetime.datetime.fromtimestamp(source / 1000, datetime.timezone.utc)
+
+    if (len(source) >= 20 and source[19:] in _UTC_SUFFIXES and source[10] == 'T' and
+            source[4] == source[7] == '-' and source[13] == source[16] == ':'):
+        try:
+            return datetime.datetime(
+                int(source[0:4]), int(source[5:7]), int(source[8:10]),
+                int(source[11:13]), int(source[14:16]), int(source[17:19]),
+                tzinfo=datetime.timezone.utc,
+            )
+        except ValueError:
+            pass
+
+    return iso8601.parse_date(source)
+
+
+class DateTimeField(object):
+    """
+    Datetime of a key of a model. It is parsed when it is accessed first and cached.
+
+    The cache is dropped when the source value is replaced.
+    """
+    __slots__ = ('key', )
+
+    def __init__(self, key: str) -> None:
+        """
+        :param key: Parse value of this key.
+        """
+        self.key = key
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        source = instance.get(self.key)
+        if source is None:
+            return None
+
+        cache = instance._cache()
+        cache_key = (self.key, datetime.datetime)
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+
+        parsed = parse_datetime(source)
+        cache[cache_key] = (source, parsed)
+
+        return parsed
+
 
 class BaseModel(dict):
     def __getattr__(self, key):
         return self[key]
 
+    def _cache(self):
+        return self.__dict__.setdefault('_cached', {})
+
     def _iso8601_to_datetime(self, source):
-        return iso8601.parse_date(source)
+        return parse_datetime(source)
 
 
-class User(BaseModel):
-    pass
+class Field(object):
+    """
+    Typed accessor of a key of SlottedModel. The attribute name is the key.
+
+    If value_type is a model class, the value is converted into the model when the attribute is
+    accessed first time and cached, so nested structures cost nothing until they are used.
+    Item access returns the value as it is.
+    """
+    __slots__ = ('key', 'value_type', 'many', 'order', 'nested')
 
+    def __init__(self, value_type: type=object, many: bool=False) -> None:
+        """
+        :param value_type: Type of the value.
+        :param many: The value is a list of value_type.
+        """
+        # SlottedModelMeta sets the attribute name.
+        self.key = None
+        self.value_type = value_type
+        self.many = many
+        self.order = next(_field_counter)
+        self.nested = isinstance(value_type, type) and \
+            issubclass(value_type, (BaseModel, SlottedModel))
 
-class Authentication(BaseModel):
-    pass
+    def hydrate(self, value):
+        if self.many:
+            return [self.value_type(item) for item in value]
 
+        return self.value_type(value)
 
-class Client(BaseModel):
-    pass
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
 
+        # Memsource omits some keys, e.g. dateDue of a job without due date.
+        value = instance.get(self.key)
+        if not self.nested or value is None or isinstance(value, self.value_type):
+            return value
 
-class Domain(BaseModel):
-    pass
+        # The cache is dropped when the value is replaced, also by update, setdefault etc.
+        cache = instance._cache()
+        cached = cache.get(self.key)
+        if cached is not None and cached[0] is value:
+            return cached[1]
 
+        hydrated = self.hydrate(value)
+        cache[self.key] = (value, hydrated)
 
-class Language(BaseModel):
-    pass
+        return hydrated
 
 
-class Project(BaseModel):
-    @property
-    def date_created(self):
-        return self._iso8601_to_datetime(self.dateCreated)
+class SlottedModelMeta(type):
+    def __new__(mcs, name, bases, namespace):
+        cls = super(SlottedModelMeta, mcs).__new__(mcs, name, bases, namespace)
 
+        fields = []
+        for key, value in namespace.items():
+            if isinstance(value, Field):
+                value.key = key
+                fields.append(value)
 
-class Job(BaseModel):
+        # Keys of declared Fields in order of declaration, base class first.
+        cls._field_keys = tuple(getattr(cls, '_field_keys', ())) + tuple(
+            field.key for field in sorted(fields, key=lambda field: field.order))
+        return cls
+
+
+class SlottedModel(dict, metaclass=SlottedModelMeta):
+    """
+    dict of a response with __slots__ instead of __dict__, and typed Fields.
+
+    Construction and item access are those of dict, so they cost same as BaseModel. Keys are read
+    by item or attribute like BaseModel. Nested models are made when declared Fields are accessed
+    by attribute first and cached, item access and get return decoded JSON as it is.
+
+    Unlike BaseModel, a declared Field of a missing key is None, e.g. dateDue of a job without
+    due date. Other missing keys raise KeyError like BaseModel.
+    """
+    # Not set until a Field caches something, so construction is dict.__init__ only.
+    __slots__ = ('_hydrated', )
+
+    def __getattr__(self, key):
+        # Unset slots, e.g. _hydrated before anything is cached, are not keys.
+        if key.startswith('_'):
+            raise AttributeError(key)
+
+        return self[key]
+
+    def __reduce__(self):
+        # Copies don't share the dict, and caches of nested models are not pickled.
+        return (self.__class__, (dict(self), ))
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, dict.__repr__(self))
+
+    def _cache(self):
+        try:
+            return self._hydrated
+        except AttributeError:
+            self._hydrated = {}
+            return self._hydrated
+
+    def _iso8601_to_datetime(self, source):
+        return parse_datetime(source)
+
+
+class User(BaseModel):
     pass
 
 
-class JobPart(BaseModel):
+class Authentication(SlottedModel):
+    __slots__ = ()
+
+    token = Field(str)
+    expires = Field(str)
+    user = Field(User)
+
+    expires_at = DateTimeField('expires')
+
+
+class Client(BaseModel):
+    date_created = DateTimeField('dateCreated')
+
+
+class Domain(BaseModel):
+    date_created = DateTimeField('dateCreated')
+
+
+class Language(BaseModel):
     pass
 
 
+class Project(SlottedModel):
+    __slots__ = ()
+
+    uid = Field(str)
+    id = Field(str)
+    internalId = Field(int)
+    name = Field(str)
+    status = Field(str)
+    sourceLang = Field(str)
+    targetLangs = Field(list)
+    dateCreated = Field(str)
+    dateDue = Field(str)
+    owner = Field(User)
+    createdBy = Field(User)
+    client = Field(Client)
+    domain = Field(Domain)
+    subDomain = Field(Domain)
+
+    date_created = DateTimeField('dateCreated')
+    date_due = DateTimeField('dateDue')
+    date_modified = DateTimeField('dateModified')
+
+
+class Job(SlottedModel):
+    __slots__ = ()
+
+    uid = Field(str)
+    innerId = Field(str)
+    status = Field(str)
+    targetLang = Field(str)
+    filename = Field(str)
+    dateCreated = Field(str)
+    dateDue = Field(str)
+    workflowStep = Field(dict)
+    providers = Field(User, many=True)
+
+    date_created = DateTimeField('dateCreated')
+    date_due = DateTimeField('dateDue')
+    date_modified = DateTimeField('dateModified')
+    date_completed = DateTimeField('dateCompleted')
+
+
+class JobPart(Job):
+    """
+    A job is split into parts per target language. Memsource returns same fields as Job.
+    """
+    __slots__ = ()
+
+
 class TranslationMemory(BaseModel):
-    pass
+    date_created = DateTimeField('dateCreated')
 
 
 class AsynchronousRequest(BaseModel):
     """
     You can know progress when hit api.Asynchronous.getAsyncRequest with id of this class instance.
     """
-    pass
+    date_created = DateTimeField('dateCreated')
+
+    def is_complete(self):
+        # asyncResponse is null, or empty AsynchronousResponse of the legacy API, until finished.
+        return bool(self.get('asyncResponse'))
+
+    def has_error(self):
+        if not self.is_complete():
+            return False
+
+        response = self['asyncResponse']
+        # errorCode is of the REST API, error is of the legacy API.
+        return response.get('errorCode', response.get('error')) is not None
 
 
 class AsynchronousResponse(BaseModel):
+    date_created = DateTimeField('dateCreated')
+
     def __init__(self, source):
         super(AsynchronousResponse, self).__init__({} if source is None else source)
 
@@ -65,21 +297,49 @@ class AsynchronousResponse(BaseModel):
         return self.is_complete() and self.error is not None
 
 
-class Segment(BaseModel):
-    pass
+class Segment(SlottedModel):
+    __slots__ = ()
 
+    id = Field(str)
+    text = Field(str)
+    translation = Field(str)
+    lang = Field(str)
 
-class SegmentSearchResult(BaseModel):
+    created_at = DateTimeField('createdAt')
+    modified_at = DateTimeField('modifiedAt')
+
+
+class SegmentSearchResult(SlottedModel):
     """
     Sometime segment has more data. It is for it. Give me a good name for this class.
     http://wiki.memsource.com/wiki/Job_API_v7#Get_Segments is for Segment.
     http://wiki.memsource.com/wiki/Translation_Memory_API_v4#Search_Segment_By_Task is for this.
     """
-    pass
+    __slots__ = ()
 
+    segmentId = Field(str)
+    source = Field(Segment)
+    translations = Field(Segment, many=True)
+    transMemory = Field(TranslationMemory)
+    grossScore = Field(float)
+    score = Field(float)
+    subSegment = Field(bool)
 
-class Analysis(BaseModel):
-    pass
+
+class Analysis(SlottedModel):
+    __slots__ = ()
+
+    id = Field(str)
+    uid = Field(str)
+    type = Field(str)
+    name = Field(str)
+    dateCreated = Field(str)
+    createdBy = Field(User)
+    provider = Field(dict)
+    netRateScheme = Field(dict)
+    analyseLanguageParts = Field(list)
+
+    date_created = DateTimeField('dateCreated')
 
 
 class MxliffUnit(BaseModel):
@@ -87,4 +347,103 @@ class MxliffUnit(BaseModel):
 
 
 class TermBase(BaseModel):
-    pass
+    date_created = DateTimeField('dateCreated')
+
+
+class MxliffDiff(BaseModel):
+    """
+    Difference between two versions of a MXLIFF file.
+
+    added and modified are lists of MxliffUnit of the new version, removed is a list of unit ids.
+    """
+    def has_changes(self):
+        return bool(self.added or self.removed or self.modified)
+
+
+class PreTranslateBatch(BaseModel):
+    """
+    Result of a batch of lib.pre_translate.PreTranslateScheduler.
+
+    job_uids are jobs of the batch. async_request is finished models.AsynchronousRequest, or None
+    if error is set. error is the exception of submitting or waiting for the batch.
+    submit_seconds is time taken by the pre translate API call, seconds is time until finished.
+    """
+    def has_error(self):
+        return self.error is not None or (
+            self.async_request is not None and self.async_request.has_error())
+
+
+class TmInsertResult(BaseModel):
+    """
+    Result of api_rest.tm.TranslationMemory.insert_many.
+
+    submitted is number of given segments, accepted is number of segments which Memsource accepted.
+    skipped is number of segments known to be in the translation memory, see
+    api_rest.tm.TranslationMemory.use_dedup. requests is number of API calls.
+    """
+
+
+class TmDeleteResult(BaseModel):
+    """
+    Result of deleting many segments from a translation memory.
+
+    deleted is a list of deleted segment ids, failed is the error of each segment id not deleted.
+    """
+    def has_error(self):
+        return bool(self.failed)
+
+
+class TmImportResult(BaseModel):
+    """
+    Result of api_rest.tm.TranslationMemory.upload_in_parts.
+
+    parts is number of TMX parts, accepted is the sum of accepted segments count of imported
+    parts, failed is the error of each part index not imported.
+    """
+    def has_error(self):
+        return bool(self.failed)
+
+
+class TmxUnit(BaseModel):
+    """
+    Translation unit of TMX, see lib.tmx.read.
+
+    segments is text by language, props is text of prop by type, attributes are attributes of the
+    tu element, e.g. tuid and creationdate. source_lang is srclang of the header.
+    lib.tmx.pairs makes parameters of TranslationMemory.insert from it.
+    """
+
+
+class AnalysisRow(BaseModel):
+    """
+    A file of a downloaded analysis, see lib.analysis_reader.read.
+
+    file is the file name. bands is a dict of metrics by match band, e.g.
+    {"100%": {"segments": 1, "words": 5, "characters": 25, "percent": 12.5}}. info is other
+    columns of the file, e.g. "chars/word". is_total is True for rows of totals of all files.
+    """
+
+
+class ProjectAnalysis(BaseModel):
+    """
+    An analysis collected by api_rest.analysis.Analysis.collect.
+
+    analysis is the result of Analysis.get, rows are rows of the downloaded analysis or None if
+    it is not downloaded. error is the exception if listing analyses of the project
+    (analysis_id is None) or getting the analysis failed.
+    """
+    def has_error(self):
+        return self.error is not None
+
+
+class MxliffFile(BaseModel):
+    """
+    Result of parsing a MXLIFF file in another process.
+
+    Units are kept as rows, tuples of values in order of fields, because it is much smaller to
+    pickle than dict for each unit. A row may be shorter than fields, when later units of the file
+    have more kinds of alt-trans.
+    seconds is time taken to parse the file.
+    """
+    def units(self):
+        return [MxliffUnit(zip(self.fields, row)) for row in self.rows]
@@ -1,5 +1,5 @@
 import os
-from unittest.mock import patch, PropertyMock
+from unittest.mock import Mock, patch, PropertyMock
 import urllib.request
 
 import requests
@@ -463,3 +463,25 @@ class TestApiTranslationMemory(api_test.ApiTestCase):
             },
             timeout=constants.Base.timeout.value
         )
+
+    @patch.object(requests.Session, 'request')
+    def test_delete_source_and_translations_in_bulk(self, mock_request):
+        def request(method, url, data, timeout):
+            if '13' in data['segmentId']:
+                return Mock(status_code=400, **{'json.return_value': {}})
+
+            return Mock(status_code=200, **{'json.return_value': {}})
+
+        mock_request.side_effect = request
+        segment_ids = [str(i) for i in range(25)]
+
+        result = self.translation_memory.deleteSourceAndTranslationsInBulk(
+            1, segment_ids, chunk_size=10)
+
+        self.assertIsInstance(result, models.TmDeleteResult)
+        self.assertEqual(result.deleted, segment_ids[:10] + segment_ids[20:])
+        self.assertEqual(sorted(result.failed), sorted(segment_ids[10:20]))
+        self.assertEqual(
+            sorted(call[1]['data']['segmentId'] for call in mock_request.call_args_list),
+            [segment_ids[:10], segment_ids[10:20], segment_ids[20:]],
+        )
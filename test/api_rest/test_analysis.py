@@ -4,6 +4,7 @@ from unittest.mock import patch, PropertyMock
 
 from memsource import constants, models
 from memsource.api_rest.analysis import Analysis
+from memsource.lib import analysis_reader
 
 
 class TestAnalysis(unittest.TestCase):
@@ -144,3 +145,113 @@ class TestAnalysis(unittest.TestCase):
             params={"format": constants.AnalysisFormat.CSV.value},
             timeout=300,
         )
+
+    @patch.object(requests.Session, "request")
+    def test_read_rows(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().iter_content.return_value = iter([
+            b"File;Total;;100%;\n;Segments;Words;Segments;Words\n",
+            b"a.docx;3;30;1;10\nb.docx;2;20;2;20\nTotal;5;50;3;30\n",
+        ])
+        mock_request.reset_mock()
+        totals = analysis_reader.BandTotals()
+
+        rows = list(Analysis(token="mock-token").read_rows(1234, totals=totals))
+
+        self.assertEqual([row.file for row in rows], ["a.docx", "b.docx", "Total"])
+        self.assertIsInstance(rows[0], models.AnalysisRow)
+        self.assertEqual(totals.bands["100%"], {"segments": 3, "words": 30, "characters": 0})
+        mock_request.assert_called_once_with(
+            constants.HttpMethod.get.value,
+            "https://cloud.memsource.com/web/api2/v1/analyses/1234/download",
+            headers={"Authorization": "ApiToken mock-token"},
+            params={"format": constants.AnalysisFormat.CSV.value},
+            timeout=300,
+            stream=True,
+        )
+        mock_request().close.assert_called_once_with()
+
+    @patch.object(requests.Session, "request")
+    def test_collect(self, mock_request: unittest.mock.Mock):
+        def request(method, url, **kwargs):
+            response = unittest.mock.Mock(status_code=200)
+            if url.endswith("/projects/p1/analyses"):
+                response.json.return_value = {"content": [{"id": "1"}, {"id": "2"}]}
+            elif url.endswith("/projects/p2/analyses"):
+                response.json.return_value = {"content": [{"id": "3"}]}
+            elif url.endswith("/projects/p3/analyses"):
+                response.status_code = 404
+                response.json.return_value = {}
+            elif url.endswith("/download"):
+                words = url.split("/")[-2]
+                response.iter_content.return_value = iter([
+                    "File;100%;\n;Segments;Words\na.docx;1;{}\n".format(words).encode("utf-8")])
+            else:
+                response.json.return_value = {"id": url.split("/")[-1], "name": "analysis"}
+
+            return response
+
+        mock_request.side_effect = request
+        totals = analysis_reader.BandTotals()
+
+        results = list(Analysis(token="mock-token").collect(
+            ["p1", "p2", "p3"], constants.AnalysisFormat.CSV, totals, max_workers=3))
+
+        self.assertEqual(
+            sorted((r.project_id, r.analysis_id) for r in results),
+            [("p1", "1"), ("p1", "2"), ("p2", "3"), ("p3", None)])
+        results = {r.analysis_id: r for r in results}
+        self.assertEqual(results[None].error.status_code, 404)
+        self.assertTrue(results[None].has_error())
+        self.assertFalse(results["2"].has_error())
+        self.assertIsInstance(results["2"].analysis, models.Analysis)
+        self.assertEqual(results["2"].analysis.name, "analysis")
+        self.assertEqual(results["2"].rows[0].bands["100%"]["words"], 2)
+        self.assertEqual(totals.bands["100%"]["words"], 6)
+        # Listing 3 projects, and getting and downloading 3 analyses.
+        self.assertEqual(mock_request.call_count, 9)
+
+    @patch.object(requests.Session, "request")
+    def test_collect_broken_response(self, mock_request: unittest.mock.Mock):
+        def request(method, url, **kwargs):
+            response = unittest.mock.Mock(status_code=200)
+            if url.endswith("/analyses"):
+                response.json.return_value = {"content": [{"id": "1"}, {"id": "2"}, {"id": "3"}]}
+            elif url.endswith("/1"):
+                response.json.side_effect = ValueError("Expecting value")
+            elif url.endswith("/2/download"):
+                response.iter_content.return_value = iter([b"File;100%;\n\xff\xfe\n"])
+            elif url.endswith("/download"):
+                response.iter_content.return_value = iter([b"File;100%;\n;Segments;Words\n"])
+            else:
+                response.json.return_value = {"id": url.split("/")[-1]}
+
+            return response
+
+        mock_request.side_effect = request
+        api = Analysis(token="mock-token")
+
+        results = {r.analysis_id: r for r in api.collect(["p1"], constants.AnalysisFormat.CSV)}
+
+        self.assertIsInstance(results["1"].error, ValueError)
+        self.assertIsInstance(results["2"].error, UnicodeDecodeError)
+        self.assertFalse(results["3"].has_error())
+        # Requests in threads are made by copies of the API.
+        self.assertFalse(hasattr(api, "last_url"))
+
+    @patch.object(requests.Session, "request")
+    def test_collect_without_download(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.side_effect = [{"content": [{"id": "1"}]}, {"id": "1"}]
+        mock_request.reset_mock()
+
+        results = list(Analysis(token="mock-token").collect(["p1"], raw=True))
+
+        self.assertEqual(results, [{
+            "project_id": "p1",
+            "analysis_id": "1",
+            "analysis": {"id": "1"},
+            "rows": None,
+            "error": None,
+        }])
+        self.assertEqual(mock_request.call_count, 2)
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch, PropertyMock
+
+import requests
+
+from memsource import constants, models
+from memsource.api_rest.asynchronous import Asynchronous
+
+
+class TestAsynchronous(unittest.TestCase):
+    @patch.object(requests.Session, "request")
+    def test_get(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.return_value = {
+            "id": "1",
+            "action": "PRE_TRANSLATE",
+            "dateCreated": "2014-11-03T16:03:11Z",
+            "asyncResponse": {"dateCreated": "2014-11-03T16:03:12Z", "errorCode": None},
+        }
+
+        async_request = Asynchronous(token="mock-token").get("1")
+
+        self.assertIsInstance(async_request, models.AsynchronousRequest)
+        self.assertTrue(async_request.is_complete())
+        self.assertFalse(async_request.has_error())
+
+        mock_request.assert_called_with(
+            constants.HttpMethod.get.value,
+            "https://cloud.memsource.com/web/api2/v1/async/1",
+            headers={"Authorization": "ApiToken mock-token"},
+            params={},
+            timeout=60,
+        )
+
+    @patch.object(requests.Session, "request")
+    def test_list_pending(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.return_value = {
+            "content": [{"id": "1", "asyncResponse": None}],
+        }
+
+        pending = Asynchronous(token="mock-token").list_pending(page=2)
+
+        self.assertEqual(len(pending), 1)
+        self.assertFalse(pending[0].is_complete())
+
+        mock_request.assert_called_with(
+            constants.HttpMethod.get.value,
+            "https://cloud.memsource.com/web/api2/v1/async",
+            headers={"Authorization": "ApiToken mock-token"},
+            params={"pageNumber": 2, "pageSize": 50},
+            timeout=60,
+        )
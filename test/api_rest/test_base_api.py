@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch
 from memsource import api_rest, exceptions
+from memsource.lib import json_codec
 import requests
 
 
@@ -37,9 +38,23 @@ class TestBaseApi(unittest.TestCase):
     def test_use_session(self):
         api = api_rest.BaseApi()
         session = unittest.mock.Mock()
+        # Session is shared by all instances. Restore it for other tests.
+        self.addCleanup(api.use_session, api._session)
         api.use_session(session)
         self.assertEqual(api._session, session)
 
+    @patch.object(requests.Session, "request")
+    def test_use_rate_limiter(self, mock_request):
+        mock_request.return_value = unittest.mock.Mock(status_code=200)
+        rate_limiter = unittest.mock.Mock()
+        # Rate limiter is shared by all instances. Restore it for other tests.
+        self.addCleanup(api_rest.BaseApi.use_rate_limiter, None)
+        api_rest.BaseApi.use_rate_limiter(rate_limiter)
+
+        api_rest.BaseApi(token="TEST-TOKEN")._get("v1/path")
+
+        rate_limiter.acquire.assert_called_once_with()
+
     @patch.object(requests.Session, "request")
     def test_get(self, mock_request):
         ms_response = unittest.mock.Mock(status_code=200)
@@ -80,3 +95,28 @@ class TestBaseApi(unittest.TestCase):
             "post", "https://cloud.memsource.com/web/api2/v2/path",
             json={"jobUID": 1}, headers={"Authorization": "ApiToken TEST-TOKEN"}, timeout=60,
         )
+
+    @patch.object(requests.Session, "request")
+    def test_use_json_codec(self, mock_request):
+        mock_request.return_value = unittest.mock.Mock(
+            status_code=200, content='{"id": "ジョブ"}'.encode("utf-8"))
+
+        api_rest.BaseApi.use_json_codec(json_codec.JsonCodec())
+        self.addCleanup(api_rest.BaseApi.use_json_codec, json_codec.RequestsJsonCodec())
+
+        api = api_rest.BaseApi(token="TEST-TOKEN")
+        response = api._post("v2/path", {"name": "ジョブ"})
+
+        self.assertEqual(response, {"id": "ジョブ"})
+        mock_request.assert_called_once_with(
+            "post", "https://cloud.memsource.com/web/api2/v2/path",
+            params={},
+            data='{"name": "ジョブ"}'.encode("utf-8"),
+            headers={
+                "Authorization": "ApiToken TEST-TOKEN",
+                "Content-Type": "application/json",
+            },
+            timeout=60,
+        )
+        # Content-Type is not left in headers of the instance.
+        self.assertEqual(api.headers, {"Authorization": "ApiToken TEST-TOKEN"})
@@ -433,6 +433,22 @@ class TestApiJob(unittest.TestCase):
 
         self.assertEqual("NEW", returned_value[0].status)
 
+    @patch.object(requests.Session, "request")
+    def test_list_raw(self, mock_request):
+        content = [{"uid": "06CcWsyrLLTTgylLQ9DSb6", "status": "NEW"}]
+        ms_response = unittest.mock.Mock(status_code=200)
+        ms_response.json.return_value = {"content": content}
+        mock_request.return_value = ms_response
+
+        returned_value = Job(token="mock-token").list(1234, raw=True)
+        self.assertIs(returned_value, content)
+
+        returned_value = Job(token="mock-token", raw=True).list(1234)
+        self.assertIs(returned_value, content)
+
+        returned_value = Job(token="mock-token", raw=True).list(1234, raw=False)
+        self.assertIsInstance(returned_value[0], models.Job)
+
     @patch.object(requests.Session, "request")
     def test_delete(self, mock_request):
         type(mock_request()).status_code = PropertyMock(return_value=204)
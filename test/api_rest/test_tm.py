@@ -1,11 +1,14 @@
+import threading
 import unittest
 import tempfile
 from unittest.mock import patch, PropertyMock
 
 import requests
+from lxml import objectify
 
 from memsource import constants, models
 from memsource.api_rest.tm import TranslationMemory
+from memsource.lib import search_cache, tm_dedup, tmx as tmx_lib
 
 
 ANY_ID = 1
@@ -437,6 +440,29 @@ class TestApiTranslationMemory(unittest.TestCase):
             timeout=60,
         )
 
+    @patch.object(requests.Session, "request")
+    def test_read_export(self, mock_request: unittest.mock.Mock):
+        tmx = (
+            b'<tmx version="1.4"><header srclang="en"/><body>'
+            b'<tu><tuv xml:lang="en"><seg>Hello</seg></tuv><tuv xml:lang="ja"><seg>Konnichiwa'
+            b'</seg></tuv></tu></body></tmx>'
+        )
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().iter_content.return_value = iter([tmx[:50], tmx[50:]])
+
+        units = list(TranslationMemory(token="mock-token").read_export("1234"))
+
+        self.assertEqual(units[0].segments, {"en": "Hello", "ja": "Konnichiwa"})
+        mock_request.assert_called_with(
+            constants.HttpMethod.get.value,
+            "https://cloud.memsource.com/web/api2/v1/transMemories/downloadExport/1234",
+            headers={"Authorization": "ApiToken mock-token"},
+            params={},
+            stream=True,
+            timeout=300,
+        )
+        mock_request().close.assert_called_with()
+
     @patch.object(requests.Session, "request")
     def test_insert(self, mock_request: unittest.mock.Mock):
         type(mock_request()).status_code = PropertyMock(return_value=200)
@@ -471,6 +497,272 @@ class TestApiTranslationMemory(unittest.TestCase):
             timeout=60,
         )
 
+    @patch.object(requests.Session, "request")
+    def test_upload_units(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.return_value = {"acceptedSegmentsCount": "2"}
+        units = [{
+            "target_lang": "ja",
+            "source_segment": "source {}".format(i),
+            "target_segment": "target {}".format(i),
+        } for i in range(2)]
+
+        accepted = TranslationMemory(token="mock-token").upload_units(1234, "en", iter(units))
+
+        self.assertEqual(accepted, 2)
+        (called_args, called_kwargs) = mock_request.call_args
+        self.assertEqual(
+            called_args[1], "https://cloud.memsource.com/web/api2/v1/transMemories/1234/import")
+        self.assertEqual(
+            called_kwargs["headers"]["Content-Disposition"], "inline; filename*=UTF-8''units.tmx")
+        # Not a document but chunks.
+        self.assertEqual(len(objectify.fromstring(b"".join(called_kwargs["data"])).body.tu), 2)
+
+    @patch.object(requests.Session, "request")
+    def test_upload_units_headers(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.return_value = {"acceptedSegmentsCount": "1", "searchResults": []}
+        api = TranslationMemory(token="mock-token")
+
+        api.upload_units(1234, "en", [
+            {"target_lang": "ja", "source_segment": "source", "target_segment": "target"}])
+        api.search(1234, "source", "en", "ja")
+
+        # Headers of the upload are not sent with later requests.
+        self.assertEqual(
+            mock_request.call_args[1]["headers"], {"Authorization": "ApiToken mock-token"})
+
+    @patch("memsource.lib.bulk.time.sleep")
+    @patch.object(requests.Session, "request")
+    def test_upload_in_parts(self, mock_request: unittest.mock.Mock, mock_sleep):
+        attempts = {}
+        lock = threading.Lock()
+
+        def request(method, url, **kwargs):
+            tmx = objectify.fromstring(kwargs["data"])
+            name = kwargs["headers"]["Content-Disposition"]
+            with lock:
+                attempts[name] = attempts.get(name, 0) + 1
+
+            # The second part fails once, the third part always fails.
+            if name.endswith("part-1.tmx") and attempts[name] == 1:
+                return unittest.mock.Mock(status_code=503, **{"json.return_value": {}})
+            if name.endswith("part-2.tmx"):
+                return unittest.mock.Mock(status_code=400, **{"json.return_value": {}})
+
+            return unittest.mock.Mock(
+                status_code=200,
+                **{"json.return_value": {"acceptedSegmentsCount": str(len(tmx.body.tu))}})
+
+        mock_request.side_effect = request
+        units = [{
+            "target_lang": "ja",
+            "source_segment": "source {}".format(i),
+            "target_segment": "target {}".format(i),
+        } for i in range(100)]
+        data = b"".join(tmx_lib.write(units, "en"))
+        parts = list(tmx_lib.split(data, part_size=1000))
+        with tempfile.NamedTemporaryFile(suffix=".tmx") as f:
+            f.write(data)
+            f.flush()
+
+            result = TranslationMemory(token="mock-token").upload_in_parts(
+                1234, f.name, part_size=1000, max_workers=2)
+
+        self.assertEqual(result.parts, len(parts))
+        self.assertEqual(len(attempts), len(parts))
+        self.assertEqual(list(result.failed), [2])
+        self.assertEqual(result.failed[2].status_code, 400)
+        self.assertTrue(result.has_error())
+        # Units of the failed part are not accepted.
+        self.assertEqual(result.accepted, 100 - len(list(tmx_lib.read(parts[2]))))
+        self.assertEqual(attempts["inline; filename*=UTF-8''part-1.tmx"], 2)
+        self.assertEqual(attempts["inline; filename*=UTF-8''part-2.tmx"], 1)
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch.object(requests.Session, "request")
+    def test_insert_many(self, mock_request: unittest.mock.Mock):
+        imported = []
+
+        def request(method, url, **kwargs):
+            response = unittest.mock.Mock(status_code=200)
+            if url.endswith("/import"):
+                tmx = objectify.fromstring(b"".join(kwargs["data"]))
+                imported.append(len(tmx.body.tu))
+                self.assertEqual(kwargs["headers"]["Content-Type"], "application/octet-stream")
+                response.json.return_value = {"acceptedSegmentsCount": str(len(tmx.body.tu))}
+            else:
+                self.assertNotIn("Content-Type", kwargs["headers"])
+                response.json.return_value = {}
+
+            return response
+
+        mock_request.side_effect = request
+        segments = ({
+            "target_lang": "ja",
+            "source_segment": "source {}".format(i),
+            "target_segment": "target {}".format(i),
+        } for i in range(120))
+
+        result = TranslationMemory(token="mock-token").insert_many(
+            1234, "en", segments, chunk_size=50, import_threshold=30, max_workers=2)
+
+        self.assertEqual(result, {"submitted": 120, "skipped": 0, "accepted": 120, "requests": 22})
+        self.assertEqual(imported, [50, 50])
+        self.assertEqual(mock_request.call_count, 22)
+
+    @patch.object(requests.Session, "request")
+    def test_dedup(self, mock_request: unittest.mock.Mock):
+        imported = []
+
+        def request(method, url, **kwargs):
+            if url.endswith("/import"):
+                tmx = objectify.fromstring(b"".join(kwargs["data"]))
+                imported.append(len(tmx.body.tu))
+                return unittest.mock.Mock(
+                    status_code=200,
+                    **{"json.return_value": {"acceptedSegmentsCount": len(tmx.body.tu)}})
+
+            return unittest.mock.Mock(status_code=200, **{"json.return_value": {}})
+
+        mock_request.side_effect = request
+        dedup = tm_dedup.TmDedup(capacity=1000)
+        self.addCleanup(TranslationMemory.use_dedup, None)
+        TranslationMemory.use_dedup(dedup)
+        api = TranslationMemory(token="mock-token")
+        segments = [{
+            "target_lang": "ja",
+            "source_segment": "source {}".format(i),
+            "target_segment": "target {}".format(i),
+        } for i in range(60)]
+        dedup.seed(1234, b"".join(tmx_lib.write(segments[:20], "en")))
+
+        api.insert(1234, "ja", "source 1", "target 1")
+        self.assertEqual(mock_request.call_count, 0)
+
+        api.insert(1234, "ja", "source 1", "another target")
+        api.insert(1234, "ja", "source 1", "another target")
+        self.assertEqual(mock_request.call_count, 1)
+
+        result = api.insert_many(1234, "en", segments, chunk_size=30, import_threshold=20)
+        # 10 new segments of the first chunk are inserted one by one.
+        self.assertEqual(result, {"submitted": 60, "skipped": 20, "accepted": 40, "requests": 11})
+        self.assertEqual(imported, [30])
+
+        # Nothing is imported if all units are known.
+        self.assertEqual(api.upload_units(1234, "en", segments[50:]), 0)
+        self.assertEqual(imported, [30])
+
+        # Deleting forgets segments.
+        api.delete_source_and_translations(1234, "1")
+        self.assertEqual(api.upload_units(1234, "en", segments[50:]), 10)
+
+    @patch.object(requests.Session, "request")
+    def test_delete_many(self, mock_request: unittest.mock.Mock):
+        def request(method, url, **kwargs):
+            if url.endswith("/segments/3"):
+                return unittest.mock.Mock(status_code=404, **{"json.return_value": {}})
+
+            return unittest.mock.Mock(status_code=204)
+
+        mock_request.side_effect = request
+
+        result = TranslationMemory(token="mock-token").delete_many(1234, ["1", "2", "3", "4"])
+
+        self.assertEqual(result.deleted, ["1", "2", "4"])
+        self.assertEqual(list(result.failed), ["3"])
+        self.assertEqual(result.failed["3"].status_code, 404)
+        self.assertTrue(result.has_error())
+        mock_request.assert_any_call(
+            constants.HttpMethod.delete.value,
+            "https://cloud.memsource.com/web/api2/v1/transMemories/1234/segments/4",
+            headers={"Authorization": "ApiToken mock-token"},
+            params={},
+            timeout=60,
+        )
+
+    @patch.object(requests.Session, "request")
+    def test_search_cache(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.return_value = {"searchResults": [{"score": 1.0}]}
+        mock_request.reset_mock()
+
+        cache = search_cache.SearchCache()
+        self.addCleanup(TranslationMemory.use_search_cache, None)
+        TranslationMemory.use_search_cache(cache)
+        api = TranslationMemory(token="mock-token")
+
+        api.search(1, "Hello ", "en", ["ja", "de"])
+        results = api.search(1, "Hello", "en", ["de", "ja"])
+        api.search_segment_by_job(2, "job", "Hello")
+        api.search_segment_by_job(2, "job", "Hello")
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertIsInstance(results[0], models.SegmentSearchResult)
+        self.assertEqual(cache.hits, 2)
+
+        # Searches of other translation memories are kept.
+        api.search(3, "Hello", "en", "ja")
+        api.insert(1, "ja", "Hello", "こんにちは")
+        self.assertEqual(len(cache), 1)
+
+        api.search(1, "Hello", "en", ["ja", "de"])
+        api.search(3, "Hello", "en", "ja")
+        self.assertEqual(mock_request.call_count, 5)
+
+    @patch.object(requests.Session, "request")
+    def test_search_cache_copy(self, mock_request: unittest.mock.Mock):
+        type(mock_request()).status_code = PropertyMock(return_value=200)
+        mock_request().json.return_value = {"searchResults": [
+            {"score": 1.0, "translations": [{"text": "こんにちは"}]},
+        ]}
+
+        self.addCleanup(TranslationMemory.use_search_cache, None)
+        TranslationMemory.use_search_cache(search_cache.SearchCache())
+        api = TranslationMemory(token="mock-token")
+
+        for raw in (True, False):
+            results = api.search(1, "Hello", "en", "ja", raw=raw)
+            results[0]["translations"][0]["text"] = "changed"
+            results[0]["score"] = 0.0
+            results.append({"score": 0.5})
+
+        results = api.search(1, "Hello", "en", "ja", raw=True)
+        self.assertEqual(results, [{"score": 1.0, "translations": [{"text": "こんにちは"}]}])
+
+    @patch.object(requests.Session, "request")
+    def test_search_segments_by_job(self, mock_request: unittest.mock.Mock):
+        def request(method, url, json, **kwargs):
+            return unittest.mock.Mock(status_code=200, **{"json.return_value": {
+                "searchResults": [{"source": {"text": json["segment"]}}],
+            }})
+
+        mock_request.side_effect = request
+
+        results = TranslationMemory(token="mock-token").search_segments_by_job(1, "job", [
+            "Hello",
+            "World",
+            {"segment": "Hello", "next_segment": "World"},
+            " Hello",
+            {"segment": "World", "next_segment": None},
+        ])
+
+        self.assertEqual(
+            [[result.source.text for result in found] for found in results],
+            [["Hello"], ["World"], ["Hello"], ["Hello"], ["World"]],
+        )
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(
+            sorted(call[1]["json"].get("nextSegment", "") for call in mock_request.call_args_list),
+            ["", "", "World"],
+        )
+
+        # Results of repeated segments are not shared.
+        results[3][0].source["text"] = "Changed"
+        results[3].append(None)
+        self.assertEqual(results[0][0].source.text, "Hello")
+        self.assertEqual(len(results[0]), 1)
+
     @patch.object(requests.Session, "request")
     def test_delete_source_and_translations(self, mock_request: unittest.mock.Mock):
         type(mock_request()).status_code = PropertyMock(return_value=200)
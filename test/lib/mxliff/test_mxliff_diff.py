@@ -0,0 +1,41 @@
+import unittest
+import os.path
+
+from memsource.lib.mxliff_diff import diff
+from memsource import models
+
+
+class TestMxliffDiff(unittest.TestCase):
+    def setUp(self):
+        file_dir = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(file_dir, 'test.mxliff')) as f:
+            self.mxliff_text = f.read().encode()
+
+    def test_diff_same(self):
+        result = diff([self.mxliff_text], [self.mxliff_text])
+
+        self.assertIsInstance(result, models.MxliffDiff)
+        self.assertFalse(result.has_changes())
+        self.assertEqual(result, {'added': [], 'removed': [], 'modified': []})
+
+    def test_diff(self):
+        new_text = self.mxliff_text.replace(
+            '<target/>\n'.encode(), '<target>ハローワールド。</target>\n'.encode(), 1,
+        ).replace(
+            'fj4ewiofj3qowjfw:1'.encode(), 'fj4ewiofj3qowjfw:2'.encode(),
+        )
+
+        result = diff([self.mxliff_text], [new_text])
+
+        self.assertTrue(result.has_changes())
+        self.assertEqual(result.modified, [{
+            'id': 'fj4ewiofj3qowjfw:0',
+            'source': 'Hello World.',
+            'target': 'ハローワールド。',
+        }])
+        self.assertEqual(result.added, [{
+            'id': 'fj4ewiofj3qowjfw:2',
+            'source': 'This library wraps Memsoruce API for Python.',
+            'target': 'このライブラリはMemsourceのAPIをPython用にラップしています。',
+        }])
+        self.assertEqual(result.removed, ['fj4ewiofj3qowjfw:1'])
@@ -0,0 +1,62 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from memsource import models
+from memsource.lib.mxliff import MxliffParser
+from memsource.lib.mxliff_index import MxliffIndex
+
+
+class TestMxliffIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+        file_dir = os.path.dirname(os.path.abspath(__file__))
+        self.file_path = os.path.join(self.temp_dir, 'test.mxliff')
+        shutil.copy(os.path.join(file_dir, 'test.mxliff'), self.file_path)
+
+        with open(self.file_path, 'rb') as f:
+            self.mxliff_units = MxliffParser().parse(f.read())
+
+    def test_build(self):
+        index = MxliffIndex.build(self.file_path)
+
+        self.assertEqual(len(index), 2)
+        self.assertIn('fj4ewiofj3qowjfw:0', index)
+        self.assertIn('fj4ewiofj3qowjfw:1', index)
+
+        with open(self.file_path, 'rb') as f:
+            content = f.read()
+
+        (offset, length) = index.offsets['fj4ewiofj3qowjfw:1']
+        self.assertTrue(content[offset:offset + length].startswith(b'<group id="1">'))
+        self.assertTrue(content[offset:offset + length].endswith(b'</group>'))
+
+    def test_get(self):
+        index = MxliffIndex.build(self.file_path)
+
+        units = index.get(['fj4ewiofj3qowjfw:1', 'unknown'])
+
+        self.assertEqual(len(units), 1)
+        self.assertIsInstance(units[0], models.MxliffUnit)
+        self.assertEqual(units[0], self.mxliff_units[1])
+
+        units = index.get(['fj4ewiofj3qowjfw:1', 'fj4ewiofj3qowjfw:0'])
+        self.assertEqual(units, self.mxliff_units)
+
+    def test_get_with_parser(self):
+        units = MxliffIndex.build(self.file_path).get(
+            ['fj4ewiofj3qowjfw:0'], MxliffParser(fields=('id', 'source')))
+
+        self.assertEqual(units, [{'id': 'fj4ewiofj3qowjfw:0', 'source': 'Hello World.'}])
+
+    def test_open(self):
+        index = MxliffIndex.open(self.file_path)
+        self.assertTrue(os.path.exists(MxliffIndex.index_path(self.file_path)))
+
+        loaded_index = MxliffIndex.load(self.file_path)
+        self.assertEqual(loaded_index.root_start_tag, index.root_start_tag)
+        self.assertEqual(loaded_index.offsets, index.offsets)
+        self.assertEqual(MxliffIndex.open(self.file_path).offsets, index.offsets)
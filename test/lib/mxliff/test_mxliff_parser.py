@@ -70,3 +70,78 @@ class TestMxliffParser(unittest.TestCase):
                 'content': '<bracket>This is bracket.</bracket>',
             }],
         })
+
+    def test_parse_with_fields(self):
+        mxliff_units = MxliffParser(fields=('id', 'target')).parse(self.mxliff_text)
+
+        self.assertEqual(len(mxliff_units), 2)
+
+        self.assertIsInstance(mxliff_units[0], models.MxliffUnit)
+        self.assertEqual(mxliff_units[0], {
+            'id': 'fj4ewiofj3qowjfw:0',
+            'target': None,
+        })
+        self.assertEqual(mxliff_units[1], {
+            'id': 'fj4ewiofj3qowjfw:1',
+            'target': 'このライブラリはMemsourceのAPIをPython用にラップしています。',
+        })
+
+    def test_parse_with_alt_trans_fields(self):
+        mxliff_units = MxliffParser(fields=('id', 'memsource_tm')).parse(self.mxliff_text)
+
+        self.assertEqual(mxliff_units[1], {
+            'id': 'fj4ewiofj3qowjfw:1',
+            'memsource_tm': 'This is memsource translation memory.',
+        })
+
+    def test_parse_with_meta_fields(self):
+        mxliff_units = MxliffParser(fields=('tunit_metadata', )).parse(self.mxliff_text_meta)
+
+        self.assertEqual(mxliff_units[0], {
+            'tunit_metadata': [{
+                'id': '1',
+                'type': 'term',
+                'content': '<term>This is term.</term>',
+            }, {
+                'id': '2',
+                'type': 'bracket',
+                'content': '<bracket>This is bracket.</bracket>',
+            }],
+        })
+
+    def test_iterparse(self):
+        chunks = [self.mxliff_text[i: i + 100] for i in range(0, len(self.mxliff_text), 100)]
+        mxliff_units = list(MxliffParser().iterparse(chunks))
+
+        self.assertEqual(mxliff_units, MxliffParser().parse(self.mxliff_text))
+
+    def test_iterparse_with_meta(self):
+        mxliff_units = list(MxliffParser().iterparse([self.mxliff_text_meta]))
+
+        self.assertEqual(mxliff_units, MxliffParser().parse(self.mxliff_text_meta))
+
+    def test_parse_files(self):
+        file_dir = os.path.dirname(os.path.abspath(__file__))
+        file_paths = [
+            os.path.join(file_dir, 'test.mxliff'),
+            os.path.join(file_dir, 'test_meta.mxliff'),
+        ]
+
+        mxliff_files = list(MxliffParser().parse_files(file_paths, max_workers=2))
+
+        self.assertEqual([f.file_path for f in mxliff_files], file_paths)
+        for mxliff_file in mxliff_files:
+            self.assertIsInstance(mxliff_file, models.MxliffFile)
+            self.assertGreater(mxliff_file.seconds, 0)
+
+        self.assertEqual(mxliff_files[0].units(), MxliffParser().parse(self.mxliff_text))
+        self.assertEqual(mxliff_files[1].units(), MxliffParser().parse(self.mxliff_text_meta))
+
+    def test_parse_files_with_fields(self):
+        file_dir = os.path.dirname(os.path.abspath(__file__))
+        file_path = os.path.join(file_dir, 'test.mxliff')
+
+        (mxliff_file, ) = MxliffParser(fields=('id', )).parse_files([file_path], max_workers=1)
+
+        self.assertEqual(mxliff_file.fields, ['id'])
+        self.assertEqual(mxliff_file.rows, [('fj4ewiofj3qowjfw:0', ), ('fj4ewiofj3qowjfw:1', )])
@@ -0,0 +1,105 @@
+import unittest
+
+from memsource import constants
+from memsource.lib import analysis_reader
+
+CSV = '''\ufeff"Analysis";"Analysis #1"
+"Created";"2020-01-01 10:00"
+"Languages";"en -> ja"
+
+"File";"Chars/Word";"Total";"";"";"";"Repetitions";"";"";"";"100%";"";"";"";"0%";"";"";""
+"";"";"Segments";"Words";"Characters";"Percent";"Segments";"Words";"Characters";"Percent";\
+"Segments";"Words";"Characters";"Percent";"Segments";"Words";"Characters";"Percent"
+"a.docx";"5,2";"10";"100";"520";"100";"2";"20";"104";"20";"3";"30";"156";"30";"5";"50";"260";"50"
+"b ""quoted"".txt";"4.8";"4";"40";"192";"100";\
+"0";"0";"0";"0";"1";"10";"48";"25";"3";"30";"144";"75"
+"Total";"5.0";"14";"140";"712";"100";"2";"20";"104";"14,29";"4";"40";"204";"28.57";"8";"80";"404";"57.14"
+'''.encode('utf-8')
+
+CSV_EXTENDED = b'''File,Total,,TM 100%,,MT 100%,,NT 0%,
+,Segments,Words,Segments,Words,Segments,Words,Segments,Words
+a.docx,10,100,2,20,3,30,5,50
+'''
+
+LOG = b'''Analysis: Analysis #1
+Languages: en -> ja
+
+File: a.docx
+Match Types        Segments    Words    Characters    Percent
+Repetitions        2           20       104           20
+100%               3           30       156           30
+95% - 99%          0           0        0             0
+No Match           5           50       260           50
+
+File: b.txt
+Match Types\tSegments\tWords\tCharacters\tPercent
+100%\t1\t10\t48\t25
+No Match\t3\t30\t144\t75
+
+Analyse Total (2 files):
+Match Types        Segments    Words    Characters    Percent
+No Match           8           80       404           57.14
+'''
+
+
+def chunks(data, size=7):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestAnalysisReader(unittest.TestCase):
+    def test_read_csv(self):
+        totals = analysis_reader.BandTotals()
+        rows = list(analysis_reader.read(chunks(CSV), totals=totals))
+
+        self.assertEqual([row.file for row in rows], ['a.docx', 'b "quoted".txt', 'Total'])
+        self.assertEqual([row.is_total for row in rows], [False, False, True])
+        self.assertEqual(rows[0].info, {'file': 'a.docx', 'chars/word': 5.2})
+        self.assertEqual(list(rows[0].bands), ['Total', 'Repetitions', '100%', '0%'])
+        self.assertEqual(
+            rows[0].bands['100%'],
+            {'segments': 3, 'words': 30, 'characters': 156, 'percent': 30})
+        self.assertEqual(rows[2].bands['Repetitions']['percent'], 14.29)
+
+        self.assertEqual(totals.files, 2)
+        self.assertEqual(totals.bands['100%'], {'segments': 4, 'words': 40, 'characters': 204})
+        self.assertEqual(totals.bands['Total']['words'], 140)
+
+    def test_read_csv_extended(self):
+        rows = list(analysis_reader.read(
+            [CSV_EXTENDED], constants.AnalysisFormat.CSV_EXTENDED))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(list(rows[0].bands), ['Total', 'TM 100%', 'MT 100%', 'NT 0%'])
+        self.assertEqual(rows[0].bands['MT 100%'], {'segments': 3, 'words': 30})
+
+    def test_read_log(self):
+        totals = analysis_reader.BandTotals()
+        rows = list(analysis_reader.read(chunks(LOG), constants.AnalysisFormat.LOG, totals))
+
+        self.assertEqual([row.file for row in rows], ['a.docx', 'b.txt', 'Total'])
+        self.assertTrue(rows[2].is_total)
+        self.assertEqual(list(rows[0].bands), ['Repetitions', '100%', '95% - 99%', 'No Match'])
+        self.assertEqual(
+            rows[1].bands['No Match'],
+            {'segments': 3, 'words': 30, 'characters': 144, 'percent': 75})
+
+        self.assertEqual(totals.bands['No Match'], {'segments': 8, 'words': 80, 'characters': 404})
+        self.assertEqual(totals.bands['100%']['characters'], 204)
+
+    def test_read_empty(self):
+        self.assertEqual(list(analysis_reader.read([])), [])
+        self.assertEqual(list(analysis_reader.read([b''], constants.AnalysisFormat.LOG)), [])
+
+    def test_to_value(self):
+        self.assertEqual(analysis_reader.to_value(' 1 234 '), 1234)
+        self.assertEqual(analysis_reader.to_value('1,234.5'), 1234.5)
+        self.assertEqual(analysis_reader.to_value('12,5%'), 12.5)
+        self.assertEqual(analysis_reader.to_value('1,234'), 1234)
+        self.assertEqual(analysis_reader.to_value('12,345,678'), 12345678)
+        self.assertEqual(analysis_reader.to_value('1.234.567'), 1234567)
+        self.assertEqual(analysis_reader.to_value('1.234,5'), 1234.5)
+        self.assertEqual(analysis_reader.to_value('1.234'), 1.234)
+        self.assertEqual(analysis_reader.to_value('0,25'), 0.25)
+        self.assertEqual(analysis_reader.to_value('1,2,3'), '1,2,3')
+        self.assertEqual(analysis_reader.to_value('a.docx'), 'a.docx')
+        self.assertIsNone(analysis_reader.to_value(''))
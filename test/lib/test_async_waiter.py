@@ -0,0 +1,220 @@
+import concurrent.futures
+import threading
+import time
+import unittest
+
+from memsource import exceptions, models
+from memsource.lib import async_waiter
+
+
+class FakeAsynchronous(object):
+    """Each request is finished after it is checked given times."""
+
+    def __init__(self, checks):
+        self.checks = dict(checks)
+        self.gets = []
+        self.lists = 0
+
+    def _request(self, async_request_id):
+        finished = self.checks[async_request_id] <= 0
+        return {
+            'id': async_request_id,
+            'asyncResponse': {'errorCode': None} if finished else None,
+        }
+
+    def get(self, async_request_id, raw=None):
+        self.gets.append(async_request_id)
+        self.checks[async_request_id] -= 1
+        return models.AsynchronousRequest(self._request(async_request_id))
+
+    def list_pending(self, page=0, page_size=50, raw=None):
+        self.lists += 1
+        pending = []
+        for async_request_id in sorted(self.checks):
+            self.checks[async_request_id] -= 1
+            if self.checks[async_request_id] > 0:
+                pending.append(self._request(async_request_id))
+
+        return pending[page * page_size:(page + 1) * page_size]
+
+
+class TestAsyncWaiter(unittest.TestCase):
+    def make_waiter(self, api, **kwargs):
+        kwargs.setdefault('min_interval', 0.001)
+        kwargs.setdefault('max_interval', 0.01)
+        return async_waiter.AsyncWaiter(api, **kwargs)
+
+    def test_wait(self):
+        api = FakeAsynchronous({'1': 1, '2': 3})
+        waiter = self.make_waiter(api, batch_threshold=10)
+
+        futures = [waiter.add(models.AsynchronousRequest({'id': '1'})), waiter.add('2')]
+
+        finished = waiter.wait(timeout=5)
+
+        self.assertEqual([async_request.id for async_request in finished], ['1', '2'])
+        self.assertEqual([future.result().id for future in futures], ['1', '2'])
+        self.assertEqual(len(waiter), 0)
+        self.assertEqual(api.gets, ['1', '2', '2', '2'])
+
+    def test_add_twice(self):
+        waiter = self.make_waiter(FakeAsynchronous({'1': 1}))
+
+        self.assertIs(waiter.add('1'), waiter.add('1'))
+        self.assertEqual(len(waiter), 1)
+
+    def test_batch(self):
+        checks = {str(i): i % 3 + 1 for i in range(10)}
+        api = FakeAsynchronous(checks)
+        waiter = self.make_waiter(api, batch_threshold=2, page_size=4, min_interval=0)
+
+        for async_request_id in checks:
+            waiter.add(async_request_id)
+
+        finished = waiter.wait(timeout=5)
+
+        self.assertEqual(sorted(async_request.id for async_request in finished), sorted(checks))
+        # Only finished requests are fetched, each once.
+        self.assertEqual(sorted(api.gets), sorted(checks))
+        self.assertLess(waiter.api_calls, 10 + 10)
+
+    def test_back_off(self):
+        waiter = self.make_waiter(
+            FakeAsynchronous({'1': 100}), min_interval=0, max_interval=0.5, backoff=2)
+        waiter.add('1')
+        waiter._pending['1'].interval = 0.1
+
+        waiter.poll()
+        self.assertAlmostEqual(waiter._pending['1'].interval, 0.2)
+        self.assertGreater(waiter.seconds_until_next_poll(), 0.1)
+
+        # It is not due yet.
+        self.assertEqual(waiter.poll(), [])
+        self.assertEqual(waiter.api_calls, 1)
+
+        for i in range(5):
+            waiter._pending['1'].due = 0
+            waiter.poll()
+
+        self.assertEqual(waiter._pending['1'].interval, 0.5)
+
+    def test_timeout(self):
+        waiter = self.make_waiter(FakeAsynchronous({'1': 10 ** 6}))
+        waiter.add('1')
+
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            waiter.wait(timeout=0.05)
+
+    def test_resolve_from_other_thread(self):
+        waiter = self.make_waiter(FakeAsynchronous({'1': 10 ** 6}), min_interval=60)
+        future = waiter.add('1')
+        finished = models.AsynchronousRequest({'id': '1', 'asyncResponse': {'errorCode': None}})
+
+        timer = threading.Timer(0.01, waiter.resolve, (finished, ))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertEqual(list(waiter.as_completed(timeout=5)), [future])
+        self.assertIs(future.result(), finished)
+        self.assertFalse(waiter.resolve(finished))
+
+    def test_error(self):
+        api = FakeAsynchronous({})
+
+        def get(async_request_id, raw=None):
+            raise exceptions.MemsourceApiException(404, {'errorCode': 'NotFound'}, '', {})
+
+        api.get = get
+        waiter = self.make_waiter(api)
+        future = waiter.add('1')
+
+        list(waiter.as_completed(timeout=5))
+
+        self.assertIsInstance(future.exception(), exceptions.MemsourceApiException)
+
+    def test_transient_error(self):
+        api = FakeAsynchronous({'1': 1})
+        errors = [exceptions.MemsourceApiException(503, {}, '', {}),
+                  exceptions.MemsourceApiException(None, {}, '', {})]
+        get = api.get
+
+        def flaky_get(async_request_id, raw=None):
+            if errors:
+                raise errors.pop()
+
+            return get(async_request_id, raw)
+
+        api.get = flaky_get
+        waiter = self.make_waiter(api)
+        future = waiter.add('1')
+
+        list(waiter.as_completed(timeout=5))
+
+        self.assertTrue(future.result().is_complete())
+
+    def test_list_error(self):
+        checks = {str(i): 1 for i in range(3)}
+        api = FakeAsynchronous(checks)
+        list_pending = api.list_pending
+        errors = [exceptions.MemsourceApiException(403, {}, '', {}),
+                  exceptions.MemsourceApiException(429, {}, '', {})]
+
+        def flaky_list_pending(page=0, page_size=50, raw=None):
+            if errors:
+                raise errors.pop()
+
+            return list_pending(page, page_size, raw)
+
+        api.list_pending = flaky_list_pending
+        waiter = self.make_waiter(api, batch_threshold=2, min_interval=0)
+        for async_request_id in checks:
+            waiter.add(async_request_id)
+
+        # Too many requests backs off without fetching each request.
+        self.assertEqual(waiter.poll(), [])
+        self.assertEqual(api.gets, [])
+        self.assertEqual(len(errors), 1)
+
+        # Other errors fetch each request instead.
+        for pending in waiter._pending.values():
+            pending.due = 0
+
+        waiter.poll()
+        self.assertEqual(sorted(api.gets), sorted(checks))
+
+    def test_poll_from_threads(self):
+        api = FakeAsynchronous({'1': 10 ** 6})
+        get = api.get
+
+        def slow_get(async_request_id, raw=None):
+            time.sleep(0.05)
+            return get(async_request_id, raw)
+
+        api.get = slow_get
+        waiter = self.make_waiter(api, max_interval=60, backoff=10 ** 6)
+        waiter.add('1')
+        waiter._pending['1'].due = 0
+        barrier = threading.Barrier(4)
+
+        def poll():
+            barrier.wait()
+            waiter.poll()
+
+        threads = [threading.Thread(target=poll) for i in range(4)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # Other threads find the request backed off.
+        self.assertEqual(api.gets, ['1'])
+
+    def test_cancel(self):
+        api = FakeAsynchronous({'1': 10 ** 6})
+        waiter = self.make_waiter(api)
+        waiter.add('1').cancel()
+
+        self.assertEqual(waiter.poll(), [])
+        self.assertEqual(len(waiter), 0)
+        self.assertEqual(api.gets, [])
@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+
+from memsource import exceptions
+from memsource.lib import bulk
+
+
+def error(status_code):
+    return exceptions.MemsourceApiException(status_code, {}, '', {})
+
+
+class TestBulk(unittest.TestCase):
+    def test_is_transient(self):
+        self.assertTrue(bulk.is_transient(error(None)))
+        self.assertTrue(bulk.is_transient(error(429)))
+        self.assertTrue(bulk.is_transient(error(503)))
+        self.assertFalse(bulk.is_transient(error(404)))
+        self.assertFalse(bulk.is_transient(ValueError()))
+
+    def test_call_with_retries(self):
+        errors = [error(503), error(None)]
+
+        def func(value):
+            if errors:
+                raise errors.pop()
+
+            return value
+
+        self.assertEqual(bulk.call_with_retries(func, 1, retries=2, retry_wait=0), 1)
+
+        errors = [error(404), error(503)]
+        with self.assertRaises(exceptions.MemsourceApiException) as context:
+            bulk.call_with_retries(func, 1, retries=2, retry_wait=0)
+
+        self.assertEqual(context.exception.status_code, 404)
+        self.assertEqual(errors, [])
+
+    def test_run_in_chunks(self):
+        calls = []
+        lock = threading.Lock()
+
+        def func(chunk):
+            with lock:
+                calls.append(chunk)
+                attempts = sum(1 for call in calls if call == chunk)
+
+            if chunk[0] == 3 and attempts == 1:
+                raise error(None)
+            if chunk[0] == 6:
+                raise error(400)
+            if chunk[0] == 9:
+                raise error(500)
+
+        (succeeded, failed) = bulk.run_in_chunks(
+            func, iter(range(11)), chunk_size=3, retries=2, retry_wait=0)
+
+        self.assertEqual(succeeded, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(sorted(failed), [6, 7, 8, 9, 10])
+        self.assertEqual(failed[6].status_code, 400)
+        self.assertEqual(failed[9].status_code, 500)
+        # Retried once, not retried, and retried twice.
+        self.assertEqual(calls.count([3, 4, 5]), 2)
+        self.assertEqual(calls.count([6, 7, 8]), 1)
+        self.assertEqual(calls.count([9, 10]), 3)
+
+    def test_run_in_chunks_lazy(self):
+        finished = []
+        pending = []
+        lock = threading.Lock()
+
+        def items():
+            for item in range(20):
+                with lock:
+                    pending.append(item - len(finished))
+
+                yield item
+
+        def func(chunk):
+            time.sleep(0.001 * (chunk[0] % 3))
+            with lock:
+                finished.append(chunk[0])
+
+        (succeeded, failed) = bulk.run_in_chunks(func, items(), chunk_size=1, max_workers=2)
+
+        # Chunks finish out of order, but at most 2 of them are in flight when one is read.
+        self.assertEqual(succeeded, list(range(20)))
+        self.assertEqual(failed, {})
+        self.assertLessEqual(max(pending), 2)
+
+    def test_run_in_chunks_empty(self):
+        self.assertEqual(bulk.run_in_chunks(lambda chunk: None, [], chunk_size=3), ([], {}))
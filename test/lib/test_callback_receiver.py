@@ -0,0 +1,102 @@
+import json
+import unittest
+from http import HTTPStatus
+
+import requests
+
+from memsource.lib import async_waiter, callback_receiver
+from .test_async_waiter import FakeAsynchronous
+
+
+class TestCallbackReceiver(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeAsynchronous({'1': 10 ** 6, '2': 1})
+        # Polling is rare, requests are finished by callbacks.
+        self.waiter = async_waiter.AsyncWaiter(self.api, min_interval=60)
+        self.receiver = callback_receiver.CallbackReceiver(self.waiter, idle_interval=0.01)
+        self.receiver.start()
+        self.addCleanup(self.receiver.stop)
+
+    def post(self, body, url=None):
+        # Don't use the session of BaseApi, it is mocked in some tests.
+        return requests.post(
+            self.receiver.callback_url if url is None else url,
+            data=json.dumps(body), timeout=5)
+
+    def test_callback(self):
+        future = self.waiter.add('1')
+
+        response = self.post({'asyncRequest': {
+            'id': '1',
+            'action': 'PRE_TRANSLATE',
+            'asyncResponse': {'errorCode': None},
+        }})
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertEqual(future.result(timeout=5).id, '1')
+        self.assertEqual(self.api.gets, [])
+
+    def test_callback_without_response(self):
+        self.api.checks['1'] = 0
+        future = self.waiter.add('1')
+
+        self.post({'id': '1'})
+
+        # The fallback poller fetches the request.
+        self.assertTrue(future.result(timeout=5).is_complete())
+        self.assertEqual(self.api.gets, ['1'])
+
+    def test_fallback_poller(self):
+        waiter = async_waiter.AsyncWaiter(self.api, min_interval=0.01, max_interval=0.01)
+        receiver = callback_receiver.CallbackReceiver(waiter, idle_interval=0.01)
+
+        with receiver:
+            future = waiter.add('2')
+            self.assertTrue(future.result(timeout=5).is_complete())
+
+    def test_fallback_poller_error(self):
+        waiter = async_waiter.AsyncWaiter(self.api, min_interval=0.01, max_interval=0.01)
+        receiver = callback_receiver.CallbackReceiver(waiter, idle_interval=0.01)
+        get = self.api.get
+        errors = [ValueError('broken response')]
+
+        def flaky_get(async_request_id, raw=None):
+            if errors:
+                raise errors.pop()
+
+            return get(async_request_id, raw)
+
+        self.api.get = flaky_get
+
+        with receiver, self.assertLogs(callback_receiver.logger):
+            future = waiter.add('2')
+            # The poller keeps polling after the error.
+            self.assertTrue(future.result(timeout=5).is_complete())
+
+    def test_rejected(self):
+        future = self.waiter.add('1')
+        url = self.receiver.callback_url
+
+        self.assertEqual(
+            self.post({'id': '1'}, url.replace(self.receiver.token, 'wrong')).status_code,
+            HTTPStatus.FORBIDDEN)
+        self.assertEqual(
+            self.post({'id': '1'}, url.replace('/callback', '/other')).status_code,
+            HTTPStatus.NOT_FOUND)
+        self.assertEqual(self.post(['1']).status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(
+            requests.post(url, data=b'{', timeout=5).status_code, HTTPStatus.BAD_REQUEST)
+
+        self.assertFalse(future.done())
+
+    def test_callback_url(self):
+        receiver = callback_receiver.CallbackReceiver(
+            self.waiter, public_url='https://example.com/hooks/')
+
+        with self.assertRaises(RuntimeError):
+            receiver.callback_url
+
+        with receiver:
+            self.assertEqual(
+                receiver.callback_url,
+                'https://example.com/hooks/callback?token={}'.format(receiver.token))
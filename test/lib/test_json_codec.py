@@ -0,0 +1,54 @@
+import unittest
+import unittest.mock
+
+from memsource.lib import json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    def assert_codec(self, codec):
+        data = {"jobs": [{"uid": "ジョブ"}], "threshold": 0.7, "callbackUrl": None}
+
+        self.assertEqual(codec.loads(codec.dumps(data)), data)
+        self.assertEqual(
+            codec.decode(unittest.mock.Mock(content=codec.dumps(data))), data)
+
+        arguments = codec.encode(data, {"Authorization": "ApiToken token"})
+        self.assertEqual(codec.loads(arguments["data"]), data)
+        self.assertEqual(arguments["headers"], {
+            "Authorization": "ApiToken token",
+            "Content-Type": "application/json",
+        })
+
+    def test_json_codec(self):
+        self.assert_codec(json_codec.JsonCodec())
+
+    @unittest.skipIf(json_codec.orjson is None, "orjson is not installed")
+    def test_orjson_codec(self):
+        self.assert_codec(json_codec.OrjsonCodec())
+
+    @unittest.skipIf(json_codec.ujson is None, "ujson is not installed")
+    def test_ujson_codec(self):
+        self.assert_codec(json_codec.UjsonCodec())
+
+    def test_requests_json_codec(self):
+        codec = json_codec.RequestsJsonCodec()
+        response = unittest.mock.Mock()
+        response.json.return_value = {"id": 1}
+
+        self.assertEqual(codec.decode(response), {"id": 1})
+        self.assertEqual(codec.encode({"id": 1}, None), {"json": {"id": 1}})
+        self.assertEqual(
+            codec.encode({"id": 1}, {"Authorization": "ApiToken token"}),
+            {"json": {"id": 1}, "headers": {"Authorization": "ApiToken token"}},
+        )
+
+    def test_best_available(self):
+        self.assertIsInstance(json_codec.best_available(), json_codec.JsonCodec)
+
+    @unittest.mock.patch.object(json_codec, "orjson", None)
+    @unittest.mock.patch.object(json_codec, "ujson", None)
+    def test_best_available_without_libraries(self):
+        self.assertIs(type(json_codec.best_available()), json_codec.JsonCodec)
+
+        with self.assertRaises(ImportError):
+            json_codec.OrjsonCodec()
@@ -0,0 +1,162 @@
+import pickle
+import unittest
+
+from memsource import models
+from memsource.lib import model_codec
+
+
+class TestModelCodec(unittest.TestCase):
+    def make_jobs(self):
+        return [
+            models.Job({
+                'uid': 'job-1',
+                'status': 'NEW',
+                'providers': [{'type': 'USER', 'id': '1'}],
+                'dateDue': None,
+            }),
+            models.Job({
+                'status': 'COMPLETED',
+                'uid': 'job-2',
+                'imported': True,
+            }),
+        ]
+
+    def test_to_columns(self):
+        (class_name, fields, rows) = model_codec.to_columns(self.make_jobs())
+
+        self.assertEqual(class_name, 'Job')
+        # Declared fields come first.
+        self.assertEqual(
+            fields,
+            ['uid', 'status', 'dateDue', ['providers', 'list', ['type', 'id']], 'imported'])
+        self.assertEqual(rows[0][2], None)
+        self.assertIs(rows[1][2], model_codec.MISSING)
+        # Keys of nested dicts are written once.
+        self.assertEqual(rows[0][3], [['USER', '1']])
+
+    def test_columns_nested(self):
+        jobs = [
+            models.JobPart({
+                'uid': 'job-1',
+                'workflowStep': {'id': '1', 'name': 'Translation'},
+                'providers': [],
+                'other': [{'id': '1'}, 'text'],
+            }),
+            models.JobPart({
+                'uid': 'job-2',
+                'workflowStep': None,
+                'providers': [{'type': 'USER', 'id': '2'}, {'type': 'VENDOR', 'uid': 'v'}],
+                'other': {'id': '2'},
+            }),
+            models.JobPart({'uid': 'job-3', 'workflowStep': {'workflowLevel': 2}}),
+        ]
+
+        (_, fields, rows) = model_codec.to_columns(jobs)
+
+        self.assertEqual(fields, [
+            'uid',
+            ['workflowStep', 'dict', ['id', 'name', 'workflowLevel']],
+            ['providers', 'list', ['type', 'id', 'uid']],
+            'other',
+        ])
+        self.assertEqual(rows[2][1], [model_codec.MISSING, model_codec.MISSING, 2])
+
+        restored = model_codec.from_columns((_, fields, rows))
+
+        self.assertEqual(restored, jobs)
+        self.assertEqual(rows[2][1], [model_codec.MISSING, model_codec.MISSING, 2])
+        self.assertEqual(restored[2].workflowStep, {'workflowLevel': 2})
+        self.assertNotIn('providers', restored[2])
+        self.assertEqual(restored[1].providers[1], {'type': 'VENDOR', 'uid': 'v'})
+
+    def test_columns_round_trip(self):
+        jobs = self.make_jobs()
+        jobs[0].providers
+
+        restored = model_codec.from_columns(model_codec.to_columns(jobs))
+
+        self.assertEqual(restored, jobs)
+        self.assertIsInstance(restored[0], models.Job)
+        self.assertNotIn('dateDue', restored[1])
+        self.assertIsInstance(restored[0].providers[0], models.User)
+
+    def test_columns_base_model(self):
+        segments = [models.MxliffUnit({'id': '1', 'target': None})]
+
+        restored = model_codec.from_columns(model_codec.to_columns(segments))
+
+        self.assertEqual(restored, segments)
+        self.assertIsInstance(restored[0], models.MxliffUnit)
+
+    def test_columns_empty_models(self):
+        segments = [models.Segment({}), models.Segment({})]
+
+        self.assertEqual(model_codec.from_columns(model_codec.to_columns(segments)), segments)
+
+        jobs = [
+            models.Job({'uid': 'a', 'providers': [{}], 'workflowStep': {}}),
+            models.Job({'uid': 'b', 'providers': [], 'workflowStep': {}}),
+        ]
+
+        restored = model_codec.from_columns(model_codec.to_columns(jobs))
+
+        self.assertEqual(restored, jobs)
+        self.assertEqual(restored[0]['providers'], [{}])
+
+    @unittest.skipIf(model_codec.msgpack is None, "msgpack is not installed")
+    def test_pack_empty_models(self):
+        for model_list in (
+                [models.Segment({}), models.Segment({})],
+                [models.Job({'uid': 'a', 'providers': [{}]})],
+                [models.Job({'uid': 'a', 'providers': [{}, {}], 'workflowStep': {}})],
+        ):
+            self.assertEqual(model_codec.unpack(model_codec.pack(model_list)), model_list)
+
+    def test_columns_empty(self):
+        self.assertEqual(model_codec.from_columns(model_codec.to_columns([])), [])
+
+    def test_columns_mixed_models(self):
+        with self.assertRaises(TypeError):
+            model_codec.to_columns([models.Job({}), models.JobPart({})])
+
+    def test_columns_not_model(self):
+        with self.assertRaises(ValueError):
+            model_codec.from_columns(('parse_datetime', ['id'], [['1']]))
+
+    @unittest.skipIf(model_codec.msgpack is None, "msgpack is not installed")
+    def test_pack(self):
+        jobs = self.make_jobs()
+
+        packed = model_codec.pack(jobs)
+        restored = model_codec.unpack(packed)
+
+        self.assertEqual(restored, jobs)
+        self.assertNotIn('dateDue', restored[1])
+        self.assertIsNone(restored[0].dateDue)
+
+        many_jobs = [
+            models.Job({'uid': 'job-{}'.format(i), 'status': 'NEW', 'dateDue': None})
+            for i in range(100)
+        ]
+        self.assertLess(len(model_codec.pack(many_jobs)), len(pickle.dumps(many_jobs)))
+
+        job_parts = [
+            models.JobPart({
+                'uid': 'job-{}'.format(i),
+                'workflowStep': {'id': '1', 'name': 'Translation', 'workflowLevel': 1},
+                'providers': [{'type': 'USER', 'id': str(i), 'uid': 'user-{}'.format(i)}],
+            })
+            for i in range(100)
+        ]
+        self.assertEqual(model_codec.unpack(model_codec.pack(job_parts)), job_parts)
+        self.assertLess(len(model_codec.pack(job_parts)), len(pickle.dumps(job_parts)))
+
+    @unittest.skipIf(model_codec.msgpack is None, "msgpack is not installed")
+    def test_pack_nested_model(self):
+        authentication = models.Authentication({'token': 'token'})
+        authentication['user'] = models.User({'id': '1'})
+
+        (restored, ) = model_codec.unpack(model_codec.pack([authentication]))
+
+        self.assertEqual(restored, authentication)
+        self.assertIsInstance(restored.user, models.User)
@@ -0,0 +1,105 @@
+import threading
+import unittest
+
+from memsource import exceptions, models
+from memsource.lib import async_waiter, pre_translate
+
+from .test_async_waiter import FakeAsynchronous
+
+
+class FakeJob(object):
+    """Pre translate API which times out when a batch is larger than max_jobs."""
+
+    def __init__(self, asynchronous, max_jobs=10 ** 6, fail=()):
+        self.asynchronous = asynchronous
+        self.max_jobs = max_jobs
+        self.fail = set(fail)
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def _clone(self):
+        return self
+
+    def pre_translate(self, project_id, job_parts, translation_memory_threshold, callback_url):
+        with self._lock:
+            self.batches.append(list(job_parts))
+            async_request_id = str(len(self.batches))
+
+        if len(job_parts) > self.max_jobs:
+            raise exceptions.MemsourceApiException(None, {
+                'errorCode': 'Internal',
+                'errorDescription': 'The request timed out, timeout is 60',
+            }, '', {})
+
+        if self.fail.intersection(job_parts):
+            raise exceptions.MemsourceApiException(400, {'errorCode': 'Invalid'}, '', {})
+
+        self.asynchronous.checks[async_request_id] = 2
+        return models.AsynchronousRequest({'id': async_request_id, 'asyncResponse': None})
+
+
+class TestPreTranslateScheduler(unittest.TestCase):
+    def make_scheduler(self, job_api, **kwargs):
+        waiter = async_waiter.AsyncWaiter(
+            job_api.asynchronous, min_interval=0.001, max_interval=0.001)
+        return pre_translate.PreTranslateScheduler(job_api, waiter, **kwargs)
+
+    def test_run(self):
+        job_api = FakeJob(FakeAsynchronous({}))
+        scheduler = self.make_scheduler(job_api, batch_size=2, max_in_flight=2)
+        job_uids = ['job{}'.format(i) for i in range(30)]
+
+        batches = list(scheduler.run('project', job_uids))
+
+        self.assertEqual(
+            sorted(job_uid for batch in batches for job_uid in batch.job_uids), sorted(job_uids))
+        for batch in batches:
+            self.assertFalse(batch.has_error())
+            self.assertTrue(batch.async_request.is_complete())
+            self.assertGreaterEqual(batch.seconds, batch.submit_seconds)
+
+        # Submitting is fast, so batches grow.
+        self.assertGreater(max(len(batch) for batch in job_api.batches), 2)
+
+    def test_timeout(self):
+        job_api = FakeJob(FakeAsynchronous({}), max_jobs=3)
+        scheduler = self.make_scheduler(
+            job_api, batch_size=16, max_in_flight=1, retry_timed_out=True)
+        job_uids = ['job{}'.format(i) for i in range(20)]
+
+        batches = list(scheduler.run('project', job_uids))
+
+        # Timed out batches are split and submitted again.
+        self.assertEqual([job_uid for batch in batches for job_uid in batch.job_uids], job_uids)
+        self.assertFalse(any(batch.has_error() for batch in batches))
+        self.assertEqual(job_api.batches[1], job_uids[:8])
+        self.assertLessEqual(max(len(batch.job_uids) for batch in batches), 3)
+
+    def test_timeout_not_retried(self):
+        job_api = FakeJob(FakeAsynchronous({}), max_jobs=3)
+        scheduler = self.make_scheduler(job_api, batch_size=16, max_in_flight=1)
+        job_uids = ['job{}'.format(i) for i in range(20)]
+
+        batches = list(scheduler.run('project', job_uids))
+
+        # Jobs of the timed out batch may be accepted, they are not submitted again.
+        self.assertEqual(batches[0].job_uids, job_uids[:16])
+        self.assertIsNone(batches[0].error.status_code)
+        self.assertEqual(job_api.batches[1], job_uids[16:])
+        self.assertEqual(sum(len(batch) for batch in job_api.batches), 20)
+        # Both batches timed out, batch size is halved for each.
+        self.assertTrue(all(batch.has_error() for batch in batches))
+        self.assertEqual(scheduler.batch_size, 4)
+
+    def test_error(self):
+        job_api = FakeJob(FakeAsynchronous({}), fail=['job1'])
+        scheduler = self.make_scheduler(job_api, batch_size=1, max_batch_size=1)
+
+        batches = {
+            batch.job_uids[0]: batch for batch in scheduler.run('project', ['job0', 'job1'])
+        }
+
+        self.assertFalse(batches['job0'].has_error())
+        self.assertTrue(batches['job1'].has_error())
+        self.assertIsNone(batches['job1'].async_request)
+        self.assertEqual(batches['job1'].error.status_code, 400)
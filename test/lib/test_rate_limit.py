@@ -0,0 +1,26 @@
+import time
+import unittest
+
+from memsource.lib import rate_limit
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_acquire(self):
+        limiter = rate_limit.RateLimiter(rate=100, burst=2)
+
+        # Burst is not limited.
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertEqual(limiter.acquire(), 0)
+
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            rate_limit.RateLimiter(rate=0)
+
+        with self.assertRaises(ValueError):
+            rate_limit.RateLimiter(rate=1, burst=0)
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+
+from memsource.lib import search_cache
+
+
+class TestSearchCache(unittest.TestCase):
+    def test_normalize_text(self):
+        self.assertEqual(search_cache.normalize_text(' Café \n'), 'Café')
+        self.assertIsNone(search_cache.normalize_text(None))
+
+    def test_get_and_put(self):
+        cache = search_cache.SearchCache()
+
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', [1], tag='1')
+        self.assertEqual(cache.get('a'), [1])
+
+        self.assertEqual(cache.stats(), {
+            'size': 1,
+            'hits': 1,
+            'misses': 1,
+            'hit_rate': 0.5,
+            'evictions': 0,
+            'invalidations': 0,
+        })
+
+    def test_lru(self):
+        cache = search_cache.SearchCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    @patch('time.monotonic')
+    def test_ttl(self, mock_monotonic):
+        cache = search_cache.SearchCache(ttl=10)
+        mock_monotonic.return_value = 100
+        cache.put('a', 1)
+
+        mock_monotonic.return_value = 109
+        self.assertEqual(cache.get('a'), 1)
+
+        mock_monotonic.return_value = 110
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        cache = search_cache.SearchCache()
+        cache.put('a', 1, tag='1')
+        cache.put('b', 2, tag='2')
+        cache.put('c', 3, tag=None)
+
+        self.assertEqual(cache.invalidate('1'), 2)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.invalidations, 2)
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from memsource.lib import tm_dedup, tmx
+
+
+def unit(i, target_lang='ja'):
+    return {
+        'target_lang': target_lang,
+        'source_segment': 'source {}'.format(i),
+        'target_segment': 'target {}'.format(i),
+    }
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_add(self):
+        bloom_filter = tm_dedup.BloomFilter(capacity=1000, error_rate=0.001)
+        keys = [tm_dedup.pair_key(unit(i)) for i in range(2000)]
+        for key in keys[:1000]:
+            bloom_filter.add(key)
+
+        self.assertEqual(len(bloom_filter), 1000)
+        self.assertTrue(all(key in bloom_filter for key in keys[:1000]))
+        # No false negatives, and false positives near error_rate.
+        self.assertLess(sum(key in bloom_filter for key in keys[1000:]), 10)
+
+    def test_bytes(self):
+        bloom_filter = tm_dedup.BloomFilter(capacity=100)
+        bloom_filter.add(tm_dedup.pair_key(unit(1)))
+
+        loaded = tm_dedup.BloomFilter.from_bytes(bloom_filter.to_bytes())
+
+        self.assertIn(tm_dedup.pair_key(unit(1)), loaded)
+        self.assertNotIn(tm_dedup.pair_key(unit(2)), loaded)
+        self.assertEqual((loaded.size, loaded.hashes, len(loaded)), (bloom_filter.size, 20, 1))
+
+        with self.assertRaises(ValueError):
+            tm_dedup.BloomFilter.from_bytes(bloom_filter.to_bytes()[:-1])
+
+        with self.assertRaises(ValueError):
+            tm_dedup.BloomFilter(error_rate=1)
+
+    def test_pair_key(self):
+        self.assertEqual(
+            tm_dedup.pair_key(unit(1)),
+            tm_dedup.pair_key(dict(unit(1), source_segment=' source 1\n', target_lang='JA',
+                                   previous_source_segment='context')))
+        self.assertNotEqual(tm_dedup.pair_key(unit(1)), tm_dedup.pair_key(unit(1, 'de')))
+
+
+class TestTmDedup(unittest.TestCase):
+    def test_seed(self):
+        dedup = tm_dedup.TmDedup(capacity=100)
+        export = b''.join(tmx.write([unit(i) for i in range(10)], 'en'))
+
+        self.assertEqual(dedup.seed(1, export), 10)
+
+        self.assertTrue(dedup.contains(1, tm_dedup.pair_key(unit(3))))
+        self.assertFalse(dedup.contains(1, tm_dedup.pair_key(unit(3, 'de'))))
+        self.assertFalse(dedup.contains(2, tm_dedup.pair_key(unit(3))))
+
+        dedup.add(2, [tm_dedup.pair_key(unit(3))])
+        self.assertTrue(dedup.contains(2, tm_dedup.pair_key(unit(3))))
+
+        dedup.forget(1)
+        self.assertFalse(dedup.contains(1, tm_dedup.pair_key(unit(3))))
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            dedup = tm_dedup.TmDedup(directory, capacity=100)
+            dedup.add(1, [tm_dedup.pair_key(unit(1))])
+            dedup.save()
+
+            self.assertEqual(os.listdir(directory), ['1.bloom'])
+            loaded = tm_dedup.TmDedup(directory, capacity=100)
+            self.assertTrue(loaded.contains(1, tm_dedup.pair_key(unit(1))))
+            self.assertFalse(loaded.contains(1, tm_dedup.pair_key(unit(2))))
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+
+from memsource.lib import tm_mirror, tmx
+
+UNITS = [
+    {'target_lang': 'ja', 'source_segment': 'Hello world', 'target_segment': 'こんにちは世界'},
+    {'target_lang': 'de', 'source_segment': 'Hello world', 'target_segment': 'Hallo Welt'},
+    {'target_lang': 'ja', 'source_segment': 'Hello there', 'target_segment': 'やあ',
+     'previous_source_segment': 'Hi.'},
+    {'target_lang': 'ja', 'source_segment': 'Goodbye', 'target_segment': 'さようなら'},
+]
+
+
+class TestTmMirror(unittest.TestCase):
+    def setUp(self):
+        self.mirror = tm_mirror.TmMirror()
+        self.addCleanup(self.mirror.close)
+
+    def test_load_export(self):
+        self.assertEqual(self.mirror.load_export(1, b''.join(tmx.write(UNITS, 'en'))), 4)
+
+        self.assertEqual(self.mirror.lookup('Hello world', 'de'), [{
+            'tm_id': '1',
+            'segment_id': None,
+            'target_lang': 'de',
+            'source_segment': 'Hello world',
+            'target_segment': 'Hallo Welt',
+            'previous_source_segment': None,
+            'next_source_segment': None,
+        }])
+        self.assertEqual(len(self.mirror.lookup('Hello world')), 2)
+        self.assertEqual(self.mirror.lookup('Hello world', translation_memory_id=2), [])
+
+        # Loading again replaces segments.
+        self.assertEqual(self.mirror.load_export(1, b''.join(tmx.write(UNITS[3:], 'en'))), 1)
+        self.assertEqual(self.mirror.count(1), 1)
+        self.assertEqual(self.mirror.lookup('Hello world'), [])
+
+    def test_lookup_prefix(self):
+        self.mirror.load_export(1, b''.join(tmx.write(UNITS, 'en')))
+        self.mirror.load_export(2, b''.join(tmx.write(UNITS[:1], 'en')))
+
+        self.assertEqual(
+            [(r['tm_id'], r['target_segment']) for r in self.mirror.lookup_prefix('Hello', 'ja')],
+            [('1', 'やあ'), ('1', 'こんにちは世界'), ('2', 'こんにちは世界')])
+        self.assertEqual(len(self.mirror.lookup_prefix('Hello', translation_memory_id=1)), 3)
+        self.assertEqual(len(self.mirror.lookup_prefix('Hello', limit=1)), 1)
+        self.assertEqual(self.mirror.lookup_prefix('hello'), [])
+        self.assertEqual(
+            self.mirror.lookup_prefix('Hello there')[0]['previous_source_segment'], 'Hi.')
+
+    def test_lookup_uses_index(self):
+        for sql in ('SELECT * FROM segments WHERE source_segment = ?',
+                    'SELECT * FROM segments WHERE source_segment >= ? AND source_segment < ?'):
+            plan = self.mirror._connection.execute(
+                'EXPLAIN QUERY PLAN ' + sql, ('a', ) * sql.count('?')).fetchall()
+            self.assertIn('USING INDEX', ' '.join(str(row) for row in plan))
+
+    def test_apply_export(self):
+        self.mirror.load_export(1, b''.join(tmx.write(UNITS[:2], 'en')))
+        changed = [dict(UNITS[0], target_segment='ハローワールド'), UNITS[3]]
+
+        self.assertEqual(self.mirror.apply_export(1, b''.join(tmx.write(changed, 'en'))), 2)
+
+        self.assertEqual(self.mirror.count(), 4)
+        self.assertEqual(
+            sorted(r['target_segment'] for r in self.mirror.lookup('Hello world', 'ja')),
+            ['こんにちは世界', 'ハローワールド'])
+        # Same segment again is not duplicated.
+        self.mirror.apply_export(1, b''.join(tmx.write(changed, 'en')))
+        self.assertEqual(self.mirror.count(), 4)
+
+    def test_apply_export_changed_target(self):
+        export = (
+            '<tmx version="1.4"><header srclang="en"/><body>'
+            '<tu tuid="s1"><tuv xml:lang="en"><seg>Hello world</seg></tuv>'
+            '<tuv xml:lang="ja"><seg>{}</seg></tuv><tuv xml:lang="de"><seg>Hallo Welt</seg></tuv>'
+            '</tu></body></tmx>')
+        self.mirror.load_export(1, export.format('こんにちは世界').encode('utf-8'))
+        self.mirror.load_export(2, export.format('こんにちは世界').encode('utf-8'))
+
+        self.assertEqual(self.mirror.apply_export(1, export.format('ハロー').encode('utf-8')), 2)
+
+        self.assertEqual(self.mirror.count(1), 2)
+        self.assertEqual(
+            [r['target_segment'] for r in self.mirror.lookup('Hello world', 'ja', 1)], ['ハロー'])
+        # Other translation memories are not changed.
+        self.assertEqual(
+            [r['target_segment'] for r in self.mirror.lookup('Hello world', 'ja', 2)],
+            ['こんにちは世界'])
+
+        self.mirror.record_insert(1, 'ja', 'Hello world', 'やあ世界', segment_id='s1')
+
+        self.assertEqual(self.mirror.count(1), 2)
+        self.assertEqual(
+            sorted(r['target_segment'] for r in self.mirror.lookup('Hello world', None, 1)),
+            ['Hallo Welt', 'やあ世界'])
+
+    def test_record_insert_and_delete(self):
+        self.mirror.load_export(1, (
+            '<tmx version="1.4"><header srclang="en"/><body>'
+            '<tu tuid="s1"><tuv xml:lang="en"><seg>Hello world</seg></tuv>'
+            '<tuv xml:lang="ja"><seg>こんにちは世界</seg></tuv></tu>'
+            '</body></tmx>').encode('utf-8'))
+        self.mirror.record_insert(1, 'ja', 'Goodbye', 'さようなら', next_source_segment='Bye')
+
+        self.assertEqual(self.mirror.lookup('Hello world')[0]['segment_id'], 's1')
+        self.assertEqual(self.mirror.lookup('Goodbye')[0]['next_source_segment'], 'Bye')
+
+        self.assertEqual(self.mirror.record_delete(1, segment_id='s1'), 1)
+        self.assertEqual(self.mirror.record_delete(2, source_segment='Goodbye'), 0)
+        self.assertEqual(self.mirror.record_delete(1, source_segment='Goodbye'), 1)
+        self.assertEqual(self.mirror.count(), 0)
+
+        with self.assertRaises(ValueError):
+            self.mirror.record_delete(1)
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'tm.sqlite')
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, path)
+
+        with tm_mirror.TmMirror(path) as mirror:
+            mirror.load_export(1, b''.join(tmx.write(UNITS, 'en')))
+
+        with tm_mirror.TmMirror(path) as mirror:
+            self.assertEqual(mirror.count(1), 4)
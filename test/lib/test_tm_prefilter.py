@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from memsource.lib import tm_prefilter, tmx
+
+
+class TestNgramIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmx = b''.join(tmx.write([
+            {'target_lang': 'ja', 'source_segment': 'The quick brown fox jumps over the dog.',
+             'target_segment': '素早い茶色の狐が犬を飛び越える。'},
+            {'target_lang': 'de', 'source_segment': 'Save the <b>file</b> before closing.',
+             'target_segment': 'Speichern Sie die Datei vor dem Schließen.'},
+        ], 'en'))
+
+    def test_from_tmx(self):
+        index = tm_prefilter.NgramIndex.from_tmx(self.tmx)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.best_score('the quick  brown fox jumps over the dog.'), 1.0)
+        self.assertGreater(index.best_score('The quick brown fox jumps over the cat.'), 0.8)
+        self.assertLess(index.best_score('Completely unrelated sentence here'), 0.3)
+        self.assertEqual(index.best_score('zzzz'), 0.0)
+
+    def test_from_tmx_chunks(self):
+        chunks = [self.tmx[i:i + 16] for i in range(0, len(self.tmx), 16)]
+        index = tm_prefilter.NgramIndex.from_tmx(chunks, source_lang='EN')
+
+        self.assertEqual(index.best_score('Save the <b>file</b> before closing.'), 1.0)
+
+    def test_target_lang(self):
+        index = tm_prefilter.NgramIndex.from_tmx(self.tmx)
+
+        self.assertTrue(index.may_match('Save the <b>file</b> before closing.', 0.9, 'de'))
+        self.assertFalse(index.may_match('Save the <b>file</b> before closing.', 0.9, 'ja'))
+
+    def test_may_match(self):
+        index = tm_prefilter.NgramIndex()
+        self.assertFalse(index.may_match('Hello world'))
+
+        # Incremental update, e.g. after TranslationMemory.insert.
+        index.add('Hello world', 'ja')
+        self.assertTrue(index.may_match('Hello, world!'))
+        self.assertFalse(index.may_match('Goodbye everyone'))
+        self.assertFalse(index.may_match('Hello, world!', score_threshold=1.0, margin=0))
+
+    def test_same_as_all_pairs(self):
+        rand = random.Random(0)
+        words = ('ab', 'abc', 'bca', 'cab', 'aab', 'bb', 'ca', 'abca', 'c')
+        segments = [
+            (' '.join(rand.choice(words) for _ in range(rand.randint(1, 8))), rand.choice('xy'))
+            for _ in range(200)
+        ]
+        index = tm_prefilter.NgramIndex()
+        for (source, target_lang) in segments:
+            index.add(source, target_lang)
+
+        def dice(a, b):
+            (a, b) = (index._ngrams(a), index._ngrams(b))
+            return 2.0 * len(a & b) / (len(a) + len(b))
+
+        for _ in range(200):
+            segment = ' '.join(rand.choice(words) for _ in range(rand.randint(1, 8)))
+            target_lang = rand.choice([None, 'x', 'y'])
+            expected = max(
+                dice(segment, source) for (source, lang) in segments
+                if target_lang in (None, lang))
+
+            self.assertAlmostEqual(index.best_score(segment, target_lang), expected)
+            for threshold in (0.3, 0.5, 0.7, 0.9):
+                self.assertEqual(
+                    index.may_match(segment, threshold, target_lang, margin=0),
+                    expected >= threshold,
+                    (segment, target_lang, threshold))
@@ -0,0 +1,147 @@
+import tempfile
+import unittest
+
+from lxml import objectify
+
+from memsource.lib import tmx
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+
+class TestTmxWriter(unittest.TestCase):
+    def test_write(self):
+        chunks = list(tmx.write([{
+            'target_lang': 'ja',
+            'source_segment': '<b>Tom & Jerry</b>\x0c',
+            'target_segment': 'トムとジェリー',
+            'previous_source_segment': '"previous"',
+            'next_source_segment': None,
+        }], 'en'))
+
+        root = objectify.fromstring(b''.join(chunks))
+
+        self.assertEqual(root.header.attrib['srclang'], 'en')
+        tu = root.body.tu
+        self.assertEqual(len(tu.prop), 1)
+        self.assertEqual(tu.prop.attrib['type'], 'x-context-pre')
+        self.assertEqual(tu.prop.text, '"previous"')
+        self.assertEqual(
+            [(tuv.attrib[XML_LANG], tuv.seg.text) for tuv in tu.tuv],
+            [('en', '<b>Tom & Jerry</b>'), ('ja', 'トムとジェリー')],
+        )
+
+    def test_write_chunks(self):
+        units = ({
+            'target_lang': 'ja',
+            'source_segment': 'source {}'.format(i),
+            'target_segment': 'target {}'.format(i),
+        } for i in range(1000))
+
+        chunks = list(tmx.write(units, 'en', buffer_size=4096))
+
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(len(chunk) < 4096 + 500 for chunk in chunks))
+        root = objectify.fromstring(b''.join(chunks))
+        self.assertEqual(len(root.body.tu), 1000)
+        self.assertEqual(root.body.tu[999].tuv[1].seg.text, 'target 999')
+
+    def test_write_empty(self):
+        root = objectify.fromstring(b''.join(tmx.write([], 'en')))
+
+        self.assertEqual(root.body.countchildren(), 0)
+
+
+class TestTmxReader(unittest.TestCase):
+    def setUp(self):
+        self.units = [{
+            'target_lang': 'ja',
+            'source_segment': 'source & {}'.format(i),
+            'target_segment': 'target {}'.format(i),
+            'previous_source_segment': 'previous {}'.format(i),
+            'next_source_segment': None,
+        } for i in range(100)]
+        self.tmx = b''.join(tmx.write(self.units, 'en'))
+
+    def test_read(self):
+        units = list(tmx.read(self.tmx))
+
+        self.assertEqual(len(units), 100)
+        self.assertEqual(units[3].segments, {'en': 'source & 3', 'ja': 'target 3'})
+        self.assertEqual(units[3].props, {'x-context-pre': 'previous 3'})
+        self.assertEqual(units[3].source_lang, 'en')
+        self.assertEqual([pair for unit in units for pair in tmx.pairs(unit)], self.units)
+
+    def test_read_chunks(self):
+        chunks = (self.tmx[i:i + 100] for i in range(0, len(self.tmx), 100))
+
+        self.assertEqual(len(list(tmx.read(chunks))), 100)
+
+    def test_read_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.tmx') as f:
+            f.write(self.tmx)
+            f.flush()
+
+            self.assertEqual(len(list(tmx.read(f.name, chunk_size=128))), 100)
+
+            f.seek(0)
+            self.assertEqual(len(list(tmx.read(f, chunk_size=128))), 100)
+
+    def test_read_legacy(self):
+        unit = next(tmx.read(
+            b'<tmx version="1.1"><header srclang="EN-US"/><body>'
+            b'<tu tuid="1" creationdate="20200101T000000Z"><tuv lang="EN-US"><seg>Hello '
+            b'<ph x="1">{1}</ph></seg></tuv><tuv lang="JA-JP"><seg>Konnichiwa</seg></tuv></tu>'
+            b'</body></tmx>'
+        ))
+
+        self.assertEqual(unit.attributes, {'tuid': '1', 'creationdate': '20200101T000000Z'})
+        self.assertEqual(unit.segments, {'EN-US': 'Hello {1}', 'JA-JP': 'Konnichiwa'})
+        self.assertEqual(tmx.pairs(unit, 'en'), [{
+            'target_lang': 'JA-JP',
+            'source_segment': 'Hello {1}',
+            'target_segment': 'Konnichiwa',
+            'previous_source_segment': None,
+            'next_source_segment': None,
+        }])
+        self.assertEqual(tmx.pairs(unit, 'de'), [])
+
+    def test_lang_matches(self):
+        self.assertTrue(tmx.lang_matches('en_US', 'en'))
+        self.assertTrue(tmx.lang_matches('EN', 'en'))
+        self.assertFalse(tmx.lang_matches('en', 'en-us'))
+        self.assertFalse(tmx.lang_matches('eng', 'en'))
+
+
+class TestTmxSplit(unittest.TestCase):
+    def setUp(self):
+        self.tmx = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<tmx version="1.4"><header srclang="en" o-tmf="test"><prop type="x-a">a</prop>'
+            '</header><body>\n' + ''.join(
+                '<tu tuid="{0}"><tuv xml:lang="en"><seg>Hello <ph>&lt;b&gt;</ph>{0}</seg></tuv>'
+                '<tuv xml:lang="ja"><seg>こんにちは{0}</seg></tuv></tu>\n'.format(i)
+                for i in range(50)
+            ) + '</body>\n</tmx>\n').encode('utf-8')
+
+    def test_split(self):
+        chunks = [self.tmx[i:i + 37] for i in range(0, len(self.tmx), 37)]
+        parts = list(tmx.split(chunks, part_size=1000))
+
+        self.assertGreater(len(parts), 5)
+        units = []
+        for part in parts:
+            self.assertLess(len(part), 1500)
+            document = objectify.fromstring(part)
+            self.assertEqual(document.header.get('o-tmf'), 'test')
+            units.extend(document.body.tu)
+
+        self.assertEqual([tu.get('tuid') for tu in units], [str(i) for i in range(50)])
+        # Inline markup is copied as it is.
+        self.assertEqual(units[7].tuv[0].seg.ph.text, '<b>')
+        self.assertTrue(parts[-1].endswith(b'</body>\n</tmx>\n'))
+
+    def test_split_whole(self):
+        self.assertEqual(list(tmx.split(self.tmx)), [self.tmx])
+
+    def test_split_empty(self):
+        self.assertEqual(list(tmx.split(b''.join(tmx.write([], 'en')))), [])
@@ -0,0 +1,32 @@
+from memsource import models
+import unittest
+
+
+class TestModelsAsynchronousRequest(unittest.TestCase):
+    def test_is_complete(self):
+        self.assertFalse(models.AsynchronousRequest({'asyncResponse': None}).is_complete())
+
+        self.assertTrue(models.AsynchronousRequest({
+            'asyncResponse': {'errorCode': None},
+        }).is_complete())
+
+        # Legacy API
+        self.assertFalse(models.AsynchronousRequest({
+            'asyncResponse': models.AsynchronousResponse(None),
+        }).is_complete())
+
+    def test_has_error(self):
+        self.assertFalse(models.AsynchronousRequest({'asyncResponse': None}).has_error())
+
+        self.assertFalse(models.AsynchronousRequest({
+            'asyncResponse': {'errorCode': None},
+        }).has_error())
+
+        self.assertTrue(models.AsynchronousRequest({
+            'asyncResponse': {'errorCode': 'Internal', 'errorDesc': 'failed'},
+        }).has_error())
+
+        # Legacy API
+        self.assertTrue(models.AsynchronousRequest({
+            'asyncResponse': models.AsynchronousResponse({'error': {}}),
+        }).has_error())
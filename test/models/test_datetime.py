@@ -0,0 +1,53 @@
+import datetime
+import unittest
+
+from memsource import models
+
+UTC = datetime.timezone.utc
+
+
+class TestModelsDateTime(unittest.TestCase):
+    def test_parse_datetime(self):
+        expected = datetime.datetime(2014, 11, 3, 16, 3, 11, tzinfo=UTC)
+
+        self.assertEqual(models.parse_datetime('2014-11-03T16:03:11Z'), expected)
+        self.assertEqual(models.parse_datetime('2014-11-03T16:03:11+0000'), expected)
+        self.assertEqual(models.parse_datetime('2014-11-03T16:03:11+00:00'), expected)
+        self.assertEqual(models.parse_datetime(1415030591000), expected)
+
+    def test_parse_datetime_other_format(self):
+        self.assertEqual(
+            models.parse_datetime('2014-11-03T16:03:11.500Z'),
+            datetime.datetime(2014, 11, 3, 16, 3, 11, 500000, tzinfo=UTC),
+        )
+        self.assertEqual(
+            models.parse_datetime('2014-11-04T01:03:11+09:00'),
+            datetime.datetime(2014, 11, 3, 16, 3, 11, tzinfo=UTC),
+        )
+
+    def test_slotted_model(self):
+        job = models.Job({'dateDue': '2020-06-22T01:44:04Z'})
+
+        date_due = job.date_due
+        self.assertEqual(date_due, datetime.datetime(2020, 6, 22, 1, 44, 4, tzinfo=UTC))
+        self.assertIs(job.date_due, date_due)
+        self.assertIsNone(job.date_created)
+
+        job['dateDue'] = '2020-06-23T01:44:04Z'
+        self.assertEqual(job.date_due, datetime.datetime(2020, 6, 23, 1, 44, 4, tzinfo=UTC))
+
+    def test_base_model(self):
+        translation_memory = models.TranslationMemory({'dateCreated': '2020-06-22T01:44:04Z'})
+
+        date_created = translation_memory.date_created
+        self.assertEqual(date_created, datetime.datetime(2020, 6, 22, 1, 44, 4, tzinfo=UTC))
+        self.assertIs(translation_memory.date_created, date_created)
+        self.assertEqual(translation_memory, {'dateCreated': '2020-06-22T01:44:04Z'})
+
+    def test_nested_segment(self):
+        result = models.SegmentSearchResult({
+            'source': {'createdAt': 1415030591000},
+        })
+
+        self.assertEqual(
+            result.source.created_at, datetime.datetime(2014, 11, 3, 16, 3, 11, tzinfo=UTC))
@@ -0,0 +1,108 @@
+import copy
+import json
+import pickle
+import unittest
+
+from memsource import models
+
+
+class TestModelsSlottedModel(unittest.TestCase):
+    def make_job_part(self):
+        return models.JobPart({
+            'uid': 'job-1',
+            'status': 'NEW',
+            'targetLang': 'ja',
+            'providers': [{'type': 'USER', 'id': '1'}],
+            'unknownKey': 'value',
+        })
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.make_job_part(), '__dict__'))
+
+    def test_access(self):
+        job_part = self.make_job_part()
+
+        self.assertEqual(job_part.uid, 'job-1')
+        self.assertEqual(job_part['status'], 'NEW')
+        self.assertEqual(job_part.unknownKey, 'value')
+        self.assertIsNone(job_part.dateDue)
+        self.assertNotIn('dateDue', job_part)
+        self.assertEqual(len(job_part), 5)
+
+        with self.assertRaises(KeyError):
+            job_part['dateDue']
+
+        # Same as BaseModel.
+        with self.assertRaises(KeyError):
+            job_part.notExisting
+
+    def test_dict(self):
+        job_part = self.make_job_part()
+        job_part.providers
+
+        self.assertIsInstance(job_part, dict)
+        self.assertEqual(json.loads(json.dumps(job_part)), dict(job_part))
+        # Item access and get return decoded JSON.
+        self.assertIs(type(job_part.get('providers')[0]), dict)
+        self.assertIs(type(job_part['providers'][0]), dict)
+        self.assertIsNone(job_part.get('dateDue'))
+
+        job_part.update(providers=[{'id': '2'}])
+        self.assertEqual(job_part.providers[0].id, '2')
+
+    def test_copy(self):
+        job_part = self.make_job_part()
+
+        copied = copy.copy(job_part)
+        copied['uid'] = 'job-2'
+
+        self.assertIsInstance(copied, models.JobPart)
+        self.assertEqual(job_part.uid, 'job-1')
+
+    def test_lazy_nested(self):
+        source = {'createdBy': {'id': '1', 'userName': 'admin'}}
+        analysis = models.Analysis(source)
+
+        self.assertFalse(hasattr(analysis, '_hydrated'))
+
+        created_by = analysis.createdBy
+        self.assertIsInstance(created_by, models.User)
+        self.assertEqual(created_by.userName, 'admin')
+        self.assertIs(analysis.createdBy, created_by)
+        self.assertIs(analysis['createdBy'], source['createdBy'])
+
+        # Response is not modified.
+        self.assertIsInstance(source['createdBy'], dict)
+        self.assertNotIsInstance(source['createdBy'], models.User)
+
+    def test_lazy_nested_list(self):
+        providers = self.make_job_part().providers
+
+        self.assertEqual(len(providers), 1)
+        self.assertIsInstance(providers[0], models.User)
+
+    def test_set_item(self):
+        analysis = models.Analysis({'createdBy': {'id': '1'}})
+        analysis.createdBy
+
+        analysis['createdBy'] = {'id': '2'}
+        self.assertEqual(analysis.createdBy.id, '2')
+
+        del analysis['createdBy']
+        self.assertIsNone(analysis.createdBy)
+
+    def test_equal(self):
+        self.assertEqual(models.Project(uid='1', name='project'), {'uid': '1', 'name': 'project'})
+        self.assertEqual({'uid': '1'}, models.Project({'uid': '1'}))
+        self.assertEqual(models.Project({'uid': '1'}), models.Project(uid='1'))
+        self.assertNotEqual(models.Project({'uid': '1'}), models.Project(uid='2'))
+
+    def test_pickle(self):
+        job_part = self.make_job_part()
+        job_part.providers
+
+        unpickled = pickle.loads(pickle.dumps(job_part))
+
+        self.assertIsInstance(unpickled, models.JobPart)
+        self.assertEqual(unpickled, job_part)
+        self.assertFalse(hasattr(unpickled, '_hydrated'))
@@ -81,3 +81,11 @@ class TestMemsource(unittest.TestCase):
 
         # When header is given, should not call login method.
         self.assertFalse(mock_login.called)
+
+    def test_init_rest_with_raw(self):
+        m = Memsource(token='test_token', use_rest=True, raw=True)
+
+        for name in ('project', 'job', 'translation_memory', 'analysis'):
+            self.assertTrue(getattr(m, name).raw)
+
+        self.assertFalse(Memsource(token='test_token', use_rest=True).job.raw)